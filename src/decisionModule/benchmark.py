@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+import argparse, time
+from messages import MsgType, LightState, PacmanCommand
+
+###
+# Micro-benchmarks for the bot code. Run ./benchmark.py -h for the list.
+###
+
+def bench_frames(args):
+    from messages.frames import codec
+    from robomodules import FrameReader
+
+    light = LightState()
+    light.seq = 1234
+    light.mode = LightState.RUNNING
+    light.score = 1370
+    light.lives = 3
+    light.pacman.x, light.pacman.y = 14, 7
+    for i, ghost in enumerate([light.red_ghost, light.pink_ghost, light.orange_ghost, light.blue_ghost]):
+        ghost.x, ghost.y = 12 + i, 19
+        ghost.state = LightState.FRIGHTENED if i % 2 else LightState.NORMAL
+    command = PacmanCommand()
+    command.dir = PacmanCommand.NORTH
+
+    for name, msg, msg_type in [('LIGHT_STATE', light, MsgType.LIGHT_STATE),
+                                ('PACMAN_COMMAND', command, MsgType.PACMAN_COMMAND)]:
+        serialized = msg.SerializeToString()
+        frame = codec.encode(msg, msg_type)
+        reader = FrameReader(codec)
+        if reader.feed(frame) != [(msg, msg_type)]:
+            raise AssertionError('the {} frame does not decode to the message'.format(name))
+        print('{:<16} protobuf {:>3} bytes, frame {:>3} bytes'.format(name, len(serialized), len(frame)))
+        for what, run in [('SerializeToString', msg.SerializeToString),
+                          ('ParseFromString', lambda: type(msg).FromString(serialized)),
+                          ('frame encode', lambda: codec.encode(msg, msg_type)),
+                          ('frame decode', lambda: reader.feed(frame)),
+                          ('  of which values', lambda: codec.decode_values(frame[2:-2]))]:
+            start = time.perf_counter()
+            for _ in range(args.messages):
+                run()
+            elapsed = time.perf_counter() - start
+            print('  {:<20} {:>8.2f} us/message'.format(what, elapsed / args.messages * 1e6))
+
+def main():
+    parser = argparse.ArgumentParser(description='Bot code micro-benchmarks.')
+    subparsers = parser.add_subparsers(dest='benchmark')
+    subparsers.required = True
+
+    frames = subparsers.add_parser('frames', help='the serial link frames against protobuf')
+    frames.add_argument('-m', '--messages', type=int, default=50000, help='messages to time')
+    frames.set_defaults(run=bench_frames)
+
+    args = parser.parse_args()
+    args.run(args)
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,8 @@ from constants import UP, STAY, FACE_UP
 from policies.high_level_policy import HighLevelPolicy
 from rl.grid import grid
 from rl.variables import o, O
-from messages import MsgType, message_buffers, LightState, PacmanState
+from messages import MsgType, message_buffers, LightState, PacmanState, GameEvents
+from pelletBitmap import PelletBitmap
 
 
 
@@ -18,17 +19,14 @@ GAME_ENGINE_FREQUENCY = 0
 
 class GameEngineClient(ProtoModule):
     def __init__(self, addr, port):
-        self.subscriptions = [MsgType.LIGHT_STATE]
+        self.subscriptions = [MsgType.LIGHT_STATE, MsgType.GAME_EVENTS]
         super().__init__(addr, port, message_buffers, MsgType, GAME_ENGINE_FREQUENCY, self.subscriptions)
         self.policy = HighLevelPolicy()
         self.state = None
 
-        self.power_pellets = {
-            tuple(coord) for coord in np.argwhere(1 * (np.array(grid) == O)).tolist()
-        }
-        self.pellets = {
-            tuple(coord) for coord in np.argwhere(1 * (np.array(grid) == o)).tolist()
-        }
+        self.pellet_bitmap = PelletBitmap()
+        self.pellets = self.pellet_bitmap.pellets()
+        self.power_pellets = self.pellet_bitmap.power_pellets()
         # checks to override this timer
         self.frightened_timer = 0
         self.ticks_passed = 0
@@ -36,12 +34,10 @@ class GameEngineClient(ProtoModule):
 
         self.loop.call_soon(self._frightened_timer)
 
-        self.last_score = 0
-
         self.command_count = 0
 
     def _frightened_timer(self):
-        self.loop.call_later(1 / GAME_ENGINE_FREQUENCY, self._frightened_timer)
+        self.clock.call_later(self.loop, 1 / GAME_ENGINE_FREQUENCY, self._frightened_timer)
         self.ticks_passed += 1
         if self.ticks_passed % 12 == 0 and self.frightened_timer > 0:
             self.frightened_timer -= 1
@@ -66,21 +62,24 @@ class GameEngineClient(ProtoModule):
             "orientation": self.orientation,
         }
 
-    def _update_pellets(self, msg):
-
-        pac_pos = (msg.pacman.x, msg.pacman.y)
-
-        # update pellets (low score, so we are not too worried about validating if actually eaten)
-        self.pellets.discard(pac_pos)
-
-        # update power pellets
-        # TODO: test this
-        if pac_pos in self.power_pellets and msg.score == self.last_score + 50:
-            self.power_pellets.discard(pac_pos)
-            self.frightened_timer = 40  # TODO: gather all relevant constants
-
-        # update last_score
-        self.last_score = msg.score
+    def _update_pellets(self, msg: LightState):
+
+        # the game engine sends the pellets left with every light state, no need to guess from the score
+        for pos in self.pellet_bitmap.update(msg.pellets):
+            self.pellets.discard(pos)
+            self.power_pellets.discard(pos)
+            item = self.pellet_bitmap.item(pos)
+            if item == o:
+                self.pellets.add(pos)
+            elif item == O:
+                self.power_pellets.add(pos)
+
+    def _update_frightened_timer(self, msg: GameEvents):
+        for event in msg.events:
+            if event.type == GameEvents.POWER_PELLET_EATEN:
+                self.frightened_timer = 40  # TODO: gather all relevant constants
+            elif event.type == GameEvents.RESTART:
+                self.frightened_timer = 0
 
     """ _encode_command :
     takes in action and returns an encoded action in the following format
@@ -140,7 +139,9 @@ class GameEngineClient(ProtoModule):
         return action
 
     def msg_received(self, msg, msg_type):
-        if msg_type == MsgType.LIGHT_STATE:
+        if msg_type == MsgType.GAME_EVENTS:
+            self._update_frightened_timer(msg)
+        elif msg_type == MsgType.LIGHT_STATE:
             self._update_pellets(msg)
             self.state = self._parse_light(msg)
 
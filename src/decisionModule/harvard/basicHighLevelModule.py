@@ -5,7 +5,8 @@ import robomodules as rm
 from variables import *
 from grid import grid
 from search import bfs
-from messages import MsgType, message_buffers, LightState, PacmanCommand
+from pelletBitmap import PelletBitmap
+from messages import MsgType, message_buffers, SHARED, LightState, PacmanCommand
 
 ADDRESS = os.environ.get("LOCAL_ADDRESS","localhost")
 PORT = os.environ.get("LOCAL_PORT", 11295)
@@ -16,9 +17,10 @@ FREQUENCY = 60
 class BasicHighLevelModule(rm.ProtoModule):
     def __init__(self, addr, port):
         self.subscriptions = [MsgType.LIGHT_STATE]
-        super().__init__(addr, port, message_buffers, MsgType, FREQUENCY, self.subscriptions)
+        super().__init__(addr, port, message_buffers, MsgType, FREQUENCY, self.subscriptions, shared=SHARED)
         self.state = None
         self.grid = copy.deepcopy(grid)
+        self.pellets = PelletBitmap()
 
     def _get_direction(self, p_loc, next_loc):
         if p_loc[0] == next_loc[0]:
@@ -36,15 +38,13 @@ class BasicHighLevelModule(rm.ProtoModule):
     def msg_received(self, msg, msg_type):
         if msg_type == MsgType.LIGHT_STATE:
             self.state = msg
+            for (x, y) in self.pellets.update(msg.pellets):
+                self.grid[x][y] = self.pellets.item((x, y))
 
     def tick(self):
         if self.state and self.state.mode == LightState.RUNNING:
             p_loc = (self.state.pacman.x, self.state.pacman.y)
-            
-            # update game state
-            if self.grid[p_loc[0]][p_loc[1]] in [o, O]:
-                self.grid[p_loc[0]][p_loc[1]] = e
- 
+
             path = bfs(self.grid, p_loc, self.state, [o, O])
             print(path)
 
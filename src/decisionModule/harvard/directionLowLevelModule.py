@@ -6,7 +6,7 @@ import variables as var
 from grid import grid
 from low_level.motors import Motors
 from low_level.motors import Direction
-from messages import MsgType, message_buffers, LightState, PacmanCommand
+from messages import MsgType, message_buffers, SHARED, LightState, PacmanCommand
 from time import sleep
 ADDRESS = os.environ.get("LOCAL_ADDRESS","192.168.0.101")
 PORT = os.environ.get("LOCAL_PORT", 11295)
@@ -18,7 +18,7 @@ GRID_VAL = 200
 class LowLevelModule(rm.ProtoModule):
     def __init__(self, addr, port):
         self.subscriptions = [MsgType.PACMAN_COMMAND, MsgType.LIGHT_STATE]
-        super().__init__(addr, port, message_buffers, MsgType, FREQUENCY, self.subscriptions)
+        super().__init__(addr, port, message_buffers, MsgType, FREQUENCY, self.subscriptions, shared=SHARED)
         self.current_command = None
         self.current_location = None
         self.motors = Motors()
@@ -1,12 +1,14 @@
 #!/usr/bin/env python3
 
 import os, copy
+import numpy as np
 import robomodules as rm
 from operator import itemgetter
 from variables import *
 from grid import grid
-from search import bfs
-from messages import MsgType, message_buffers, LightState, PacmanCommand
+from mazeTables import maze
+from pelletBitmap import PelletBitmap
+from messages import MsgType, message_buffers, SHARED, LightState, PacmanCommand
 
 ADDRESS = os.environ.get("LOCAL_ADDRESS","localhost")
 PORT = os.environ.get("LOCAL_PORT", 11295)
@@ -20,11 +22,15 @@ GHOST_CUTOFF = 10
 class HeuristicHighLevelModule(rm.ProtoModule):
     def __init__(self, addr, port):
         self.subscriptions = [MsgType.LIGHT_STATE]
-        super().__init__(addr, port, message_buffers, MsgType, FREQUENCY, self.subscriptions)
+        super().__init__(addr, port, message_buffers, MsgType, FREQUENCY, self.subscriptions, shared=SHARED)
         self.state = None
         self.previous_loc = None
         self.direction = PacmanCommand.EAST
         self.grid = copy.deepcopy(grid)
+        self.pellets = PelletBitmap()
+        # Which tiles of the maze tables still hold a pellet (not counting power pellets)
+        self.pellet_tiles = np.zeros(len(maze.tiles), dtype=bool)
+        self.pellet_tiles[maze.pellets] = True
 
     def _get_direction(self, p_loc, next_loc):
         if p_loc[0] == next_loc[0]:
@@ -38,20 +44,17 @@ class HeuristicHighLevelModule(rm.ProtoModule):
             else:
                 return PacmanCommand.WEST
 
-    def _find_paths_to_closest_ghosts(self, pac_loc):
+    def _find_distances_to_closest_ghosts(self, pac_loc):
         ghosts = [self.state.red_ghost, self.state.pink_ghost, self.state.orange_ghost, self.state.blue_ghost]
-        state_paths = [(ghost.state, bfs(self.grid, pac_loc, (ghost.x, ghost.y), GHOST_CUTOFF)) for ghost in ghosts]
-        return [sp for sp in state_paths if sp[1] is not None]
+        state_dists = [(ghost.state, maze.distance(pac_loc, (ghost.x, ghost.y))) for ghost in ghosts]
+        return [sd for sd in state_dists if sd[1] is not None and sd[1] <= GHOST_CUTOFF]
 
     def _find_distance_of_closest_pellet(self, target_loc):
-        return len(bfs(self.grid, target_loc, [o])) - 1
+        return maze.nearest(target_loc, np.flatnonzero(self.pellet_tiles)) or 0
 
     def _target_is_invalid(self, target_loc):
         return self.grid[target_loc[0]][target_loc[1]] in [I, n]
 
-    def _is_power_pellet_closer(self, path):
-        return O in path
-
     def _get_num_turns(self, p_dir, n_dir):
         lat = [PacmanCommand.WEST, PacmanCommand.EAST]
         lng = [PacmanCommand.SOUTH, PacmanCommand.NORTH]
@@ -76,20 +79,13 @@ class HeuristicHighLevelModule(rm.ProtoModule):
                 heuristics.append(float('inf'))
                 continue
             dist_to_pellet = self._find_distance_of_closest_pellet(target_loc)
-            paths_to_ghosts = self._find_paths_to_closest_ghosts(target_loc)
-
+            dists_to_ghosts = self._find_distances_to_closest_ghosts(target_loc)
 
             closest_ghost = (None, float('inf'))
             ghosts = []
-            for state, path in paths_to_ghosts:
-                dist = len(path) - 1
+            for state, dist in dists_to_ghosts:
                 closest_ghost = (state, dist) if dist < closest_ghost[1] else closest_ghost
                 ghosts.append((state, dist))
-                if self._is_power_pellet_closer(path):
-                    if target_loc == p_loc:
-                        return path[1]
-                    else:
-                        return path[0]
 
             ghost_heuristic = 0
             for state, dist in ghosts:
@@ -112,10 +108,10 @@ class HeuristicHighLevelModule(rm.ProtoModule):
                 mins.append((directions[i], targets[i]))
         return self._get_target_with_min_turning_direction(mins)
 
-    def _update_game_state(self):
-        p_loc = (self.state.pacman.x, self.state.pacman.y)
-        if self.grid[p_loc[0]][p_loc[1]] in [o, O]:
-            self.grid[p_loc[0]][p_loc[1]] = e
+    def _update_game_state(self, msg):
+        for (x, y) in self.pellets.update(msg.pellets):
+            self.grid[x][y] = self.pellets.item((x, y))
+            self.pellet_tiles[maze.index((x, y))] = self.grid[x][y] == o
 
     def _send_command_message_to_target(self, p_loc, target):
         new_msg = PacmanCommand()
@@ -142,10 +138,10 @@ class HeuristicHighLevelModule(rm.ProtoModule):
                    self.direction = self._get_direction((self.previous_loc.x, self.previous_loc.y), (msg.pacman.x, msg.pacman.y))
                 self.previous_loc = self.state.pacman if self.state else None
             self.state = msg
+            self._update_game_state(msg)
 
     def tick(self):
         if self.state and self.state.mode == LightState.RUNNING:
-            self._update_game_state()
             p_loc = (self.state.pacman.x, self.state.pacman.y)
             next_loc = self._find_best_target(p_loc)
             if next_loc != p_loc:
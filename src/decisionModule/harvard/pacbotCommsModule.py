@@ -10,20 +10,32 @@ SERVER_PORT = os.environ.get("BIND_PORT", 11297)
 LOCAL_ADDRESS = os.environ.get("LOCAL_ADDRESS","localhost")
 LOCAL_PORT = os.environ.get("LOCAL_PORT", 11295)
 
+STATE_STREAM = os.environ.get("STATE_STREAM", "full") # also forward the engine's STATE_DELTA unless "full"
+
 SERVER_FREQUENCY = 0
 LOCAL_FREQUENCY = 30
 
 class PacbotServerClient(rm.ProtoModule):
     def __init__(self, addr, port, loop):
-        self.subscriptions = [MsgType.LIGHT_STATE]
+        self.subscriptions = [MsgType.LIGHT_STATE, MsgType.GAME_EVENTS]
+        if STATE_STREAM != "full":
+            self.subscriptions.append(MsgType.STATE_DELTA)
         super().__init__(addr, port, message_buffers, MsgType, SERVER_FREQUENCY, self.subscriptions, loop)
         self.state = None
+        self.events = []
+        self.deltas = []
 
     def msg_received(self, msg, msg_type):
         # This gets called whenever any message is received
         # This module will connect to server and receive the game state
         if msg_type == MsgType.LIGHT_STATE:
             self.state = msg
+        elif msg_type == MsgType.GAME_EVENTS:
+            # Unlike the state, every event message has to be passed on
+            self.events.append(msg)
+        elif msg_type == MsgType.STATE_DELTA:
+            # Like events, deltas only make sense if none of them is skipped
+            self.deltas.append(msg)
 
     def tick(self):
         return
@@ -31,10 +43,25 @@ class PacbotServerClient(rm.ProtoModule):
     def get_state(self):
         return self.state
 
+    # Returns the event messages received since the last call
+    def get_events(self):
+        events = self.events
+        self.events = []
+        return events
+
+    # Returns the state delta messages received since the last call
+    def get_deltas(self):
+        deltas = self.deltas
+        self.deltas = []
+        return deltas
+
 class PacbotCommsModule(rm.ProtoModule):
     def __init__(self, server_addr, server_port, local_addr, local_port):
         self.subscriptions = [MsgType.PACMAN_LOCATION]
-        super().__init__(local_addr, local_port, message_buffers, MsgType, LOCAL_FREQUENCY, self.subscriptions)
+        if STATE_STREAM != "full":
+            self.subscriptions.append(MsgType.KEYFRAME_REQUEST)
+        super().__init__(local_addr, local_port, message_buffers, MsgType, LOCAL_FREQUENCY, self.subscriptions,
+                         shared=SHARED, latched=LATCHED)
         self.server_module = PacbotServerClient(server_addr, server_port, self.loop)
         self.server_module.connect()
 
@@ -42,8 +69,16 @@ class PacbotCommsModule(rm.ProtoModule):
         # This gets called whenever any message is received
         if msg_type == MsgType.PACMAN_LOCATION:
             self.server_module.write(msg.SerializeToString(), MsgType.PACMAN_LOCATION)
+        elif msg_type == MsgType.KEYFRAME_REQUEST:
+            self.server_module.write(msg.SerializeToString(), MsgType.KEYFRAME_REQUEST)
 
     def tick(self):
+        # Pass on the game events first, so local modules see them before the state they led to
+        for events in self.server_module.get_events():
+            self.write(events.SerializeToString(), MsgType.GAME_EVENTS)
+        for delta in self.server_module.get_deltas():
+            self.write(delta.SerializeToString(), MsgType.STATE_DELTA)
+
         # Get state from the server
         state = self.server_module.get_state()
         if state != None:
@@ -3,7 +3,7 @@
 import os
 import robomodules as rm
 import variables as var
-from messages import MsgType, message_buffers, PacmanState, PacmanCommand
+from messages import MsgType, message_buffers, SHARED, PacmanState, PacmanCommand
 
 ADDRESS = os.environ.get("LOCAL_ADDRESS","localhost")
 PORT = os.environ.get("LOCAL_PORT", 11295)
@@ -18,7 +18,7 @@ class PacbotSimulatorModule(rm.ProtoModule):
     """
     def __init__(self, addr, port):
         self.subscriptions = [MsgType.PACMAN_COMMAND]
-        super().__init__(addr, port, message_buffers, MsgType, FREQUENCY, self.subscriptions)
+        super().__init__(addr, port, message_buffers, MsgType, FREQUENCY, self.subscriptions, shared=SHARED)
         self.current_location = var.pacbot_starting_pos
         self.current_command = None
 
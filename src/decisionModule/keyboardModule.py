@@ -5,7 +5,7 @@ import robomodules as rm
 from variables import *
 from grid import grid
 from search import bfs
-from messages import MsgType, message_buffers, LightState, PacmanCommand
+from messages import MsgType, message_buffers, SHARED, LightState, PacmanCommand
 
 ADDRESS = os.environ.get("LOCAL_ADDRESS","localhost")
 PORT = os.environ.get("LOCAL_PORT", 11295)
@@ -15,7 +15,7 @@ FREQUENCY = 60
 class BasicHighLevelModule(rm.ProtoModule):
     def __init__(self, addr, port):
         self.subscriptions = []
-        super().__init__(addr, port, message_buffers, MsgType, FREQUENCY, self.subscriptions)
+        super().__init__(addr, port, message_buffers, MsgType, FREQUENCY, self.subscriptions, shared=SHARED)
         self.next_dir = None
 
     def msg_received(self, msg, msg_type):
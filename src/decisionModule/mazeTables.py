@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+import numpy as np
+from variables import *
+from grid import grid
+from search import bfs, neighbors
+
+###
+# Reads the maze tables compiled by the game engine's ./compileMaze.py (see
+# src/gameEngine/pacbot/mazeTables.py for the arrays), memory-mapped so every module on
+# the machine shares them. If they have not been compiled, or were compiled from a
+# different grid or by a different version, the tiles and pellets are numbered from the
+# grid instead, the way the compiler does it, and distances fall back to search.bfs.
+###
+
+VERSION = 1
+MAZE_DIR = os.environ.get("MAZE_DIR", os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "maze")))
+
+
+class MazeTables:
+    """
+        The tables of the maze. distances is None if they could not be loaded.
+    """
+    def __init__(self, directory=MAZE_DIR):
+        self.distances = None
+        cells = np.array(grid, dtype=np.uint8)
+        try:
+            with open(os.path.join(directory, 'manifest.json')) as f:
+                manifest = json.load(f)
+            if (manifest['version'] == VERSION and
+                    manifest['grid_sha1'] == hashlib.sha1(cells.tobytes()).hexdigest()):
+                for name in ['tile_index', 'tiles', 'distances', 'pellets', 'power_pellets']:
+                    setattr(self, name, np.asarray(np.load(os.path.join(directory, name + '.npy'),
+                                                           mmap_mode='r')))
+        except (OSError, ValueError, KeyError):
+            self.distances = None
+        self.loaded = self.distances is not None
+        if not self.loaded:
+            tiles = [(x, y) for x in range(len(grid)) for y in range(len(grid[0]))
+                     if grid[x][y] in [o, e, O]]
+            self.tile_index = np.full(cells.shape, -1, dtype=np.int16)
+            for i, (x, y) in enumerate(tiles):
+                self.tile_index[x, y] = i
+            self.tiles = np.array(tiles, dtype=np.int16).reshape(-1, 2)
+            self.pellets = self.tile_index[cells == o]
+            self.power_pellets = self.tile_index[cells == O]
+
+    # Returns a new set of the tiles that hold a pellet at the start of a game.
+    def initial_pellets(self):
+        return {(int(x), int(y)) for (x, y) in self.tiles[self.pellets]}
+
+    # Returns a new set of the tiles that hold a power pellet at the start of a game.
+    def initial_power_pellets(self):
+        return {(int(x), int(y)) for (x, y) in self.tiles[self.power_pellets]}
+
+    # Returns the index of a tile in the tables, or -1 if it is a wall or off the maze.
+    def index(self, pos):
+        (width, height) = self.tile_index.shape
+        if 0 <= pos[0] < width and 0 <= pos[1] < height:
+            return int(self.tile_index[pos[0], pos[1]])
+        return -1
+
+    # Returns the length of the shortest path between two tiles, or None if there is none.
+    def distance(self, a, b):
+        if not self.loaded:
+            path = bfs(grid, a, b)
+            return None if path is None else len(path) - 1
+        i, j = self.index(a), self.index(b)
+        if i < 0 or j < 0 or self.distances[i, j] < 0:
+            return None
+        return int(self.distances[i, j])
+
+    # Returns the length of the shortest path from a tile to the closest of the tiles with
+    # the given indices (an array), or None if none of them can be reached.
+    def nearest(self, a, indices):
+        i = self.index(a)
+        if i < 0 or len(indices) == 0:
+            return None
+        if self.loaded:
+            distances = self.distances[i, indices]
+            distances = distances[distances >= 0]
+            return int(distances.min()) if len(distances) else None
+        targets = {tuple(int(c) for c in self.tiles[j]) for j in indices}
+        seen = {a}
+        frontier = [a]
+        distance = 0
+        while frontier:
+            if any(pos in targets for pos in frontier):
+                return distance
+            frontier = [n for pos in frontier for n in neighbors(grid, pos) if n not in seen]
+            seen.update(frontier)
+            distance += 1
+        return None
+
+
+# The maze tables, shared by every module in this process.
+maze = MazeTables()
@@ -2,20 +2,38 @@ from enum import Enum
 from .lightState_pb2 import LightState
 from .pacmanState_pb2 import PacmanState
 from .pacmanCommand_pb2 import PacmanCommand
+from .gameEvents_pb2 import GameEvents
+from .stateDelta_pb2 import StateDelta, KeyframeRequest
 
 
 class MsgType(Enum):
     LIGHT_STATE = 0
     PACMAN_LOCATION = 1
     PACMAN_COMMAND = 2
+    GAME_EVENTS = 3
+    # Same numbers as the game engine's, so they can be forwarded from its server
+    STATE_DELTA = 5
+    KEYFRAME_REQUEST = 6
 
 
 message_buffers = {
     MsgType.LIGHT_STATE: LightState,
     MsgType.PACMAN_LOCATION: PacmanState.AgentState,
-    MsgType.PACMAN_COMMAND: PacmanCommand
+    MsgType.PACMAN_COMMAND: PacmanCommand,
+    MsgType.GAME_EVENTS: GameEvents,
+    MsgType.STATE_DELTA: StateDelta,
+    MsgType.KEYFRAME_REQUEST: KeyframeRequest
 }
 
+# The states, of which the local server sends the latest to a module as soon as it
+# subscribes (and so does shared memory, for the shared ones).
+LATCHED = [MsgType.LIGHT_STATE, MsgType.PACMAN_LOCATION]
 
-__all__ = ['MsgType', 'message_buffers', 'LightState', 'PacmanState',
-           'PacmanCommand']
+# Message types the modules on the computer of the local server also exchange through
+# shared memory (see robomodules.sharedRing). Every module there that writes one of
+# them has to pass them to ProtoModule as shared, or the ones that read it miss it.
+SHARED = [MsgType.PACMAN_LOCATION, MsgType.PACMAN_COMMAND]
+
+
+__all__ = ['MsgType', 'message_buffers', 'LATCHED', 'SHARED', 'LightState', 'PacmanState',
+           'PacmanCommand', 'GameEvents', 'StateDelta', 'KeyframeRequest']
@@ -0,0 +1,69 @@
+from robomodules import FrameCodec
+from . import MsgType
+from .lightState_pb2 import LightState
+from .pacmanState_pb2 import PacmanState
+from .pacmanCommand_pb2 import PacmanCommand
+
+###
+# The fixed-layout frames (see robomodules.FrameCodec) of the messages that go over the
+# serial link to the robot, for code that cannot afford protobuf. Coordinates are a byte
+# each. A LIGHT_STATE frame is 26 bytes and leaves out the pellet bitmap; a
+# PACMAN_COMMAND frame is 7 bytes and a PACMAN_LOCATION frame 9 bytes. Bump VERSION
+# whenever a layout changes.
+###
+
+VERSION = 1
+
+_ghosts = ['red_ghost', 'pink_ghost', 'orange_ghost', 'blue_ghost']
+
+# LIGHT_STATE: seq, Pacman and ghost x and y, flags (bit 0 paused, bits 1 to 4 the red,
+# pink, orange and blue ghosts frightened), score, lives
+_LIGHT_STATE = 'I' + 'BB' * 5 + 'BIB'
+_PAUSED = 1
+
+
+def _light_state_values(msg):
+    flags = _PAUSED if msg.mode == LightState.PAUSED else 0
+    values = [msg.seq, msg.pacman.x, msg.pacman.y]
+    for i, name in enumerate(_ghosts):
+        ghost = getattr(msg, name)
+        values += [ghost.x, ghost.y]
+        if ghost.state == LightState.FRIGHTENED:
+            flags |= 2 << i
+    return values + [flags, msg.score, msg.lives]
+
+
+def _light_state(values):
+    msg = LightState()
+    msg.seq = values[0]
+    msg.pacman.x, msg.pacman.y = values[1:3]
+    flags = values[11]
+    for i, name in enumerate(_ghosts):
+        ghost = getattr(msg, name)
+        ghost.x, ghost.y = values[3 + 2 * i:5 + 2 * i]
+        ghost.state = LightState.FRIGHTENED if flags & (2 << i) else LightState.NORMAL
+    msg.mode = LightState.PAUSED if flags & _PAUSED else LightState.RUNNING
+    msg.score = values[12]
+    msg.lives = values[13]
+    return msg
+
+
+# PACMAN_COMMAND: direction
+def _pacman_command(values):
+    msg = PacmanCommand()
+    msg.dir = values[0]
+    return msg
+
+
+# PACMAN_LOCATION: x, y, direction
+def _pacman_location(values):
+    msg = PacmanState.AgentState()
+    msg.x, msg.y, msg.direction = values
+    return msg
+
+
+codec = FrameCodec(VERSION)
+codec.register(MsgType.LIGHT_STATE, _LIGHT_STATE, _light_state_values, _light_state)
+codec.register(MsgType.PACMAN_COMMAND, 'B', lambda msg: [msg.dir], _pacman_command)
+codec.register(MsgType.PACMAN_LOCATION, 'BBB', lambda msg: [msg.x, msg.y, msg.direction],
+               _pacman_location)
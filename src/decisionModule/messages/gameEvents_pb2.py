@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: gameEvents.proto
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import message as _message
+from google.protobuf import reflection as _reflection
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x10gameEvents.proto\x12\x07\x62otCode\"\xd7\x02\n\nGameEvents\x12)\n\x06\x65vents\x18\x01 \x03(\x0b\x32\x19.botCode.GameEvents.Event\x1ag\n\x05\x45vent\x12+\n\x04type\x18\x01 \x02(\x0e\x32\x1d.botCode.GameEvents.EventType\x12\x0c\n\x04tick\x18\x02 \x02(\x05\x12\t\n\x01x\x18\x03 \x01(\x05\x12\t\n\x01y\x18\x04 \x01(\x05\x12\r\n\x05value\x18\x05 \x01(\x03\"\xb4\x01\n\tEventType\x12\x0b\n\x07RESTART\x10\x00\x12\x10\n\x0cPELLET_EATEN\x10\x01\x12\x16\n\x12POWER_PELLET_EATEN\x10\x02\x12\x10\n\x0c\x43HERRY_EATEN\x10\x03\x12\x0f\n\x0bGHOST_EATEN\x10\x04\x12\t\n\x05\x44\x45\x41TH\x10\x05\x12\r\n\tMODE_SWAP\x10\x06\x12\x10\n\x0c\x43HERRY_SPAWN\x10\x07\x12\x12\n\x0e\x43HERRY_DESPAWN\x10\x08\x12\r\n\tGAME_OVER\x10\t')
+
+
+
+_GAMEEVENTS = DESCRIPTOR.message_types_by_name['GameEvents']
+_GAMEEVENTS_EVENT = _GAMEEVENTS.nested_types_by_name['Event']
+_GAMEEVENTS_EVENTTYPE = _GAMEEVENTS.enum_types_by_name['EventType']
+GameEvents = _reflection.GeneratedProtocolMessageType('GameEvents', (_message.Message,), {
+
+  'Event' : _reflection.GeneratedProtocolMessageType('Event', (_message.Message,), {
+    'DESCRIPTOR' : _GAMEEVENTS_EVENT,
+    '__module__' : 'gameEvents_pb2'
+    # @@protoc_insertion_point(class_scope:botCode.GameEvents.Event)
+    })
+  ,
+  'DESCRIPTOR' : _GAMEEVENTS,
+  '__module__' : 'gameEvents_pb2'
+  # @@protoc_insertion_point(class_scope:botCode.GameEvents)
+  })
+_sym_db.RegisterMessage(GameEvents)
+_sym_db.RegisterMessage(GameEvents.Event)
+
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _GAMEEVENTS._serialized_start=30
+  _GAMEEVENTS._serialized_end=373
+  _GAMEEVENTS_EVENT._serialized_start=87
+  _GAMEEVENTS_EVENT._serialized_end=190
+  _GAMEEVENTS_EVENTTYPE._serialized_start=193
+  _GAMEEVENTS_EVENTTYPE._serialized_end=373
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,71 @@
+from variables import *
+from grid import grid
+
+###
+# Reads the pellet bitmap the game engine puts in every LightState (the pellets field):
+# one bit for every tile that holds a pellet or a power pellet at the start of a game,
+# column by column, set while the item is still there. Modules that keep a PelletBitmap
+# up to date know the pellets left without tracking the grid themselves.
+###
+
+# The tiles of the bitmap, and which of them hold a power pellet.
+_tiles = [(x, y) for x, col in enumerate(grid) for y, cell in enumerate(col) if cell in [o, O]]
+_index = {tile: i for i, tile in enumerate(_tiles)}
+_power_pellets = sum(1 << i for i, (x, y) in enumerate(_tiles) if grid[x][y] == O)
+
+
+class PelletBitmap:
+    """
+        The pellets left in the game, from the pellets field of the last LightState.
+    """
+    def __init__(self):
+        self.reset()
+
+    # Puts back every pellet, as at the start of a game.
+    def reset(self):
+        self.data = None
+        self.bits = (1 << len(_tiles)) - 1
+
+    # Takes the pellets field of a LightState and returns the tiles whose item was eaten
+    # (or put back, on a restart) since the last update. Most states do not change the
+    # pellets, which only costs comparing the bytes.
+    def update(self, data):
+        # Game engines from before the bitmap leave the field out
+        if data == self.data or not data:
+            return []
+        bits = int.from_bytes(data, 'little')
+        changed = bits ^ self.bits
+        self.data = data
+        self.bits = bits
+        tiles = []
+        while changed:
+            low = changed & -changed
+            tiles.append(_tiles[low.bit_length() - 1])
+            changed ^= low
+        return tiles
+
+    # Returns true if the tile still holds a pellet or a power pellet.
+    def __contains__(self, pos):
+        i = _index.get(pos)
+        return i is not None and (self.bits >> i) & 1 == 1
+
+    # Returns the item on the tile: o, O or e (including tiles that never hold one).
+    def item(self, pos):
+        i = _index.get(pos)
+        if i is None or not (self.bits >> i) & 1:
+            return e
+        return O if (_power_pellets >> i) & 1 else o
+
+    # Returns the set of tiles that still hold a pellet.
+    def pellets(self):
+        return self._tiles(self.bits & ~_power_pellets)
+
+    # Returns the set of tiles that still hold a power pellet.
+    def power_pellets(self):
+        return self._tiles(self.bits & _power_pellets)
+
+    def _tiles(self, bits):
+        return {tile for i, tile in enumerate(_tiles) if (bits >> i) & 1}
+
+    def __len__(self):
+        return bin(self.bits).count('1')
@@ -1,7 +1,13 @@
 import os
 from .server import Server
 from .protoModule import ProtoModule
+from .clock import RealClock, ScaledClock, VirtualClock, default_clock
+from .deltaReceiver import DeltaReceiver
+from .frameCodec import FrameCodec, FrameReader
+from .frameBridge import FrameBridge
+from .sharedRing import RingReader, RingWriter
 
 __path__.append(os.path.join(os.path.dirname(__file__), 'comm'))
 
-__all__ = ['Server', 'ProtoModule']
+__all__ = ['Server', 'ProtoModule', 'RealClock', 'ScaledClock', 'VirtualClock', 'default_clock',
+           'DeltaReceiver', 'FrameCodec', 'FrameReader', 'FrameBridge', 'RingReader', 'RingWriter']
@@ -1,9 +1,15 @@
-from .constants import _SUBSCRIBE, MAGIC_HEADER, SIZE_HEADER
+from .constants import _SUBSCRIBE, MAGIC_HEADER, SIZE_HEADER, UNIX_PREFIX
 
 class UnavailableClient:
     def __init__(self, *args, **kwargs):
         raise ImportError("Could not import client.")
 
+# Returns the path of the Unix domain socket of an address, or None if it is a TCP address.
+def unix_path(addr):
+    if isinstance(addr, str) and addr.startswith(UNIX_PREFIX):
+        return addr[len(UNIX_PREFIX):]
+    return None
+
 try:
     from .asyncClient import AsyncClient
 except ImportError:
@@ -20,5 +26,10 @@ def pack_msg(msg, msg_type):
     else:
         header = SIZE_HEADER.pack(MAGIC_HEADER, msg_type.value, len(msg))
     return header + msg
+
+# Like pack_msg, but returns the header and a view of the message as separate buffers
+# instead of copying both into a new one, for writing the same message to many clients.
+def frame_msg(msg, msg_type):
+    return [SIZE_HEADER.pack(MAGIC_HEADER, msg_type.value, len(msg)), memoryview(msg)]
     
 __all__ = ['AsyncClient', 'ServerProto']
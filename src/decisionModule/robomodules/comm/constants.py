@@ -3,3 +3,5 @@ import struct
 _SUBSCRIBE = 15000
 MAGIC_HEADER = 17380
 SIZE_HEADER = struct.Struct("!HHQ")
+# Addresses that start with this are Unix domain sockets, e.g. "unix:/tmp/pacbot.sock"
+UNIX_PREFIX = "unix:"
@@ -0,0 +1,35 @@
+class DeltaReceiver:
+    """
+    Rebuilds a state from a stream of delta messages. Every delta has a seq and either a
+    keyframe (the whole state, serialized) or the seq of the delta it applies on top of
+    (base_seq). Deltas that do not follow the last one applied, e.g. because the module
+    subscribed in the middle of the stream, cannot be applied; the receiver then calls
+    request_keyframe(last_seq) once and drops deltas until the next keyframe arrives.
+    """
+    def __init__(self, state_buffer, apply_delta, request_keyframe=None):
+        self.state_buffer = state_buffer
+        self.apply_delta = apply_delta
+        self.request_keyframe = request_keyframe
+        self.state = None
+        self.seq = -1
+        self.dropped = 0
+        self._requested = False
+
+    # Applies a delta message and returns the state, or None while waiting for a keyframe.
+    # The same state object is updated in place by every delta after a keyframe.
+    def receive(self, delta):
+        if delta.HasField('keyframe'):
+            self.state = self.state_buffer()
+            self.state.ParseFromString(delta.keyframe)
+            self.seq = delta.seq
+            self._requested = False
+            return self.state
+        if self.state is None or delta.base_seq != self.seq:
+            self.dropped += 1
+            if not self._requested and self.request_keyframe is not None:
+                self._requested = True
+                self.request_keyframe(self.seq)
+            return None
+        self.apply_delta(self.state, delta)
+        self.seq = delta.seq
+        return self.state
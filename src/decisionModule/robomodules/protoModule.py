@@ -1,17 +1,50 @@
-import asyncio
+import asyncio, collections
 from robomodules.comm.asyncClient import AsyncClient
 from robomodules.comm.subscribe_pb2 import Subscribe
+from robomodules.clock import default_clock
+from robomodules import sharedRing
+from robomodules.sharedRing import RingReader, RingWriter
+
+# Seconds between the looks of a module for the ring of a shared type it subscribed to
+# before a module on this computer wrote it, and between its checks that the ring it
+# reads is still the one modules write
+ATTACH_INTERVAL = 1.0
 
 class ProtoModule:
-    def __init__(self, addr, port, message_buffers, MsgType, frequency=0, subscriptions=[], loop=None):
+    def __init__(self, addr, port, message_buffers, MsgType, frequency=0, subscriptions=[], loop=None, clock=None, max_rates=None, shared=(), latched=()):
         self.loop = loop or asyncio.get_event_loop()
-        self.client = AsyncClient(addr, port, self.msg_received, message_buffers, MsgType, subscriptions, self.loop)
+        # The tick frequency is measured on this clock, see robomodules.clock
+        self.clock = clock or default_clock()
+        self.message_buffers = message_buffers
+        # Message types exchanged with the modules on this computer through shared memory
+        # as well as the server, see robomodules.sharedRing
+        self.shared = set(shared) if sharedRing.available() else set()
+        # Shared types the server latches, of which the ring also hands over the latest
+        # message as soon as the module starts reading it. The others only deliver the
+        # messages written from then on, as the server does.
+        self.latched = set(latched)
+        self._ring_dir = sharedRing.default_dir()
+        self._host = sharedRing.host_id(self._ring_dir) if self.shared else None
+        self._server = (addr, port)
+        self._writers = {}
+        # The readers_version of each writer the server last heard about
+        self._announced = {}
+        self._readers = {}
+        # Shared types only read from the server until a module on this computer writes them
+        self._waiting = set()
+        # The bytes of the messages read from the ring of each shared type that the server
+        # may still send as well, oldest first, until the server answers that it knows
+        # the module reads the ring
+        self._from_ring = {}
+        self.client = AsyncClient(addr, port, self.msg_received, message_buffers, MsgType, subscriptions, self.loop, max_rates,
+                                  seen=self._read_from_ring, announced=self._rings_announced)
+        self._subscribe_shared(subscriptions)
         self.frequency = frequency
         self.loop.call_soon(self._internal_tick)
 
     def _internal_tick(self):
         if self.frequency > 0:
-            self.loop.call_later(1.0/self.frequency, self._internal_tick)
+            self.clock.call_later(self.loop, 1.0/self.frequency, self._internal_tick)
             self.tick()
 
     def set_frequency(self, frequency):
@@ -24,24 +57,164 @@ class ProtoModule:
     def msg_received(self, msg, msg_type):
         raise NotImplementedError()
 
-    def subscribe(self, msg_types):
-        self.client.subscribe(msg_types, Subscribe.SUBSCRIBE)
+    def subscribe(self, msg_types, max_rates=None):
+        self._subscribe_shared(msg_types)
+        self.client.subscribe(msg_types, Subscribe.SUBSCRIBE, max_rates)
 
     def unsubscribe(self, msg_types):
+        for msg_type in msg_types:
+            self._waiting.discard(msg_type)
+            self._detach(msg_type)
         self.client.subscribe(msg_types, Subscribe.UNSUBSCRIBE)
 
     def write(self, msg, msg_type):
+        if msg_type in self.shared:
+            writer = self._writers.get(msg_type)
+            if writer is None:
+                writer = self._writers[msg_type] = RingWriter(self._ring_path(msg_type))
+            writer.write(msg)
+            # The server must know every reader that got the message from the ring
+            # before it gets the message, so it does not send it to them again
+            if self._announced.get(msg_type) != writer.readers_version:
+                readers = [self._reader_id(name) for name in writer.readers()]
+                if self.client.announce_rings([msg_type], Subscribe.RING_READERS, readers):
+                    self._announced[msg_type] = writer.readers_version
+        # Modules on other computers still get it from the server
         self.client.write(msg, msg_type)
 
+    # Reads the shared types of msg_types from their rings where a module on this computer
+    # writes them, and looks for the other rings until one does. The module stays
+    # subscribed to them on the server, which sends it every message it does not read
+    # from a ring (e.g. from modules on other computers).
+    def _subscribe_shared(self, msg_types):
+        for msg_type in msg_types:
+            if msg_type not in self.shared or msg_type in self._readers or msg_type in self._waiting:
+                continue
+            if not self._attach(msg_type, msg_type in self.latched):
+                self._wait(msg_type)
+
+    def _wait(self, msg_type):
+        self._waiting.add(msg_type)
+        self.clock.call_later(self.loop, ATTACH_INTERVAL, self._retry_attach, msg_type)
+
+    def _retry_attach(self, msg_type):
+        if msg_type not in self._waiting:
+            return
+        # The latest message already came from the server
+        if self._attach(msg_type, latest=False):
+            self._waiting.discard(msg_type)
+        else:
+            self.clock.call_later(self.loop, ATTACH_INTERVAL, self._retry_attach, msg_type)
+
+    # Stops reading a ring that was removed or made anew, which no module writes
+    # anymore, and looks for the new one.
+    def _check_ring(self, msg_type, reader):
+        if self._readers.get(msg_type) is not reader:
+            return
+        if reader.replaced():
+            self._read_ring(msg_type)
+            self._detach(msg_type)
+            self._wait(msg_type)
+        else:
+            self.clock.call_later(self.loop, ATTACH_INTERVAL, self._check_ring, msg_type, reader)
+
+    def _attach(self, msg_type, latest):
+        try:
+            reader = RingReader(self._ring_path(msg_type), latest)
+        except FileNotFoundError:
+            return False
+        self._readers[msg_type] = reader
+        self._from_ring[msg_type] = collections.deque(maxlen=sharedRing.SLOTS)
+        self.loop.add_reader(reader.fileno(), self._read_ring, msg_type)
+        if latest:
+            self.loop.call_soon(self._read_ring, msg_type)
+        self.client.announce_rings([msg_type], Subscribe.READ_RING, [self._reader_id(reader.name)])
+        self.clock.call_later(self.loop, ATTACH_INTERVAL, self._check_ring, msg_type, reader)
+        return True
+
+    def _detach(self, msg_type):
+        reader = self._readers.pop(msg_type, None)
+        if reader is None:
+            return False
+        self._from_ring.pop(msg_type, None)
+        self.client.announce_rings([msg_type], Subscribe.READ_RING, [''])
+        self.loop.remove_reader(reader.fileno())
+        reader.close()
+        return True
+
+    # Tells the server which rings the module reads, e.g. those it found before it
+    # was connected.
+    def _announce_readers(self):
+        if self._readers:
+            msg_types = list(self._readers)
+            self.client.announce_rings(msg_types, Subscribe.READ_RING,
+                                       [self._reader_id(self._readers[msg_type].name) for msg_type in msg_types])
+
+    # Called when the server knows which rings the module reads, after which it only
+    # sends the messages that are not in them
+    def _rings_announced(self, msg_types, readers):
+        for (msg_type, reader) in zip(msg_types, readers):
+            if msg_type in self._readers and self._reader_id(self._readers[msg_type].name) == reader:
+                self._from_ring.pop(msg_type, None)
+
+    def _read_ring(self, msg_type):
+        reader = self._readers.get(msg_type)
+        if reader is not None:
+            parse = self.message_buffers[msg_type].FromString
+            if msg_type not in self._from_ring:
+                for msg in reader.read(parse):
+                    self.msg_received(msg, msg_type)
+                return
+            from_ring = self._from_ring[msg_type]
+            for (data, msg) in reader.read(lambda view: (bytes(view), parse(view))):
+                from_ring.append(data)
+                self.msg_received(msg, msg_type)
+
+    # Returns whether a message from the server was already read from a ring. Until the
+    # server knows the module reads a ring, it can send the module the messages in it as
+    # well, since the modules that write a ring send every message to the server too.
+    def _read_from_ring(self, data, msg_type):
+        if msg_type not in self._from_ring:
+            return False
+        # A module writes the ring before it sends to the server, so the ring has the
+        # message by now if it is ever going to
+        self._read_ring(msg_type)
+        from_ring = self._from_ring.get(msg_type)
+        if not from_ring:
+            return False
+        data = bytes(data)
+        if data not in from_ring:
+            return False
+        # The ones before it are messages the server skipped (conflated or downsampled),
+        # and will not send anymore
+        while from_ring.popleft() != data:
+            pass
+        return True
+
+    # The name of a ring reader on this computer that the server tells apart from the
+    # readers on other computers
+    def _reader_id(self, name):
+        return '{}/{}'.format(self._host, name)
+
+    def _ring_path(self, msg_type):
+        return sharedRing.ring_path(self._ring_dir, self._server[0], self._server[1], msg_type)
+
     def connect(self):
         self.client.connect()
+        self._announce_readers()
     
     def run(self):
         try:
             with self.client:
+                self._announce_readers()
                 self.loop.run_forever()
         except KeyboardInterrupt:
             self.quit()
 
     def quit(self):
+        for msg_type in list(self._readers):
+            self._detach(msg_type)
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
         self.loop.stop()
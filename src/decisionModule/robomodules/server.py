@@ -2,48 +2,105 @@ import asyncio
 from robomodules.comm.serverProto import ServerProto
 from robomodules.comm.subscribe_pb2 import Subscribe
 from robomodules.comm.constants import _SUBSCRIBE
+from robomodules.comm import frame_msg, unix_path
+from robomodules.clock import default_clock
 
 class Server():
-    def __init__(self, addr, port, MsgType):
+    def __init__(self, addr, port, MsgType, conflated=(), latched=(), clock=None):
         self.loop = asyncio.get_event_loop()
+        # Rate limits are measured on this clock, see robomodules.clock
+        self.clock = clock or default_clock()
         self.clients = []
         self.subs = {}
         self.MsgType = MsgType
+        # Message types of which a client that does not keep up only needs the latest
+        self.conflated = set(conflated)
+        # Message types of which the last message is sent to every new subscriber, and
+        # the client that sent it and its frame, by type
+        self.latched = set(latched)
+        self._latest = {}
+        # The number of clients disconnected because they fell too far behind
+        self.overflows = 0
 
-        coro = self.loop.create_server(lambda: ServerProto(self), addr, port)
-        self.server = self.loop.run_until_complete(coro)
+        self.servers = []
+        self.server = self.listen(addr, port)
+
+    # Listens for modules on another address as well, e.g. on a Unix domain socket
+    # ("unix:/path") for the modules on this computer and on TCP for
+    # the others. Returns the asyncio server.
+    def listen(self, addr, port=None):
+        path = unix_path(addr)
+        if path is not None:
+            coro = self.loop.create_unix_server(lambda: ServerProto(self, clock=self.clock), path)
+        else:
+            coro = self.loop.create_server(lambda: ServerProto(self, clock=self.clock), addr, port)
+        server = self.loop.run_until_complete(coro)
+        self.servers.append(server)
+        return server
 
     def _handle_subscriptions(self, protocol, data):
         if data.dir == Subscribe.SUBSCRIBE:
             self._add_subscriptions(protocol, data)
-        else:
+        elif data.dir == Subscribe.UNSUBSCRIBE:
             self._remove_subscriptions(protocol, data)
+        elif data.dir == Subscribe.READ_RING:
+            for (msg_type, reader) in zip(data.msg_types, data.readers):
+                if reader:
+                    protocol.ring_reader[self.MsgType(msg_type)] = reader
+                else:
+                    protocol.ring_reader.pop(self.MsgType(msg_type), None)
+            # After this, the client gets no more messages it reads from a ring
+            protocol.write_control(data.SerializeToString())
+        elif data.dir == Subscribe.RING_READERS:
+            protocol.ring_readers[self.MsgType(data.msg_types[0])] = frozenset(data.readers)
 
     def _remove_subscriptions(self, protocol, data):
         for msg_type in data.msg_types:
             m_type = self.MsgType(msg_type)
             if m_type in self.subs:
                 self.subs[m_type].remove(protocol)
+            protocol.set_max_rate(m_type, 0)
+            protocol.ring_reader.pop(m_type, None)
 
     def _add_subscriptions(self, protocol, data):
-        for msg_type in data.msg_types:
+        for i, msg_type in enumerate(data.msg_types):
             m_type = self.MsgType(msg_type)
+            protocol.set_max_rate(m_type, data.max_rates[i] if i < len(data.max_rates) else 0)
             if m_type in self.subs:
                 self.subs[m_type].append(protocol)
             else:
                 self.subs[m_type] = [protocol]
+            if m_type in self._latest:
+                protocol.write_frame(self._latest[m_type][1], m_type, m_type in self.conflated)
 
-    def _forward_msg(self, msg, msg_type):
+    # Frames the message once and hands the same buffers to every subscriber, except the
+    # ones that read it from the sender's ring in shared memory. The message is a view of
+    # the sender's read buffer, so it is copied, once, first.
+    def _forward_msg(self, sender, msg, msg_type):
         m_type = self.MsgType(msg_type)
-        if m_type in self.subs:
-            for protocol in self.subs[m_type]:
-                protocol.write(msg, m_type)
+        subscribers = self.subs.get(m_type, [])
+        if not subscribers and m_type not in self.latched:
+            return
+        frame = frame_msg(bytes(msg), m_type)
+        if m_type in self.latched:
+            self._latest[m_type] = (sender, frame)
+        conflate = m_type in self.conflated
+        ring_readers = sender.ring_readers.get(m_type)
+        for protocol in subscribers:
+            if ring_readers and protocol.ring_reader.get(m_type) in ring_readers:
+                continue
+            protocol.write_frame(frame, m_type, conflate)
 
     def remove_client(self, protocol):
         self.clients.remove(protocol)
+        if protocol.overflowed:
+            self.overflows += 1
         for msg_type in self.subs:
             if protocol in self.subs[msg_type]:
                 self.subs[msg_type].remove(protocol)
+        # A new subscriber should not get the last word of a client that is gone
+        for msg_type in [m for m, (sender, _) in self._latest.items() if sender is protocol]:
+            del self._latest[msg_type]
 
     def msg_received(self, protocol, msg, msg_type):
         if msg_type == _SUBSCRIBE:
@@ -51,7 +108,11 @@ class Server():
             data.ParseFromString(msg)
             self._handle_subscriptions(protocol, data)
         else:
-            self._forward_msg(msg, msg_type)
+            self._forward_msg(protocol, msg, msg_type)
+
+    # Returns the queue depth, conflated and dropped message counts of every client.
+    def stats(self):
+        return [protocol.stats() for protocol in self.clients]
 
     def quit(self):
         self.loop.stop()
@@ -0,0 +1,282 @@
+import contextlib, fcntl, itertools, mmap, os, struct, tempfile, uuid
+
+# Messages a ring holds before it overwrites the oldest, and the most bytes a message
+# may have
+SLOTS = 64
+SLOT_SIZE = 8192
+
+# magic, pid of the last writer, slots, slot size, readers started, messages written
+_HEADER = struct.Struct('=4sIIIIQ')
+_PID = struct.Struct('=I')
+_PID_AT = 4
+_READERS = struct.Struct('=I')
+_READERS_AT = 16
+_WRITTEN = struct.Struct('=Q')
+_WRITTEN_AT = _HEADER.size - _WRITTEN.size
+# seqlock count (odd while the message is being written), message length
+_SLOT = struct.Struct('=QQ')
+_STRIDE = _SLOT.size + SLOT_SIZE
+_SIZE = _HEADER.size + SLOTS * _STRIDE
+_MAGIC = b'RMRG'
+_WAKE = '.wake'
+_ids = itertools.count()
+
+
+# Whether this platform has what rings need (named FIFOs)
+def available():
+    return hasattr(os, 'mkfifo')
+
+# The directory rings are kept in, in memory where the platform has a place for it
+def default_dir():
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(base, 'robomodules')
+
+# A name for the memory the rings in directory are in, the same for every module that
+# can map them, which tells the server which of its clients share rings
+def host_id(directory):
+    path = os.path.join(directory, 'host')
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        claim = '{}.{}'.format(path, os.getpid())
+        with open(claim, 'w') as f:
+            f.write(uuid.uuid4().hex)
+        try:
+            # Keeps the name of the first module to get here
+            os.link(claim, path)
+        except FileExistsError:
+            pass
+        finally:
+            _unlink(claim)
+    with open(path) as f:
+        return f.read()
+
+# The path of the ring of a message type of the server at addr and port
+def ring_path(directory, addr, port, msg_type):
+    name = '{}-{}-{}'.format(addr, port, msg_type.name)
+    return os.path.join(directory, ''.join(c if c.isalnum() or c in '-.' else '_' for c in name))
+
+def _offset(count):
+    return _HEADER.size + (count - 1) % SLOTS * _STRIDE
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def _unlink(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+class RingWriter:
+    """
+    Publishes the messages of one type to the modules on the same computer through a
+    ring of the last SLOTS messages in shared memory (a file in a memory-backed directory,
+    mapped by every module), and wakes each RingReader up through its FIFO. The ring
+    outlives the writer, so readers keep their mapping when the module that writes it
+    restarts. Several modules can write the same ring: each one claims the next slot and
+    fills it while holding a lock on the file (flock), so their messages take turns
+    instead of overwriting each other.
+    """
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._pid = os.getpid()
+        try:
+            with self._lock():
+                if os.fstat(self._fd).st_size != _SIZE:
+                    os.ftruncate(self._fd, 0)
+                    os.ftruncate(self._fd, _SIZE)
+                self._map = mmap.mmap(self._fd, _SIZE)
+                (magic, _, slots, slot_size, started, written) = _HEADER.unpack_from(self._map)
+                if (magic, slots, slot_size) != (_MAGIC, SLOTS, SLOT_SIZE):
+                    (started, written) = (0, 0)
+                _HEADER.pack_into(self._map, 0, _MAGIC, self._pid, SLOTS, SLOT_SIZE, started, written)
+        except OSError:
+            os.close(self._fd)
+            raise
+        self.path = path
+        # The FIFOs of the readers, by path
+        self._wakes = {}
+        # The count of readers started when the writer last looked for them
+        self._started = None
+        # Goes up whenever a reader is found or forgotten
+        self.readers_version = 0
+
+    def write(self, data):
+        if len(data) > SLOT_SIZE:
+            raise ValueError('a {}-byte message does not fit in a {}-byte slot'.format(len(data), SLOT_SIZE))
+        with self._lock():
+            started = _READERS.unpack_from(self._map, _READERS_AT)[0]
+            count = _WRITTEN.unpack_from(self._map, _WRITTEN_AT)[0] + 1
+            offset = _offset(count)
+            _SLOT.pack_into(self._map, offset, 2 * count - 1, len(data))
+            self._map[offset + _SLOT.size:offset + _SLOT.size + len(data)] = data
+            _SLOT.pack_into(self._map, offset, 2 * count, len(data))
+            _PID.pack_into(self._map, _PID_AT, self._pid)
+            _WRITTEN.pack_into(self._map, _WRITTEN_AT, count)
+        if started != self._started:
+            # A reader started since, which reads this message
+            self._started = started
+            self._scan()
+        self._wake()
+
+    @contextlib.contextmanager
+    def _lock(self):
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _wake(self):
+        for (path, fd) in list(self._wakes.items()):
+            try:
+                os.write(fd, b'\0')
+            except BlockingIOError:
+                # The reader has wake-ups it did not read yet, so it does not miss this one
+                pass
+            except OSError:
+                # The reader is gone
+                self._forget(path)
+
+    def _scan(self):
+        (directory, name) = os.path.split(self.path)
+        for entry in os.listdir(directory):
+            path = os.path.join(directory, entry)
+            if entry.startswith(name + '.') and entry.endswith(_WAKE) and path not in self._wakes:
+                try:
+                    self._wakes[path] = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+                    self.readers_version += 1
+                except OSError:
+                    # Nobody reads it anymore
+                    _unlink(path)
+
+    def _forget(self, path):
+        os.close(self._wakes.pop(path))
+        _unlink(path)
+        self.readers_version += 1
+
+    # The names (see RingReader.name) of the readers woken up by the last write, which
+    # read it and every message written after it
+    def readers(self):
+        return [os.path.basename(path) for path in self._wakes]
+
+    def close(self):
+        for fd in self._wakes.values():
+            os.close(fd)
+        self._wakes = {}
+        self._map.close()
+        os.close(self._fd)
+
+
+class RingReader:
+    """
+    Reads the messages a RingWriter publishes from now on (or from the latest one it had
+    written, if latest). Raises FileNotFoundError if no running module writes the ring.
+    Call read() whenever fileno() is readable. A reader that falls more than SLOTS
+    messages behind, or that has a message overwritten while it reads it, skips the
+    message and counts it in lost.
+    """
+    def __init__(self, path, latest=False):
+        fd = os.open(path, os.O_RDWR)
+        try:
+            if os.fstat(fd).st_size != _SIZE:
+                raise FileNotFoundError('{} is not a ring'.format(path))
+            self._map = mmap.mmap(fd, _SIZE)
+            # Only the last module to write the ring is checked for, which errs on the
+            # side of reading from the server (where every module writes as well)
+            (magic, pid, slots, slot_size, _, _) = _HEADER.unpack_from(self._map)
+            if (magic, slots, slot_size) != (_MAGIC, SLOTS, SLOT_SIZE) or not _alive(pid):
+                self._map.close()
+                raise FileNotFoundError('no module writes {}'.format(path))
+            self.path = path
+            self._inode = os.fstat(fd).st_ino
+            self._view = memoryview(self._map)
+            self.lost = 0
+
+            # The FIFO only gets its name once it is open, so a writer never takes it for
+            # the FIFO of a reader that is gone
+            opening = '{}.{}-{}'.format(path, os.getpid(), next(_ids))
+            os.mkfifo(opening, 0o600)
+            self._fifo = os.open(opening, os.O_RDONLY | os.O_NONBLOCK)
+            # Also open for writing, so the FIFO does not read as closed while no writer has it
+            self._keep = os.open(opening, os.O_WRONLY | os.O_NONBLOCK)
+            self._wake_path = opening + _WAKE
+            os.rename(opening, self._wake_path)
+            # A name for the reader that is unique on this computer
+            self.name = os.path.basename(self._wake_path)
+
+            # Counting the reader in makes every writer look for it at its next message,
+            # so each message after position is written by a writer that knows the
+            # reader reads it (see RingWriter.readers())
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                started = _READERS.unpack_from(self._map, _READERS_AT)[0]
+                _READERS.pack_into(self._map, _READERS_AT, (started + 1) & 0xffffffff)
+                written = _WRITTEN.unpack_from(self._map, _WRITTEN_AT)[0]
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+        # The count of the last message read
+        self.position = max(written - 1, 0) if latest else written
+
+    def fileno(self):
+        return self._fifo
+
+    # Whether the ring at the path is no longer the one this reader reads, because it
+    # was removed or a new one was made in its place
+    def replaced(self):
+        try:
+            return os.stat(self.path).st_ino != self._inode
+        except FileNotFoundError:
+            return True
+
+    # Returns parse(message) for every message written since the last read, where
+    # message is a memoryview of the ring that is only valid during the call.
+    def read(self, parse):
+        try:
+            os.read(self._fifo, 4096)
+        except BlockingIOError:
+            pass
+        written = _WRITTEN.unpack_from(self._map, _WRITTEN_AT)[0]
+        if written < self.position:
+            # The ring was made over, so every message in it is new
+            self.position = 0
+        if written - self.position > SLOTS:
+            self.lost += written - self.position - SLOTS
+            self.position = written - SLOTS
+
+        results = []
+        while self.position < written:
+            self.position += 1
+            offset = _offset(self.position)
+            (count, length) = _SLOT.unpack_from(self._map, offset)
+            if count != 2 * self.position:
+                self.lost += 1
+                continue
+            start = offset + _SLOT.size
+            try:
+                result = parse(self._view[start:start + min(length, SLOT_SIZE)])
+            except Exception:
+                if _SLOT.unpack_from(self._map, offset)[0] == count:
+                    raise
+            if _SLOT.unpack_from(self._map, offset)[0] != count:
+                self.lost += 1
+                continue
+            results.append(result)
+        return results
+
+    def close(self):
+        os.close(self._fifo)
+        os.close(self._keep)
+        _unlink(self._wake_path)
+        self._view.release()
+        self._map.close()
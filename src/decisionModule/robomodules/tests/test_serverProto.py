@@ -0,0 +1,106 @@
+import asyncio, unittest
+from enum import Enum
+from robomodules.comm import frame_msg
+from robomodules.comm.serverProto import ServerProto, MAX_QUEUE
+from robomodules.comm.constants import SIZE_HEADER
+from robomodules.clock import VirtualClock
+
+class MsgType(Enum):
+    STATE = 0
+    COMMAND = 1
+
+
+# Stands in for the server: only keeps track of the clients
+class FakeServer:
+    def __init__(self):
+        self.clients = []
+
+    def remove_client(self, protocol):
+        self.clients.remove(protocol)
+
+
+# Stands in for a socket: keeps what is written to it
+class FakeTransport:
+    def __init__(self):
+        self.written = []
+        self.aborted = False
+
+    def set_write_buffer_limits(self, high):
+        pass
+
+    def writelines(self, buffers):
+        self.written.extend(bytes(buf) for buf in buffers)
+
+    def is_closing(self):
+        return self.aborted
+
+    def abort(self):
+        self.aborted = True
+
+    def get_extra_info(self, name):
+        return None
+
+
+class ServerProtoTest(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.clock = VirtualClock()
+        self.client = ServerProto(FakeServer(), loop=self.loop, clock=self.clock)
+        self.transport = FakeTransport()
+        self.client.connection_made(self.transport)
+
+    def tearDown(self):
+        self.loop.close()
+
+    # Runs what the client scheduled, and what that scheduled in turn
+    def run_loop(self):
+        for _ in range(10):
+            self.loop.run_until_complete(asyncio.sleep(0))
+
+    # The payloads of the messages of a type written to the client, in order
+    def received(self, msg_type):
+        written = self.transport.written
+        return [written[i + 1] for i in range(0, len(written), 2)
+                if SIZE_HEADER.unpack(written[i])[1] == msg_type.value]
+
+    def test_paused_client_gets_every_command(self):
+        self.client.pause_writing()
+        commands = [str(i).encode() for i in range(MAX_QUEUE)]
+        for (i, command) in enumerate(commands):
+            for j in range(10):
+                self.client.write_frame(frame_msg(b'state %d' % (10 * i + j), MsgType.STATE), MsgType.STATE, True)
+            self.client.write_frame(frame_msg(command, MsgType.COMMAND), MsgType.COMMAND)
+        self.run_loop()
+        self.assertEqual(self.transport.written, [])
+
+        self.client.resume_writing()
+        self.assertEqual(self.received(MsgType.COMMAND), commands)
+        self.assertEqual(self.received(MsgType.STATE), [b'state %d' % (10 * MAX_QUEUE - 1)])
+        self.assertEqual(self.client.dropped, 0)
+        self.assertFalse(self.transport.aborted)
+
+    def test_client_too_far_behind_is_disconnected(self):
+        self.client.pause_writing()
+        for i in range(MAX_QUEUE + 1):
+            self.client.write_frame(frame_msg(b'%d' % i, MsgType.COMMAND), MsgType.COMMAND)
+        self.assertTrue(self.transport.aborted)
+        self.assertTrue(self.client.overflowed)
+        self.assertEqual(self.client.dropped, MAX_QUEUE + 1)
+        self.assertEqual(self.client.depth, 0)
+
+    def test_late_release_does_not_send_an_older_message(self):
+        self.client.set_max_rate(MsgType.STATE, 10)
+        self.client.write_frame(frame_msg(b'first', MsgType.STATE), MsgType.STATE, True)
+        self.run_loop()
+        self.clock.advance(0.05)
+        self.client.write_frame(frame_msg(b'held', MsgType.STATE), MsgType.STATE, True)
+        # The next message arrives after the held one is due, but before its timer ran
+        self.clock.advance(0.15)
+        self.client.write_frame(frame_msg(b'latest', MsgType.STATE), MsgType.STATE, True)
+        self.run_loop()
+        self.assertEqual(self.received(MsgType.STATE), [b'first', b'latest'])
+        self.assertEqual(self.client.downsampled, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,23 @@
 from variables import *
-import copy
+
+# Neighbor offsets in the order bfs has always expanded them. BFS returns the first
+# shortest path it finds, so this order decides between equally short paths.
+_offsets = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+# Returns the tiles next to loc that can be walked on in grid, in _offsets order.
+def neighbors(grid, loc):
+    return [(loc[0] + dx, loc[1] + dy) for (dx, dy) in _offsets
+            if 0 <= loc[0] + dx < len(grid) and 0 <= loc[1] + dy < len(grid[0])
+            and grid[loc[0] + dx][loc[1] + dy] in [o, e, O]]
 
 def bfs(grid, start, target, max_dist=float("inf")):
-    visited = []
+    visited = set()
     queue = [(start, [])]
 
     while len(queue) > 0:
         nxt = queue.pop(0)
-        visited.append(nxt[0])
-        new_path = copy.deepcopy(nxt[1])
-        new_path.append(nxt[0])
+        visited.add(nxt[0])
+        new_path = nxt[1] + [nxt[0]]
         loc = nxt[0]
         if type(target) is tuple:
             if target == loc:
@@ -17,13 +25,9 @@ def bfs(grid, start, target, max_dist=float("inf")):
         elif grid[loc[0]][loc[1]] in target:
             return new_path
 
-        if grid[loc[0] + 1][loc[1]] in [o, e, O] and (loc[0] + 1, loc[1]) not in visited and len(new_path) <= max_dist:
-            queue.append(((loc[0] + 1, loc[1]),new_path))
-        if grid[loc[0] - 1][loc[1]] in [o, e, O] and (loc[0] - 1, loc[1]) not in visited and len(new_path) <= max_dist:
-            queue.append(((loc[0] - 1, loc[1]),new_path))
-        if grid[loc[0]][loc[1] + 1] in [o, e, O] and (loc[0], loc[1] + 1) not in visited and len(new_path) <= max_dist:
-            queue.append(((loc[0], loc[1] + 1),new_path))
-        if grid[loc[0]][loc[1] - 1] in [o, e, O] and (loc[0], loc[1] - 1) not in visited and len(new_path) <= max_dist:
-            queue.append(((loc[0], loc[1] - 1),new_path))
+        if len(new_path) <= max_dist:
+            for neighbor in neighbors(grid, loc):
+                if neighbor not in visited:
+                    queue.append((neighbor, new_path))
 
     return None
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+
+import os
+import serial
+from robomodules import FrameBridge
+from messages import MsgType, message_buffers, SHARED
+from messages.frames import codec
+
+###
+# Bridges the serial link to the robot (e.g. the HC-05 Bluetooth module, see
+# bluetooth_examples) to the local server, in the fixed-layout frames of
+# messages/frames.py instead of protobuf: the light states and commands on the local
+# server go down to the robot, and the locations the robot reports come back up.
+###
+
+ADDRESS = os.environ.get("LOCAL_ADDRESS","localhost")
+PORT = os.environ.get("LOCAL_PORT", 11295)
+
+SERIAL_PORT = os.environ.get("SERIAL_PORT", "/dev/cu.PURC_HC05_2") # the robot's serial port
+SERIAL_BAUD = int(os.environ.get("SERIAL_BAUD", 115200)) # its baud rate
+
+TO_ROBOT = [MsgType.LIGHT_STATE, MsgType.PACMAN_COMMAND]
+FROM_ROBOT = [MsgType.PACMAN_LOCATION]
+
+
+def main():
+    with serial.Serial(SERIAL_PORT, SERIAL_BAUD, timeout=0) as link:
+        module = FrameBridge(ADDRESS, PORT, message_buffers, MsgType, codec, link, TO_ROBOT, FROM_ROBOT,
+                             shared=SHARED)
+        module.run()
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,30 @@
 
 import robomodules
 import os
-from messages import MsgType
+from messages import MsgType, LATCHED
 
 ADDRESS = os.environ.get("LOCAL_ADDRESS","localhost")
 PORT = os.environ.get("LOCAL_PORT", 11295)
+UNIX_ADDRESS = os.environ.get("UNIX_ADDRESS") # e.g. unix:/tmp/pacbot-local.sock, a second address for modules on this computer
+STATS_INTERVAL = float(os.environ.get("SERVER_STATS", 0)) # seconds between queue stats, 0 for none
+
+# The states, of which a client that falls behind only gets the latest. Commands are all
+# delivered. The latched ones (messages.LATCHED) are the same.
+CONFLATED = LATCHED
+
+def print_stats(server):
+    server.loop.call_later(STATS_INTERVAL, print_stats, server)
+    for stats in server.stats():
+        print('{peer}: {depth} queued, {conflated} conflated, {dropped} dropped, {downsampled} downsampled'.format(**stats))
+    if server.overflows:
+        print('{} clients disconnected for falling behind'.format(server.overflows))
 
 def main():
-    server = robomodules.Server(ADDRESS, PORT, MsgType)
+    server = robomodules.Server(ADDRESS, PORT, MsgType, CONFLATED, LATCHED)
+    if UNIX_ADDRESS:
+        server.listen(UNIX_ADDRESS)
+    if STATS_INTERVAL > 0:
+        server.loop.call_later(STATS_INTERVAL, print_stats, server)
     server.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,735 @@
+#!/usr/bin/env python3
+
+import argparse, copy, time
+from pacbot import GameState
+from pacbot.policies import RandomWalkPolicy
+from pacbot.variables import I, n, ticks_per_update
+from pacbot.ghostpaths import ghost_no_up_tiles, orange_start_path
+
+###
+# Micro-benchmarks for the game engine. Run ./benchmark.py -h for the list.
+###
+
+# Records the positions a random walk visits over one long game, so every benchmark
+# can feed the engines the same Pacman moves without paying for a policy.
+def record_positions(ticks, seed=0):
+    game = GameState(verbose=False)
+    game.unpause()
+    policy = RandomWalkPolicy(seed)
+    positions = []
+    while len(positions) < ticks:
+        position = policy(game)
+        if position is not None:
+            game.pacbot.update(position)
+        positions.append(game.pacbot.pos)
+        game.next_step()
+        if not game.play:
+            game.restart()
+            game.unpause()
+    return positions
+
+def report(name, count, unit, elapsed):
+    print('{:<28} {:>12.0f} {}/sec  ({:.3f}s)'.format(name, count / elapsed, unit, elapsed))
+
+def bench_batch(args):
+    import numpy as np
+    from pacbot.batchGameState import BatchGameState
+
+    positions = record_positions(4096)
+    offsets = [(37 * i) % len(positions) for i in range(args.games)]
+
+    games = [GameState(verbose=False) for _ in range(min(args.games, args.loop_games))]
+    for game in games:
+        game.unpause()
+    start = time.perf_counter()
+    for tick in range(args.ticks):
+        for i, game in enumerate(games):
+            game.pacbot.update(positions[(tick + offsets[i]) % len(positions)])
+            game.next_step()
+            if not game.play:
+                game.restart()
+                game.unpause()
+    report('GameState loop ({} games)'.format(len(games)), len(games) * args.ticks,
+           'game ticks', time.perf_counter() - start)
+
+    table = np.array(positions, dtype=np.int32)
+    offsets = np.array(offsets)
+    batch = BatchGameState(args.games, seed=0)
+    start = time.perf_counter()
+    for tick in range(args.ticks):
+        batch.next_step(table[(tick + offsets) % len(table)])
+        if not batch.play.all():
+            batch.restart(~batch.play)
+    report('BatchGameState ({} games)'.format(args.games), args.games * args.ticks,
+           'game ticks', time.perf_counter() - start)
+
+# The grid-scanning move generation GhostAgent used before the maze adjacency table.
+def _legacy_find_possible_moves(ghost):
+    def is_move_legal(move):
+        return (move != ghost.pos["current"] and
+                ghost.game_state.grid[move[0]][move[1]] != I and
+                ghost.game_state.grid[move[0]][move[1]] != n)
+    (x, y) = ghost.pos['next']
+    possible = []
+    if is_move_legal((x+1, y)):
+        possible.append((x+1, y))
+    if is_move_legal((x, y+1)) and (x, y) not in ghost_no_up_tiles:
+        possible.append((x, y+1))
+    if is_move_legal((x-1, y)):
+        possible.append((x-1, y))
+    if is_move_legal((x, y-1)):
+        possible.append((x, y-1))
+    if possible == []:
+        possible.append(ghost.pos["current"])
+    return possible
+
+def bench_ghosts(args):
+    from pacbot.ghostAgent import GhostAgent
+
+    def run():
+        game = GameState(verbose=False)
+        game.unpause()
+        # Skip the start paths so every ghost generates its moves on every update.
+        game.start_counter = len(orange_start_path)
+        start = time.perf_counter()
+        for _ in range(args.updates):
+            game._update_ghosts()
+        return time.perf_counter() - start
+
+    compiled = GhostAgent._find_possible_moves
+    try:
+        GhostAgent._find_possible_moves = _legacy_find_possible_moves
+        legacy_time = run()
+    finally:
+        GhostAgent._find_possible_moves = compiled
+    compiled_time = run()
+    for name, elapsed in [('grid scan', legacy_time), ('adjacency table', compiled_time)]:
+        print('{:<28} {:>8.2f} us/update'.format(name, elapsed / args.updates * 1e6))
+
+def bench_fork(args):
+    positions = record_positions(args.warmup + args.depth, seed=1)
+    game = GameState(verbose=False)
+    game.unpause()
+    for position in positions[:args.warmup]:
+        game.pacbot.update(position)
+        game.next_step()
+        if not game.play:
+            game.unpause()
+    lookahead = positions[args.warmup:]
+
+    def play_out(branch):
+        for position in lookahead:
+            branch.pacbot.update(position)
+            branch.next_step()
+
+    def run(name, branch):
+        start = time.perf_counter()
+        for _ in range(args.forks):
+            play_out(branch())
+        elapsed = time.perf_counter() - start
+        print('{:<28} {:>8.2f} us/branch'.format(name, elapsed / args.forks * 1e6))
+
+    run('deepcopy', lambda: copy.deepcopy(game))
+    run('fork', game.fork)
+    snapshot = game.snapshot()
+    scratch = GameState(verbose=False)
+    def restored():
+        scratch.restore(snapshot)
+        return scratch
+    run('snapshot/restore', restored)
+
+def bench_diff(args):
+    from pacbot import bitboard
+
+    before = GameState(verbose=False)
+    before.unpause()
+    for position in record_positions(args.ticks, seed=2):
+        before.pacbot.update(position)
+        before.next_step()
+        if not before.play:
+            before.unpause()
+    after = before.fork()
+    for _ in range(ticks_per_update * 3):
+        after.next_step()
+
+    def grid_scan():
+        return [(x, y) for x in range(len(before.grid)) for y in range(len(before.grid[0]))
+                if before.grid[x][y] != after.grid[x][y]]
+
+    def bitboards():
+        return bitboard.positions((before.pellet_board ^ after.pellet_board) |
+                                  (before.power_pellet_board ^ after.power_pellet_board) |
+                                  (before.cherry_board ^ after.cherry_board))
+
+    for name, diff in [('grid scan', grid_scan), ('bitboard xor', bitboards)]:
+        start = time.perf_counter()
+        for _ in range(args.diffs):
+            diff()
+        elapsed = time.perf_counter() - start
+        print('{:<28} {:>8.2f} us/diff'.format(name, elapsed / args.diffs * 1e6))
+
+def bench_hash(args):
+    game = GameState(verbose=False)
+    game.unpause()
+    positions = record_positions(args.ticks, seed=5)
+
+    def run(name, key):
+        game.restart()
+        game.unpause()
+        start = time.perf_counter()
+        for position in positions:
+            game.pacbot.update(position)
+            game.next_step()
+            if not game.play:
+                game.restart()
+                game.unpause()
+            key(game)
+        elapsed = time.perf_counter() - start
+        print('{:<28} {:>8.2f} us/tick'.format(name, elapsed / len(positions) * 1e6))
+
+    run('step only', lambda game: None)
+    run('step + snapshot hash', lambda game: hash(game.snapshot()))
+    run('step + zobrist hash', lambda game: game.zobrist_hash())
+
+def bench_full(args):
+    from pacbot.stateConverter import StateConverter
+    from messages.pacmanState_pb2 import PacmanState
+
+    game = GameState(verbose=False)
+    positions = record_positions(args.ticks, seed=3)
+
+    def run(name, serialize):
+        game.restart()
+        game.unpause()
+        elapsed = 0
+        for position in positions:
+            game.pacbot.update(position)
+            game.next_step()
+            if not game.play:
+                game.restart()
+                game.unpause()
+            start = time.perf_counter()
+            data = serialize(game)
+            elapsed += time.perf_counter() - start
+            # elapsed_time follows the clock, so it differs between any two conversions
+            (sent, expected) = (PacmanState.FromString(data), StateConverter.convert_game_state_to_full(game))
+            sent.ClearField('elapsed_time')
+            expected.ClearField('elapsed_time')
+            if sent != expected:
+                raise AssertionError('{} does not match convert_game_state_to_full'.format(name))
+        print('{:<28} {:>8.2f} us/tick'.format(name, elapsed / len(positions) * 1e6))
+
+    run('convert + serialize', lambda game: StateConverter.convert_game_state_to_full(game).SerializeToString())
+    run('cached grid', StateConverter.serialize_game_state_to_full)
+
+def bench_delta(args):
+    from pacbot import StateConverter, DeltaEncoder
+
+    game = GameState(verbose=False)
+    positions = record_positions(args.ticks, seed=4)
+    encoder = DeltaEncoder(args.keyframe_interval)
+
+    def run(name, serialize):
+        game.restart()
+        game.unpause()
+        elapsed = 0
+        size = 0
+        for position in positions:
+            game.pacbot.update(position)
+            game.next_step()
+            if not game.play:
+                game.restart()
+                game.unpause()
+            start = time.perf_counter()
+            size += len(serialize(game))
+            elapsed += time.perf_counter() - start
+        print('{:<28} {:>8.2f} us/tick {:>8.1f} bytes/tick'.format(
+            name, elapsed / len(positions) * 1e6, size / len(positions)))
+
+    run('full state', StateConverter.serialize_game_state_to_full)
+    run('state delta', lambda game: encoder.encode(game).SerializeToString())
+
+def bench_packed(args):
+    from pacbot import StateConverter
+    from messages import PacmanState
+    from messages.packedGrid import unpack_grid, unpack_state, cell_count
+
+    game = GameState(verbose=False)
+    game.unpause()
+    for position in record_positions(args.ticks, seed=6):
+        game.pacbot.update(position)
+        game.next_step()
+        if not game.play:
+            break
+    repeated = StateConverter.serialize_game_state_to_full(game)
+    packed = StateConverter.serialize_game_state_to_packed(game)
+    expected = PacmanState.FromString(repeated)
+    if list(unpack_state(PacmanState.FromString(packed)).grid) != list(expected.grid):
+        raise AssertionError('the packed grid does not match the grid')
+
+    def parse_repeated():
+        return PacmanState.FromString(repeated).grid
+
+    def parse_packed():
+        state = PacmanState.FromString(packed)
+        return unpack_grid(state.packed_grid, cell_count(state.packed_grid, state.grid_columns))
+
+    def parse_packed_state():
+        return unpack_state(PacmanState.FromString(packed)).grid
+
+    print('{:<34} {:>6} bytes'.format('FULL_STATE', len(repeated)))
+    print('{:<34} {:>6} bytes'.format('FULL_STATE_PACKED', len(packed)))
+    for name, parse in [('parse repeated grid', parse_repeated),
+                        ('parse packed grid to numpy', parse_packed),
+                        ('parse packed grid to state.grid', parse_packed_state)]:
+        start = time.perf_counter()
+        for _ in range(args.parses):
+            parse()
+        elapsed = time.perf_counter() - start
+        print('{:<34} {:>8.2f} us/parse'.format(name, elapsed / args.parses * 1e6))
+
+def bench_maze(args):
+    import tempfile
+    from pacbot.mazeTables import compile_maze, save_maze, load_maze
+    from pacbot.policies import HeuristicPolicy
+
+    directory = tempfile.mkdtemp()
+    save_maze(compile_maze(), directory)
+
+    for name, load in [('compile', compile_maze), ('load (mmap)', lambda: load_maze(directory))]:
+        start = time.perf_counter()
+        for _ in range(args.loads):
+            load()
+        elapsed = time.perf_counter() - start
+        print('{:<28} {:>8.2f} ms/load'.format(name, elapsed / args.loads * 1e3))
+
+    # Distances from a ghost to every tile around Pacman, searched for or looked up
+    maze = load_maze(directory)
+    game = GameState(verbose=False)
+    tiles = [tuple(int(v) for v in tile) for tile in maze.tiles]
+    pairs = [(tiles[(7 * i) % len(tiles)], tiles[(13 * i + 5) % len(tiles)]) for i in range(args.lookups)]
+    policy = HeuristicPolicy()
+
+    def bfs():
+        for a, b in pairs:
+            policy._bfs(game, a, lambda loc: loc == b)
+
+    def table():
+        for a, b in pairs:
+            maze.distance(a, b)
+
+    for name, run in [('bfs', bfs), ('table lookup', table)]:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        print('{:<28} {:>8.2f} us/distance'.format(name, elapsed / len(pairs) * 1e6))
+
+# Server._forward_msg before messages were framed once per fanout
+def _legacy_forward_msg(self, sender, msg, msg_type):
+    m_type = self.MsgType(msg_type)
+    if m_type in self.subs:
+        for protocol in self.subs[m_type]:
+            protocol.write(msg, m_type)
+
+def bench_fanout(args):
+    import asyncio
+    from messages import MsgType
+    from pacbot import StateConverter
+    from robomodules import Server
+    from robomodules.comm import pack_msg
+    from robomodules.comm.constants import _SUBSCRIBE
+    from robomodules.comm.subscribe_pb2 import Subscribe
+
+    # What the engine publishes every tick
+    game = GameState(verbose=False)
+    game.unpause()
+    tick = [pack_msg(StateConverter.serialize_game_state_to_full(game), MsgType.FULL_STATE),
+            pack_msg(StateConverter.convert_game_state_to_light(game).SerializeToString(),
+                     MsgType.LIGHT_STATE)]
+    expected = args.ticks * sum(len(frame) for frame in tick)
+    subscribe = Subscribe()
+    subscribe.dir = Subscribe.SUBSCRIBE
+    subscribe.msg_types.extend([MsgType.FULL_STATE.value, MsgType.LIGHT_STATE.value])
+    subscribe = pack_msg(subscribe.SerializeToString(), _SUBSCRIBE)
+
+    loop = asyncio.get_event_loop()
+
+    class Subscriber(asyncio.Protocol):
+        def __init__(self):
+            self.received = 0
+            self.done = loop.create_future()
+
+        def data_received(self, data):
+            self.received += len(data)
+            if self.received >= expected and not self.done.done():
+                self.done.set_result(None)
+
+    async def publish(server, port, count):
+        subscribers = []
+        for _ in range(count):
+            transport, subscriber = await loop.create_connection(Subscriber, 'localhost', port)
+            transport.write(subscribe)
+            subscribers.append((transport, subscriber))
+        publisher, _ = await loop.create_connection(asyncio.Protocol, 'localhost', port)
+        while len(server.subs.get(MsgType.FULL_STATE, [])) < count:
+            await asyncio.sleep(0.001)
+
+        start = time.perf_counter()
+        for _ in range(args.ticks):
+            publisher.writelines(tick)
+            await asyncio.sleep(0)
+        await asyncio.gather(*[subscriber.done for (_, subscriber) in subscribers])
+        elapsed = time.perf_counter() - start
+
+        publisher.close()
+        for (transport, _) in subscribers:
+            transport.close()
+        return elapsed
+
+    forward_msg = Server._forward_msg
+    for count in args.subscribers:
+        for name, forward in [('write per subscriber', _legacy_forward_msg),
+                              ('frame once, coalesced', forward_msg)]:
+            Server._forward_msg = forward
+            try:
+                server = Server('localhost', 0, MsgType)
+                port = server.server.sockets[0].getsockname()[1]
+                elapsed = loop.run_until_complete(publish(server, port, count))
+                server.server.close()
+                loop.run_until_complete(server.server.wait_closed())
+            finally:
+                Server._forward_msg = forward_msg
+            print('{:>3} subscribers, {:<22} {:>8.1f} us/tick {:>8.2f} us/delivery'.format(
+                count, name, elapsed / args.ticks * 1e6, elapsed / (args.ticks * count) * 1e6))
+
+# AsyncProto.data_received before it parsed messages in place
+class _LegacyParser:
+    def __init__(self, msg_received):
+        from robomodules.comm.constants import SIZE_HEADER
+        self.header = SIZE_HEADER
+        self.msg_received = msg_received
+        self.length = 0
+        self.buffer = b""
+        self.msg_type = -1
+
+    def data_received(self, data):
+        self.buffer += data
+        while self.buffer:
+            if not self.length and len(self.buffer) > self.header.size:
+                magic, msg_type, self.length = self.header.unpack(self.buffer[:self.header.size])
+                self.buffer = self.buffer[self.header.size:]
+                self.msg_type = msg_type
+            elif self.length and len(self.buffer) >= self.length:
+                self.msg_received(self.buffer[:self.length], self.msg_type)
+                self.buffer = self.buffer[self.length:]
+                self.length = 0
+                self.msg_type = -1
+            else:
+                return
+
+def bench_parse(args):
+    from messages import MsgType
+    from pacbot import StateConverter
+    from robomodules.comm import pack_msg
+    from robomodules.comm.asyncProto import AsyncProto
+
+    game = GameState(verbose=False)
+    game.unpause()
+    frame = pack_msg(StateConverter.convert_game_state_to_light(game).SerializeToString(),
+                     MsgType.LIGHT_STATE)
+
+    class Parser(AsyncProto):
+        def __init__(self, msg_received):
+            super().__init__()
+            self.msg_received = msg_received
+            self.connection_made(None)
+
+    print('{}-byte LIGHT_STATE frames'.format(len(frame)))
+    for count in args.frames:
+        stream = frame * count
+        # Reads that end in the middle of a frame, like TCP hands them over
+        reads = [stream[i:i + args.read_size] for i in range(0, len(stream), args.read_size)]
+        for name, make in [('bytes concatenation', _LegacyParser), ('in place', Parser)]:
+            received = []
+            parser = make(lambda data, msg_type: received.append(len(data)))
+            for data in reads:
+                parser.data_received(data)
+            if received != [len(frame) - 12] * count:
+                raise AssertionError('{} parsed {} messages out of {}'.format(name, len(received), count))
+
+            parser = make(lambda data, msg_type: None)
+            repeats = max(1, args.messages // count)
+            start = time.perf_counter()
+            for _ in range(repeats):
+                for data in reads:
+                    parser.data_received(data)
+            elapsed = time.perf_counter() - start
+            print('{:>5} frames per {}-byte read, {:<20} {:>8.2f} us/message'.format(
+                count, args.read_size if count * len(frame) > args.read_size else len(stream), name,
+                elapsed / (repeats * count) * 1e6))
+
+def bench_transport(args):
+    import asyncio, os, tempfile
+    from messages import MsgType, message_buffers
+    from pacbot import StateConverter
+    from robomodules import Server
+    from robomodules.comm.asyncClient import AsyncClient
+
+    game = GameState(verbose=False)
+    game.unpause()
+    light = StateConverter.convert_game_state_to_light(game).SerializeToString()
+    full = StateConverter.serialize_game_state_to_full(game)
+    loop = asyncio.get_event_loop()
+
+    class Client(AsyncClient):
+        def __init__(self, addr, port, subscriptions, received):
+            super().__init__(addr, port, None, message_buffers, MsgType, subscriptions, loop)
+            self.received = received
+
+        # Skips parsing the messages, which costs the same over either transport
+        def msg_received(self, data, msg_type):
+            self.received(data, msg_type)
+
+    async def run(source, done):
+        # A LIGHT_STATE to a module that answers with a PACMAN_LOCATION, through the server
+        start = time.perf_counter()
+        for _ in range(args.round_trips):
+            done[0] = loop.create_future()
+            source.write(light, MsgType.LIGHT_STATE)
+            await done[0]
+        latency = (time.perf_counter() - start) / args.round_trips
+
+        # FULL_STATEs as fast as the server forwards them
+        done[0] = loop.create_future()
+        start = time.perf_counter()
+        for i in range(args.messages):
+            source.write(full, MsgType.FULL_STATE)
+            if i % 64 == 0:
+                await asyncio.sleep(0)
+        await done[0]
+        return (latency, args.messages / (time.perf_counter() - start))
+
+    directory = tempfile.mkdtemp()
+    transports = [('tcp', '127.0.0.1'), ('unix', 'unix:' + os.path.join(directory, 'server.sock'))]
+    best = {}
+    # Alternates the transports and keeps the best run of each, so neither pays for warming up
+    for _ in range(args.repeats):
+        for name, addr in transports:
+            server = Server(addr, 0, MsgType)
+            port = server.server.sockets[0].getsockname()[1] if name == 'tcp' else None
+            done = [None]
+            received = [0]
+            def counted(data, msg_type):
+                received[0] += 1
+                if received[0] == args.messages:
+                    done[0].set_result(None)
+            echo = Client(addr, port, [MsgType.LIGHT_STATE],
+                          lambda data, msg_type: echo.write(bytes(data), MsgType.PACMAN_LOCATION))
+            source = Client(addr, port, [MsgType.PACMAN_LOCATION],
+                            lambda data, msg_type: done[0].set_result(None))
+            sink = Client(addr, port, [MsgType.FULL_STATE], counted)
+            for client in [echo, source, sink]:
+                client.connect()
+            loop.run_until_complete(asyncio.sleep(0.1))
+            (latency, throughput) = loop.run_until_complete(run(source, done))
+            for client in [echo, source, sink]:
+                client.transport.close()
+            server.server.close()
+            loop.run_until_complete(server.server.wait_closed())
+            (best_latency, best_throughput) = best.get(name, (latency, throughput))
+            best[name] = (min(latency, best_latency), max(throughput, best_throughput))
+
+    for name, _ in transports:
+        (latency, throughput) = best[name]
+        print('{:<5} {:>8.1f} us/round trip {:>8.0f} FULL_STATEs/s ({:.1f} MB/s)'.format(
+            name, latency * 1e6, throughput, throughput * len(full) / 1e6))
+
+# Runs a server in a process of its own, for bench_shared
+def _serve(addr, ports):
+    import asyncio
+    from messages import MsgType
+    from robomodules import Server
+    from robomodules.comm import unix_path
+
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    server = Server(addr, 0, MsgType)
+    ports.put(None if unix_path(addr) else server.server.sockets[0].getsockname()[1])
+    server.run()
+
+# Answers every LIGHT_STATE with a PACMAN_LOCATION in a process of its own, for bench_shared
+def _echo(addr, port, shared):
+    import asyncio
+    from messages import MsgType, message_buffers
+    from pacbot import StateConverter
+    from robomodules import ProtoModule
+
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    game = GameState(verbose=False)
+    location = StateConverter.convert_game_state_to_light(game).pacman.SerializeToString()
+
+    class Echo(ProtoModule):
+        def msg_received(self, msg, msg_type):
+            self.write(location, MsgType.PACMAN_LOCATION)
+
+        def tick(self):
+            pass
+
+    Echo(addr, port, message_buffers, MsgType, 0, [MsgType.LIGHT_STATE], shared=shared).run()
+
+def bench_shared(args):
+    import asyncio, multiprocessing, os, tempfile
+    from messages import MsgType, message_buffers
+    from pacbot import StateConverter
+    from robomodules import ProtoModule
+    from robomodules.protoModule import ATTACH_INTERVAL
+    from robomodules.sharedRing import default_dir, ring_path
+
+    game = GameState(verbose=False)
+    game.unpause()
+    light = StateConverter.convert_game_state_to_light(game).SerializeToString()
+    loop = asyncio.get_event_loop()
+
+    class Source(ProtoModule):
+        def __init__(self, addr, port, shared):
+            super().__init__(addr, port, message_buffers, MsgType, 0, [MsgType.PACMAN_LOCATION], loop, shared=shared)
+            self.answer = None
+
+        def msg_received(self, msg, msg_type):
+            if self.answer is not None and not self.answer.done():
+                self.answer.set_result(None)
+
+        def tick(self):
+            pass
+
+    async def ping(source):
+        start = time.perf_counter()
+        for _ in range(args.round_trips):
+            source.answer = loop.create_future()
+            source.write(light, MsgType.LIGHT_STATE)
+            await source.answer
+        return (time.perf_counter() - start) / args.round_trips
+
+    directory = tempfile.mkdtemp()
+    shared = [MsgType.LIGHT_STATE, MsgType.PACMAN_LOCATION]
+    paths = [('server, tcp', '127.0.0.1', []),
+             ('server, unix socket', 'unix:' + os.path.join(directory, 'server.sock'), []),
+             ('shared memory', '127.0.0.1', shared)]
+    best = {}
+    # The server, the module that answers and the one that times the round trips each
+    # run in a process, like they would on the robot. Alternates the paths and keeps the
+    # best run of each, so none pays for warming up.
+    for _ in range(args.repeats):
+        for name, addr, shared_types in paths:
+            ports = multiprocessing.Queue()
+            server = multiprocessing.Process(target=_serve, args=(addr, ports))
+            server.start()
+            port = ports.get()
+            echo = multiprocessing.Process(target=_echo, args=(addr, port, shared_types))
+            echo.start()
+            time.sleep(0.5)
+            source = Source(addr, port, shared_types)
+            source.connect()
+            # Both modules write once, then wait until the other has found the ring
+            source.write(light, MsgType.LIGHT_STATE)
+            loop.run_until_complete(asyncio.sleep(2 * ATTACH_INTERVAL + 0.2 if shared_types else 0.2))
+            if shared_types and not source._readers:
+                raise AssertionError('the source did not find the ring of the PACMAN_LOCATIONs')
+            latency = loop.run_until_complete(ping(source))
+            best[name] = min(latency, best.get(name, latency))
+
+            for msg_type in list(source._readers):
+                source._detach(msg_type)
+            for writer in source._writers.values():
+                writer.close()
+            source.client.transport.close()
+            for process in [echo, server]:
+                process.terminate()
+                process.join()
+            for msg_type in shared_types:
+                path = ring_path(default_dir(), addr, port, msg_type)
+                for entry in os.listdir(default_dir()):
+                    if os.path.join(default_dir(), entry).startswith(path):
+                        os.unlink(os.path.join(default_dir(), entry))
+
+    for name, _, _ in paths:
+        print('{:<20} {:>8.1f} us/round trip'.format(name, best[name] * 1e6))
+
+def main():
+    parser = argparse.ArgumentParser(description='Game engine micro-benchmarks.')
+    subparsers = parser.add_subparsers(dest='benchmark')
+    subparsers.required = True
+
+    batch = subparsers.add_parser('batch', help='BatchGameState against a loop over GameState objects')
+    batch.add_argument('-n', '--games', type=int, default=4096, help='number of games in the batch')
+    batch.add_argument('-t', '--ticks', type=int, default=500, help='ticks to advance')
+    batch.add_argument('--loop-games', type=int, default=256,
+                       help='number of GameState objects in the Python loop')
+    batch.set_defaults(run=bench_batch)
+
+    ghosts = subparsers.add_parser('ghosts', help='cost of one update of all four ghosts')
+    ghosts.add_argument('-u', '--updates', type=int, default=100000, help='ghost updates to time')
+    ghosts.set_defaults(run=bench_ghosts)
+
+    fork = subparsers.add_parser('fork', help='branching a game and playing a few ticks ahead')
+    fork.add_argument('-f', '--forks', type=int, default=20000, help='branches to time')
+    fork.add_argument('-d', '--depth', type=int, default=12, help='ticks to play on each branch')
+    fork.add_argument('-w', '--warmup', type=int, default=600, help='ticks to play before branching')
+    fork.set_defaults(run=bench_fork)
+
+    diff = subparsers.add_parser('diff', help='finding the tiles whose item changed between two ticks')
+    diff.add_argument('-d', '--diffs', type=int, default=20000, help='diffs to time')
+    diff.add_argument('-t', '--ticks', type=int, default=600, help='ticks to play before diffing')
+    diff.set_defaults(run=bench_diff)
+
+    hashing = subparsers.add_parser('hash', help='keying every tick of a game for a transposition table')
+    hashing.add_argument('-t', '--ticks', type=int, default=50000, help='ticks to play')
+    hashing.set_defaults(run=bench_hash)
+
+    full = subparsers.add_parser('full', help='serializing the FULL_STATE message every tick')
+    full.add_argument('-t', '--ticks', type=int, default=2000, help='ticks to play')
+    full.set_defaults(run=bench_full)
+
+    delta = subparsers.add_parser('delta', help='size and cost of FULL_STATE against STATE_DELTA messages')
+    delta.add_argument('-t', '--ticks', type=int, default=5000, help='ticks to play')
+    delta.add_argument('-k', '--keyframe-interval', type=int, default=48, help='messages per keyframe')
+    delta.set_defaults(run=bench_delta)
+
+    packed = subparsers.add_parser('packed', help='size and parse time of FULL_STATE against FULL_STATE_PACKED')
+    packed.add_argument('-p', '--parses', type=int, default=2000, help='parses to time')
+    packed.add_argument('-t', '--ticks', type=int, default=600, help='ticks to play before serializing')
+    packed.set_defaults(run=bench_packed)
+
+    maze = subparsers.add_parser('maze', help='loading the compiled maze tables and looking up distances')
+    maze.add_argument('-l', '--loads', type=int, default=20, help='loads to time')
+    maze.add_argument('-d', '--lookups', type=int, default=2000, help='distances to time')
+    maze.set_defaults(run=bench_maze)
+
+    fanout = subparsers.add_parser('fanout', help='the server forwarding every tick to many subscribers')
+    fanout.add_argument('-t', '--ticks', type=int, default=500, help='ticks to publish')
+    fanout.add_argument('-s', '--subscribers', type=int, nargs='+', default=[1, 10, 50, 100],
+                        help='numbers of subscribers to time')
+    fanout.set_defaults(run=bench_fanout)
+
+    parse = subparsers.add_parser('parse', help='the robomodules parser splitting reads into messages')
+    parse.add_argument('-f', '--frames', type=int, nargs='+', default=[1, 100, 1000, 5000],
+                       help='numbers of frames sent at once to time')
+    parse.add_argument('-r', '--read-size', type=int, default=1 << 18, help='bytes per read')
+    parse.add_argument('-m', '--messages', type=int, default=20000, help='messages to time per run')
+    parse.set_defaults(run=bench_parse)
+
+    transport = subparsers.add_parser('transport', help='TCP against Unix domain sockets, through the server')
+    transport.add_argument('-r', '--round-trips', type=int, default=2000, help='round trips to time')
+    transport.add_argument('-m', '--messages', type=int, default=20000, help='FULL_STATEs to time the throughput with')
+    transport.add_argument('-n', '--repeats', type=int, default=5, help='runs of each transport to keep the best of')
+    transport.set_defaults(run=bench_transport)
+
+    shared = subparsers.add_parser('shared', help='modules on one computer through shared memory against the server')
+    shared.add_argument('-r', '--round-trips', type=int, default=2000, help='round trips to time')
+    shared.add_argument('-n', '--repeats', type=int, default=5, help='runs of each path to keep the best of')
+    shared.set_defaults(run=bench_shared)
+
+    args = parser.parse_args()
+    args.run(args)
+
+if __name__ == "__main__":
+    main()
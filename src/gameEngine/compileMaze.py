@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+
+import argparse, time
+from pacbot.mazeTables import MAZE_DIR, compile_maze, save_maze, load_maze
+
+###
+# Compiles the maze tables (adjacency, all-pairs distances, the junction/corridor
+# graph, pellet indices and ghost paths) into a directory of .npy files that the game
+# engine and the decision modules memory-map at startup. See pacbot/mazeTables.py.
+###
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile the maze tables.')
+    parser.add_argument('-o', '--output', default=MAZE_DIR,
+                        help='directory to write the tables to (default: $MAZE_DIR or src/maze)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    tables = compile_maze()
+    save_maze(tables, args.output)
+    print('Compiled {} tables in {:.2f}s to {}'.format(len(tables), time.perf_counter() - start,
+                                                      args.output))
+
+    start = time.perf_counter()
+    maze = load_maze(args.output)
+    assert not maze.compiled
+    print('Loading them takes {:.2f}ms'.format((time.perf_counter() - start) * 1e3))
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,143 @@
 #!/usr/bin/env python3
 
-import os, sys, logging
+import os, sys, time, logging
 import robomodules as rm
 from messages import *
+from messages.packedGrid import GRID_ENCODING # repeated, packed or both: publish FULL_STATE and/or FULL_STATE_PACKED
 from pacbot.variables import game_frequency, ticks_per_update
-from pacbot import StateConverter, GameState
+from pacbot import StateConverter, DeltaEncoder, GameState
+from pacbot.replay import ReplayWriter
+from pacbot.profiler import PhaseProfiler
 
 ADDRESS = os.environ.get("BIND_ADDRESS","localhost") # the address of the game engine server
 PORT = os.environ.get("BIND_PORT", 11297)            # the port the game engine server is listening to
+REPLAY_DIR = os.environ.get("REPLAY_DIR")            # if set, every game is recorded to a replay log here
+PROFILE = os.environ.get("PROFILE", "0").lower() not in ("", "0", "false", "no") # PROFILE=1 times the phases of every tick
+PROFILE_INTERVAL = float(os.environ.get("PROFILE_INTERVAL", 5)) # seconds between ENGINE_STATS messages
+STATE_STREAM = os.environ.get("STATE_STREAM", "full")  # full, delta or both: publish FULL_STATE and/or STATE_DELTA
+KEYFRAME_INTERVAL = int(os.environ.get("KEYFRAME_INTERVAL", 48)) # STATE_DELTA messages per keyframe
+HEARTBEAT = float(os.environ.get("HEARTBEAT", 1))    # seconds between repeats of an unchanged state, 0 to publish every tick
 
 FREQUENCY = game_frequency * ticks_per_update
 
 class GameEngine(rm.ProtoModule):
     def __init__(self, addr, port):
         self.subscriptions = [MsgType.PACMAN_LOCATION]
+        if STATE_STREAM != "full":
+            self.subscriptions.append(MsgType.KEYFRAME_REQUEST)
         super().__init__(addr, port, message_buffers, MsgType, FREQUENCY, self.subscriptions)
         self.loop.add_reader(sys.stdin, self.keypress)
 
-        self.game = GameState()
+        # The game's elapsed time runs on the module's clock, so it stays consistent
+        # with the tick rate when the stack runs faster than real time (CLOCK_SCALE)
+        self.game = GameState(clock=self.clock.time)
+        self.recorder = None
+        self._start_recording()
+        self.deltas = DeltaEncoder(KEYFRAME_INTERVAL) if STATE_STREAM != "full" else None
+
+        # States are only published when they change, or once per HEARTBEAT
+        self.seq = 0
+        self._published = None
+        self._published_at = 0
+
+        if PROFILE:
+            self.game.profiler = PhaseProfiler()
+            self.clock.call_later(self.loop, PROFILE_INTERVAL, self._write_stats)
+
+    # Starts a replay log for the current game, closing the previous game's log.
+    def _start_recording(self):
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        if REPLAY_DIR:
+            os.makedirs(REPLAY_DIR, exist_ok=True)
+            path = os.path.join(REPLAY_DIR, 'game-{}-{}.pbrl'.format(
+                time.strftime('%Y%m%d-%H%M%S'), self.game.seed))
+            logging.info('Recording game to ' + path)
+            self.recorder = ReplayWriter(path, self.game.seed)
+
+    # Returns what the published states depend on, besides the elapsed time: the Zobrist
+    # hash covers the board, the agents and the counters, but not the score or pausing.
+    def _state_signature(self):
+        return (self.game.zobrist_hash(), self.game.score, self.game.play)
 
     def _write_state(self):
-        full_state = StateConverter.convert_game_state_to_full(self.game)
-        self.write(full_state.SerializeToString(), MsgType.FULL_STATE)
+        # The first tick comes before the connection to the server is made
+        if self.client.transport is None:
+            return
+        signature = self._state_signature()
+        now = self.clock.time()
+        if (HEARTBEAT > 0 and signature == self._published and
+                now - self._published_at < HEARTBEAT):
+            return
+        self._published = signature
+        self._published_at = now
+        self.seq += 1
+
+        prof = self.game.profiler
+        if prof is not None:
+            start = time.perf_counter()
+        if STATE_STREAM != "delta" and GRID_ENCODING != "packed":
+            full_state = StateConverter.serialize_game_state_to_full(self.game, self.seq)
+            if prof is not None:
+                start = prof.lap('convert_full', start)
+            self.write(full_state, MsgType.FULL_STATE)
+            if prof is not None:
+                start = prof.lap('write_full', start)
 
-        light_state = StateConverter.convert_game_state_to_light(self.game)
-        self.write(light_state.SerializeToString(), MsgType.LIGHT_STATE)
+        if STATE_STREAM != "delta" and GRID_ENCODING != "repeated":
+            packed_state = StateConverter.serialize_game_state_to_packed(self.game, self.seq)
+            if prof is not None:
+                start = prof.lap('convert_packed', start)
+            self.write(packed_state, MsgType.FULL_STATE_PACKED)
+            if prof is not None:
+                start = prof.lap('write_packed', start)
+
+        if self.deltas is not None:
+            delta = self.deltas.encode(self.game).SerializeToString()
+            if prof is not None:
+                start = prof.lap('convert_delta', start)
+            self.write(delta, MsgType.STATE_DELTA)
+            if prof is not None:
+                start = prof.lap('write_delta', start)
+
+        light_state = StateConverter.convert_game_state_to_light(self.game, self.seq).SerializeToString()
+        if prof is not None:
+            start = prof.lap('convert_light', start)
+        self.write(light_state, MsgType.LIGHT_STATE)
+        if prof is not None:
+            prof.lap('write_light', start)
+
+    # Publishes the profiler's timings every PROFILE_INTERVAL seconds.
+    def _write_stats(self):
+        self.clock.call_later(self.loop, PROFILE_INTERVAL, self._write_stats)
+        stats = StateConverter.convert_profiler(self.game.profiler)
+        self.write(stats.SerializeToString(), MsgType.ENGINE_STATS)
+
+    # Publishes what happened since the game last stepped or restarted.
+    def _write_events(self):
+        if self.game.events:
+            events = StateConverter.convert_events(self.game.events)
+            self.write(events.SerializeToString(), MsgType.GAME_EVENTS)
 
     def msg_received(self, msg, msg_type):
         if msg_type == MsgType.PACMAN_LOCATION:
             self.game.pacbot.update((msg.x, msg.y))
+            if self.recorder is not None:
+                self.recorder.position((msg.x, msg.y))
+        elif msg_type == MsgType.KEYFRAME_REQUEST:
+            self.deltas.request_keyframe()
+            # Sends it on the next tick even if nothing has changed
+            self._published = None
 
     def tick(self):
         # this function will get called in a loop with FREQUENCY frequency
         if self.game.play:
             # This will become asynchronous
             self.game.next_step()
+            if self.recorder is not None:
+                self.recorder.step()
+            self._write_events()
         self._write_state()
 
     def keypress(self):
@@ -47,6 +150,8 @@ class GameEngine(rm.ProtoModule):
         if char == "r":
             logging.info("Restarting...")
             self.game.restart()
+            self._start_recording()
+            self._write_events()
             self._write_state()
         elif char == "p":
             if (self.game.play):
@@ -55,8 +160,15 @@ class GameEngine(rm.ProtoModule):
             else:
                 logging.info('Game resumed')
                 self.game.unpause()
+        elif char == "s":
+            if self.game.profiler is None:
+                logging.info('Profiling is off, run with PROFILE=1 to turn it on')
+            else:
+                logging.info('Engine timings:\n' + self.game.profiler.report())
         elif char == "q":
             logging.info("Quitting...")
+            if self.recorder is not None:
+                self.recorder.close()
             self.quit() 
 
 def main():
@@ -69,6 +181,8 @@ def main():
     print('Controls:')
     print('    r - restart')
     print('    p - (un)pause')
+    if PROFILE:
+        print('    s - print engine timings')
     print('    q - quit')
 
     engine.run()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+import argparse, os, time
+from pacbot.farm import GameFarm, summarize
+from pacbot.headless import MAX_TICKS
+from pacbot.policies import policies
+
+###
+# Evaluates a policy over many headless games spread over all cores, and prints the
+# distributions of the score, game time, deaths and pellets left. With --scaling it
+# plays the same games with 1, 2, 4, ... workers and reports the speedup of each.
+###
+
+def print_summary(results):
+    print('{:<14} {:>9} {:>9} {:>9} {:>9} {:>9} {:>9} {:>9}'.format(
+        '', 'mean', 'std', 'min', 'p10', 'p50', 'p90', 'max'))
+    for name, d in summarize(results).items():
+        print('{:<14} {:>9.1f} {:>9.1f} {:>9.1f} {:>9.1f} {:>9.1f} {:>9.1f} {:>9.1f}'.format(
+            name, d.mean, d.std, d.min, d.p10, d.p50, d.p90, d.max))
+
+def evaluate(farm, n_games, progress):
+    start = time.perf_counter()
+    results = [None] * n_games
+    for done, (index, result) in enumerate(farm.stream(n_games), 1):
+        results[index] = result
+        if progress and (done % progress == 0 or done == n_games):
+            print('{}/{} games  {:.1f} games/sec'.format(
+                done, n_games, done / (time.perf_counter() - start)))
+    elapsed = time.perf_counter() - start
+    print_summary(results)
+    print('Games: {}  Workers: {}  Elapsed: {:.2f}s  Games/sec: {:.2f}'.format(
+        n_games, farm.workers, elapsed, n_games / elapsed))
+
+def scaling(farm, n_games):
+    workers = []
+    count = 1
+    while count < farm.workers:
+        workers.append(count)
+        count *= 2
+    workers.append(farm.workers)
+
+    baseline = None
+    reference = None
+    print('{:>8} {:>10} {:>10} {:>9} {:>11}'.format('workers', 'elapsed s', 'games/sec',
+                                                     'speedup', 'efficiency'))
+    for count in workers:
+        farm.workers = count
+        results, elapsed = farm.run(n_games)
+        # The same seeds must give the same games, whatever the number of workers
+        if reference is None:
+            reference = results
+        elif results != reference:
+            print('warning: results differ from the run with 1 worker')
+        baseline = baseline or elapsed
+        print('{:>8} {:>10.2f} {:>10.2f} {:>8.2f}x {:>10.0%}'.format(
+            count, elapsed, n_games / elapsed, baseline / elapsed, baseline / elapsed / count))
+
+def main():
+    parser = argparse.ArgumentParser(description='Evaluate a policy over many games on all cores.')
+    parser.add_argument('-n', '--games', type=int, default=1000, help='number of games to play')
+    parser.add_argument('-p', '--policy', default='heuristic',
+                        help='built-in policy ({}) or module:callable'.format(', '.join(policies)))
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count(),
+                        help='number of worker processes (default: one per core)')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the games')
+    parser.add_argument('--max-ticks', type=int, default=MAX_TICKS, help='tick limit per game')
+    parser.add_argument('--chunk-size', type=int, default=8, help='games sent to a worker at once')
+    parser.add_argument('--progress', type=int, default=0, metavar='N',
+                        help='print progress every N games')
+    parser.add_argument('--scaling', action='store_true',
+                        help='report the speedup with 1, 2, 4, ... workers')
+    args = parser.parse_args()
+
+    farm = GameFarm(args.policy, args.workers, args.max_ticks, args.seed, args.chunk_size)
+    if args.scaling:
+        scaling(farm, args.games)
+    else:
+        evaluate(farm, args.games, args.progress)
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,17 @@
 import robomodules as rm
 from messages import *
+from messages.delta import STATE_TYPE, delta_receiver
+from messages.packedGrid import unpack_state
 from .variables import *
 from .spriteStripAnim import *
 
 class Visualizer(rm.ProtoModule):
     def __init__(self, addr, port, print_walls, print_pacman, split=Split.FULL, square_size=SQUARE_SIZE):
-        self.subscriptions = [MsgType.FULL_STATE]
+        self.subscriptions = [STATE_TYPE]
         super().__init__(addr, port, message_buffers, MsgType,DISPLAY_FREQUENCY, self.subscriptions)
 
         self.state = None
+        self.deltas = delta_receiver(self)
         self.print_walls = print_walls
         self.print_pacman = print_pacman
         self.last_tick = float('inf')
@@ -289,8 +292,13 @@ class Visualizer(rm.ProtoModule):
 
     def msg_received(self, msg, msg_type):
         # This gets called whenever any message is received
-        if msg_type == MsgType.FULL_STATE:
-            self.state = msg
+        if msg_type in [MsgType.FULL_STATE, MsgType.FULL_STATE_PACKED]:
+            self.state = unpack_state(msg)
+        elif msg_type == MsgType.STATE_DELTA:
+            # Keeps showing the last state while waiting for a keyframe
+            state = self.deltas.receive(msg)
+            if state is not None:
+                self.state = state
 
     def tick(self):
         # this function will get called in a loop with DISPLAY_FREQUENCY frequency
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+import argparse, os
+from pacbot import HeadlessRunner
+from pacbot.headless import MAX_TICKS
+from pacbot.replay import ReplayLog
+from pacbot.profiler import PhaseProfiler
+from pacbot.policies import policies, load_policy
+
+###
+# Plays complete games without the server, the event loop or the game clock, as fast
+# as the CPU allows. The policy is either one of the built-in policies in pacbot.policies
+# or any callable given as module:name that takes the GameState and returns a position.
+# It can also replay a log recorded by the game engine or by --record.
+###
+
+def replay(paths):
+    for path in paths:
+        game = ReplayLog.load(path).replay()
+        print('{}: seed {} score {} ticks {} lives {} pellets left {}'.format(
+            path, game.seed, game.score, game.update_ticks, game.lives,
+            game.pellets + game.power_pellets))
+
+def main():
+    parser = argparse.ArgumentParser(description='Run Pacbot games headlessly.')
+    parser.add_argument('-n', '--games', type=int, default=10, help='number of games to play')
+    parser.add_argument('-p', '--policy', default='greedy',
+                        help='built-in policy ({}) or module:callable'.format(', '.join(policies)))
+    parser.add_argument('--seed', type=int, default=None, help='seed for the games and the policy')
+    parser.add_argument('--max-ticks', type=int, default=MAX_TICKS, help='tick limit per game')
+    parser.add_argument('-q', '--quiet', action='store_true', help='only print the summary')
+    parser.add_argument('--record', metavar='DIR', help='write a replay log of every game to DIR')
+    parser.add_argument('--replay', metavar='LOG', nargs='+', help='replay logs instead of playing')
+    parser.add_argument('--profile', action='store_true', help='time the phases of every game step')
+    args = parser.parse_args()
+
+    if args.replay:
+        replay(args.replay)
+        return
+
+    if args.record:
+        os.makedirs(args.record, exist_ok=True)
+    runner = HeadlessRunner(load_policy(args.policy, args.seed), args.max_ticks,
+                            args.seed, args.record)
+    if args.profile:
+        runner.game.profiler = PhaseProfiler()
+    results, elapsed = runner.run(args.games)
+
+    if not args.quiet:
+        for i, result in enumerate(results):
+            print('Game {}: score {} ticks {} deaths {} pellets left {}'.format(
+                i, result.score, result.ticks, result.deaths, result.pellets_left))
+
+    ticks = sum(result.ticks for result in results)
+    print('Games: {}  Mean score: {:.1f}  Mean ticks: {:.1f}  Mean deaths: {:.2f}'.format(
+        len(results), sum(result.score for result in results) / len(results),
+        ticks / len(results), sum(result.deaths for result in results) / len(results)))
+    print('Elapsed: {:.2f}s  Games/sec: {:.2f}  Ticks/sec: {:.0f}'.format(
+        elapsed, len(results) / elapsed, ticks / elapsed))
+    if args.profile:
+        print(runner.game.profiler.report())
+
+if __name__ == "__main__":
+    main()
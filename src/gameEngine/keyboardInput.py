@@ -3,6 +3,7 @@
 import os, sys, curses
 import robomodules as rm
 from messages import *
+from messages.delta import STATE_TYPE, delta_receiver
 from pacbot.variables import *
 from pacbot.grid import *
 
@@ -14,8 +15,9 @@ FREQUENCY = SPEED * game_frequency
 
 class InputModule(rm.ProtoModule):
     def __init__(self, addr, port):
-        self.subscriptions = [MsgType.FULL_STATE]
+        self.subscriptions = [STATE_TYPE]
         super().__init__(addr, port, message_buffers, MsgType, FREQUENCY, self.subscriptions)
+        self.deltas = delta_receiver(self)
 
         self.loop.add_reader(sys.stdin, self.keypress)
         self.pacbot_pos = [pacbot_starting_pos[0], pacbot_starting_pos[1]]
@@ -49,7 +51,11 @@ class InputModule(rm.ProtoModule):
     def msg_received(self, msg, msg_type):
         # This gets called whenever any message is received
         # This module only sends data, so we ignore incoming messages
-        if msg_type == MsgType.FULL_STATE:
+        if msg_type in [MsgType.FULL_STATE, MsgType.FULL_STATE_PACKED, MsgType.STATE_DELTA]:
+            if msg_type == MsgType.STATE_DELTA:
+                msg = self.deltas.receive(msg)
+                if msg is None:
+                    return
             self.state = msg
             if self.state.lives != self.lives:
                 self.lives = self.state.lives
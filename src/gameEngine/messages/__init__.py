@@ -1,17 +1,31 @@
 from enum import Enum
 from .pacmanState_pb2 import PacmanState
 from .lightState_pb2 import LightState
+from .gameEvents_pb2 import GameEvents
+from .engineStats_pb2 import EngineStats
+from .stateDelta_pb2 import StateDelta, KeyframeRequest
 
 class MsgType(Enum):
     LIGHT_STATE = 0
     PACMAN_LOCATION = 1
     FULL_STATE = 2
+    GAME_EVENTS = 3
+    ENGINE_STATS = 4
+    STATE_DELTA = 5
+    KEYFRAME_REQUEST = 6
+    FULL_STATE_PACKED = 7
 
 message_buffers = {
     MsgType.FULL_STATE: PacmanState,
     MsgType.PACMAN_LOCATION: PacmanState.AgentState,
-    MsgType.LIGHT_STATE: LightState
+    MsgType.LIGHT_STATE: LightState,
+    MsgType.GAME_EVENTS: GameEvents,
+    MsgType.ENGINE_STATS: EngineStats,
+    MsgType.STATE_DELTA: StateDelta,
+    MsgType.KEYFRAME_REQUEST: KeyframeRequest,
+    MsgType.FULL_STATE_PACKED: PacmanState
 }
 
 
-__all__ = ['MsgType', 'message_buffers', 'PacmanState', 'LightState']
+__all__ = ['MsgType', 'message_buffers', 'PacmanState', 'LightState', 'GameEvents', 'EngineStats',
+           'StateDelta', 'KeyframeRequest']
@@ -0,0 +1,53 @@
+import os
+from robomodules import DeltaReceiver
+from . import MsgType
+from .pacmanState_pb2 import PacmanState
+from .stateDelta_pb2 import KeyframeRequest
+from .packedGrid import GRID_ENCODING
+
+###
+# Rebuilding the full state (PacmanState) from the game engine's STATE_DELTA messages,
+# which only carry what changed since the previous one, with a keyframe of the whole
+# state every so often and whenever a client asks for one.
+###
+
+# The state messages the game engine publishes: "full" for full states, "delta" for
+# STATE_DELTA, or "both". Clients subscribe to STATE_DELTA unless it is "full", and
+# otherwise to the full states in the GRID_ENCODING (see messages/packedGrid.py).
+STATE_STREAM = os.environ.get("STATE_STREAM", "full")
+if STATE_STREAM != "full":
+    STATE_TYPE = MsgType.STATE_DELTA
+elif GRID_ENCODING != "repeated":
+    STATE_TYPE = MsgType.FULL_STATE_PACKED
+else:
+    STATE_TYPE = MsgType.FULL_STATE
+
+_agents = ['pacman', 'red_ghost', 'pink_ghost', 'orange_ghost', 'blue_ghost']
+_fields = ['mode', 'frightened_timer', 'score', 'lives', 'update_ticks', 'elapsed_time']
+
+
+# Applies a (non-keyframe) StateDelta to a PacmanState in place.
+def apply_delta(state, delta):
+    for name in _agents:
+        if delta.HasField(name):
+            (agent, changed) = (getattr(state, name), getattr(delta, name))
+            agent.x = changed.x
+            agent.y = changed.y
+            agent.direction = changed.direction
+            if changed.HasField('frightened_counter'):
+                agent.frightened_counter = changed.frightened_counter
+    for name in _fields:
+        if delta.HasField(name):
+            setattr(state, name, getattr(delta, name))
+    for cell in delta.cells:
+        state.grid[cell.index] = cell.value
+
+
+# Returns a robomodules.DeltaReceiver that rebuilds the PacmanState from STATE_DELTA
+# messages and asks the game engine for a keyframe through module when it has to.
+def delta_receiver(module):
+    def request_keyframe(last_seq):
+        request = KeyframeRequest()
+        request.last_seq = last_seq
+        module.write(request.SerializeToString(), MsgType.KEYFRAME_REQUEST)
+    return DeltaReceiver(PacmanState, apply_delta, request_keyframe)
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: engineStats.proto
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import message as _message
+from google.protobuf import reflection as _reflection
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11\x65ngineStats.proto\x12\ngameEngine\"\xb3\x01\n\x0b\x45ngineStats\x12-\n\x06phases\x18\x01 \x03(\x0b\x32\x1d.gameEngine.EngineStats.Phase\x1au\n\x05Phase\x12\x0c\n\x04name\x18\x01 \x02(\t\x12\r\n\x05\x63ount\x18\x02 \x02(\x03\x12\r\n\x05total\x18\x03 \x02(\x01\x12\x0c\n\x04mean\x18\x04 \x02(\x01\x12\x0b\n\x03p50\x18\x05 \x02(\x01\x12\x0b\n\x03p90\x18\x06 \x02(\x01\x12\x0b\n\x03p99\x18\x07 \x02(\x01\x12\x0b\n\x03max\x18\x08 \x02(\x01')
+
+
+
+_ENGINESTATS = DESCRIPTOR.message_types_by_name['EngineStats']
+_ENGINESTATS_PHASE = _ENGINESTATS.nested_types_by_name['Phase']
+EngineStats = _reflection.GeneratedProtocolMessageType('EngineStats', (_message.Message,), {
+
+  'Phase' : _reflection.GeneratedProtocolMessageType('Phase', (_message.Message,), {
+    'DESCRIPTOR' : _ENGINESTATS_PHASE,
+    '__module__' : 'engineStats_pb2'
+    # @@protoc_insertion_point(class_scope:gameEngine.EngineStats.Phase)
+    })
+  ,
+  'DESCRIPTOR' : _ENGINESTATS,
+  '__module__' : 'engineStats_pb2'
+  # @@protoc_insertion_point(class_scope:gameEngine.EngineStats)
+  })
+_sym_db.RegisterMessage(EngineStats)
+_sym_db.RegisterMessage(EngineStats.Phase)
+
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _ENGINESTATS._serialized_start=34
+  _ENGINESTATS._serialized_end=213
+  _ENGINESTATS_PHASE._serialized_start=96
+  _ENGINESTATS_PHASE._serialized_end=213
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: stateDelta.proto
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import message as _message
+from google.protobuf import reflection as _reflection
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x10stateDelta.proto\x12\ngameEngine\"\xc6\x04\n\nStateDelta\x12\x0b\n\x03seq\x18\x01 \x02(\x05\x12\x10\n\x08\x62\x61se_seq\x18\x02 \x01(\x05\x12\x10\n\x08keyframe\x18\x03 \x01(\x0c\x12*\n\x05\x63\x65lls\x18\x04 \x03(\x0b\x32\x1b.gameEngine.StateDelta.Cell\x12,\n\x06pacman\x18\x05 \x01(\x0b\x32\x1c.gameEngine.StateDelta.Agent\x12/\n\tred_ghost\x18\x06 \x01(\x0b\x32\x1c.gameEngine.StateDelta.Agent\x12\x30\n\npink_ghost\x18\x07 \x01(\x0b\x32\x1c.gameEngine.StateDelta.Agent\x12\x32\n\x0corange_ghost\x18\x08 \x01(\x0b\x32\x1c.gameEngine.StateDelta.Agent\x12\x30\n\nblue_ghost\x18\t \x01(\x0b\x32\x1c.gameEngine.StateDelta.Agent\x12\x0c\n\x04mode\x18\n \x01(\x05\x12\x18\n\x10\x66rightened_timer\x18\x0b \x01(\x05\x12\r\n\x05score\x18\x0c \x01(\x05\x12\r\n\x05lives\x18\r \x01(\x05\x12\x14\n\x0cupdate_ticks\x18\x0e \x01(\x05\x12\x14\n\x0c\x65lapsed_time\x18\x0f \x01(\x02\x1aL\n\x05\x41gent\x12\t\n\x01x\x18\x01 \x02(\x05\x12\t\n\x01y\x18\x02 \x02(\x05\x12\x11\n\tdirection\x18\x03 \x01(\x05\x12\x1a\n\x12\x66rightened_counter\x18\x04 \x01(\x05\x1a$\n\x04\x43\x65ll\x12\r\n\x05index\x18\x01 \x02(\x05\x12\r\n\x05value\x18\x02 \x02(\x05\"#\n\x0fKeyframeRequest\x12\x10\n\x08last_seq\x18\x01 \x02(\x05')
+
+
+
+_STATEDELTA = DESCRIPTOR.message_types_by_name['StateDelta']
+_STATEDELTA_AGENT = _STATEDELTA.nested_types_by_name['Agent']
+_STATEDELTA_CELL = _STATEDELTA.nested_types_by_name['Cell']
+_KEYFRAMEREQUEST = DESCRIPTOR.message_types_by_name['KeyframeRequest']
+StateDelta = _reflection.GeneratedProtocolMessageType('StateDelta', (_message.Message,), {
+
+  'Agent' : _reflection.GeneratedProtocolMessageType('Agent', (_message.Message,), {
+    'DESCRIPTOR' : _STATEDELTA_AGENT,
+    '__module__' : 'stateDelta_pb2'
+    # @@protoc_insertion_point(class_scope:gameEngine.StateDelta.Agent)
+    })
+  ,
+
+  'Cell' : _reflection.GeneratedProtocolMessageType('Cell', (_message.Message,), {
+    'DESCRIPTOR' : _STATEDELTA_CELL,
+    '__module__' : 'stateDelta_pb2'
+    # @@protoc_insertion_point(class_scope:gameEngine.StateDelta.Cell)
+    })
+  ,
+  'DESCRIPTOR' : _STATEDELTA,
+  '__module__' : 'stateDelta_pb2'
+  # @@protoc_insertion_point(class_scope:gameEngine.StateDelta)
+  })
+_sym_db.RegisterMessage(StateDelta)
+_sym_db.RegisterMessage(StateDelta.Agent)
+_sym_db.RegisterMessage(StateDelta.Cell)
+
+KeyframeRequest = _reflection.GeneratedProtocolMessageType('KeyframeRequest', (_message.Message,), {
+  'DESCRIPTOR' : _KEYFRAMEREQUEST,
+  '__module__' : 'stateDelta_pb2'
+  # @@protoc_insertion_point(class_scope:gameEngine.KeyframeRequest)
+  })
+_sym_db.RegisterMessage(KeyframeRequest)
+
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _STATEDELTA._serialized_start=33
+  _STATEDELTA._serialized_end=615
+  _STATEDELTA_AGENT._serialized_start=501
+  _STATEDELTA_AGENT._serialized_end=577
+  _STATEDELTA_CELL._serialized_start=579
+  _STATEDELTA_CELL._serialized_end=615
+  _KEYFRAMEREQUEST._serialized_start=617
+  _KEYFRAMEREQUEST._serialized_end=652
+# @@protoc_insertion_point(module_scope)
@@ -1,5 +1,6 @@
 from .grid import grid
-from .stateConverter import StateConverter
+from .stateConverter import StateConverter, DeltaEncoder
 from .gameState import GameState
+from .headless import HeadlessRunner, GameResult
 
-__all__ = ['grid', 'StateConverter', 'GameState']
+__all__ = ['grid', 'StateConverter', 'DeltaEncoder', 'GameState', 'HeadlessRunner', 'GameResult']
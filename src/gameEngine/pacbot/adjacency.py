@@ -0,0 +1,62 @@
+from .variables import *
+from .ghostpaths import ghost_no_up_tiles
+from .grid import grid
+
+# Neighbor offsets in the order GhostAgent has always tried them. When two moves are
+# equally close to a ghost's target the first one wins, so this order is part of the rules.
+_offsets = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+
+
+class MazeAdjacency:
+    """
+        Move tables for the static maze, compiled once from a grid.
+
+        Walls and the ghost chambers never change during a game, so which tiles an
+        agent can step to only depends on where it is. For ghosts it also depends on
+        where it came from (its heading), since ghosts may not turn around, and on
+        ghost_no_up_tiles. Both are looked up here instead of being recomputed from
+        the grid on every update.
+    """
+    def __init__(self, grid):
+        self.width = len(grid)
+        self.height = len(grid[0])
+        self.walkable = frozenset((x, y) for x in range(self.width) for y in range(self.height)
+                                  if grid[x][y] not in [I, n])
+        no_up = set(ghost_no_up_tiles)
+
+        # Walkable neighbors of every tile, in _offsets order.
+        self.neighbors = {}
+        for x in range(self.width):
+            for y in range(self.height):
+                self.neighbors[(x, y)] = tuple((x + dx, y + dy) for (dx, dy) in _offsets
+                                               if (x + dx, y + dy) in self.walkable)
+
+        # Neighbors a ghost on a tile may move to, ignoring where it came from.
+        self._ghost_neighbors = {}
+        for tile, neighbors in self.neighbors.items():
+            if tile in no_up:
+                neighbors = tuple(move for move in neighbors if move != (tile[0], tile[1] + 1))
+            self._ghost_neighbors[tile] = neighbors
+
+        # Ghost moves keyed by (tile, tile the ghost came from). Every adjacent pair is
+        # compiled up front; anything else is filled in the first time it is asked for.
+        self._ghost_moves = {}
+        for tile in self.neighbors:
+            for (dx, dy) in _offsets:
+                self.ghost_moves(tile, (tile[0] + dx, tile[1] + dy))
+
+    # Returns the tiles a ghost heading to tile from the tile previous can move to next,
+    # matching GhostAgent's rules: no walls or ghost chambers, no turning around, no
+    # moving up from ghost_no_up_tiles. If no such tile exists, the ghost has to go back.
+    def ghost_moves(self, tile, previous):
+        key = (tile, previous)
+        moves = self._ghost_moves.get(key)
+        if moves is None:
+            moves = tuple(move for move in self._ghost_neighbors[tile] if move != previous)
+            moves = moves or (previous,)
+            self._ghost_moves[key] = moves
+        return moves
+
+
+# The adjacency of the game's maze, shared by every GameState.
+adjacency = MazeAdjacency(grid)
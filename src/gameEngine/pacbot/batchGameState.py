@@ -0,0 +1,392 @@
+from .variables import *
+from .ghostpaths import *
+from .grid import grid
+import numpy as np
+
+FREQUENCY = game_frequency * ticks_per_update
+
+# Ghost indices into the per-game agent arrays. This is also the order in which
+# GameState checks for collisions and eaten ghosts.
+RED, PINK, ORANGE, BLUE = range(4)
+
+# GameState updates the ghosts in this order, which matters because blue
+# targets a tile relative to red's freshly updated position.
+_update_order = [RED, ORANGE, PINK, BLUE]
+
+# Candidate ghost moves in the order GhostAgent._find_possible_moves() tries them.
+# Ties between equally distant moves go to the earliest one, so the order is part of the rules.
+_offsets = np.array([(1, 0), (0, 1), (-1, 0), (0, -1)], dtype=np.int32)
+_UP = 1
+
+_base_grid = np.array(grid, dtype=np.int8)
+_width, _height = _base_grid.shape
+
+# Walls and the ghost chambers, padded by one tile on every side so candidate moves
+# just off the board can be looked up without bounds checks.
+_open = np.zeros((_width + 2, _height + 2), dtype=bool)
+_open[1:-1, 1:-1] = (_base_grid != I) & (_base_grid != n)
+
+_no_up = np.zeros((_width, _height), dtype=bool)
+for (x, y) in ghost_no_up_tiles:
+    _no_up[x, y] = True
+
+_swap_times = np.array(state_swap_times)
+
+
+def _path_arrays(path):
+    positions = np.array([move[0] for move in path] or np.zeros((0, 2)), dtype=np.int32)
+    directions = np.array([move[1] for move in path], dtype=np.int8)
+    return positions, directions
+
+_start_paths = [_path_arrays(path) for path in
+                [[], pink_start_path, orange_start_path, blue_start_path]]
+_start_lengths = np.array([len(path[1]) for path in _start_paths])
+_respawn_pos, _respawn_dir = _path_arrays(respawn_path)
+
+# Note that GameState starts orange facing red's initial direction.
+_init_pos = np.array([red_init_pos, pink_init_pos, orange_init_pos, blue_init_pos], dtype=np.int32)
+_init_npos = np.array([red_init_npos, pink_init_npos, orange_init_npos, blue_init_npos], dtype=np.int32)
+_init_dir = np.array([red_init_dir, pink_init_dir, red_init_dir, blue_init_dir], dtype=np.int8)
+_scatter_pos = np.array([red_scatter_pos, pink_scatter_pos, orange_scatter_pos, blue_scatter_pos],
+                        dtype=np.int32)
+
+
+class BatchGameState:
+    """
+        Advances many independent games in lockstep, following the same rules as
+        GameState and GhostAgent, with every piece of per-game state held in NumPy
+        arrays indexed by game.
+
+        Two things differ from driving GameState objects from the game engine:
+        - After a death GameState pauses until someone resumes the game. Here the
+          game keeps going, just like the headless runner does.
+        - Frightened ghosts pick their random moves from a NumPy generator, so the
+          moves are drawn from the same distribution but not from the same stream
+          as random.choice.
+    """
+    def __init__(self, n_games, seed=None):
+        self.n_games = n_games
+        self.rng = np.random.default_rng(seed)
+        self._all = np.arange(n_games)
+
+        self.grid = np.empty((n_games, _width, _height), dtype=np.int8)
+        self.pellets = np.zeros(n_games, dtype=np.int32)
+        self.power_pellets = np.zeros(n_games, dtype=np.int32)
+        self.cherry = np.zeros(n_games, dtype=bool)
+        self.prev_cherry_pellets = np.zeros(n_games, dtype=np.int32)
+        self.ticks_since_spawn = np.zeros(n_games, dtype=np.int32)
+        self.state = np.zeros(n_games, dtype=np.int8)
+        self.old_state = np.zeros(n_games, dtype=np.int8)
+        self.just_swapped_state = np.zeros(n_games, dtype=bool)
+        self.frightened_counter = np.zeros(n_games, dtype=np.int32)
+        self.frightened_multiplier = np.zeros(n_games, dtype=np.int32)
+        self.score = np.zeros(n_games, dtype=np.int32)
+        self.lives = np.zeros(n_games, dtype=np.int32)
+        self.play = np.zeros(n_games, dtype=bool)
+        self.start_counter = np.zeros(n_games, dtype=np.int32)
+        self.state_counter = np.zeros(n_games, dtype=np.int32)
+        self.update_ticks = np.zeros(n_games, dtype=np.int64)
+
+        self.pacbot_pos = np.zeros((n_games, 2), dtype=np.int32)
+        self.pacbot_direction = np.zeros(n_games, dtype=np.int8)
+
+        # Ghost arrays are indexed [game, ghost], using the RED/PINK/ORANGE/BLUE indices.
+        self.ghost_pos = np.zeros((n_games, 4, 2), dtype=np.int32)
+        self.ghost_next_pos = np.zeros((n_games, 4, 2), dtype=np.int32)
+        self.ghost_direction = np.zeros((n_games, 4), dtype=np.int8)
+        self.ghost_frightened_counter = np.zeros((n_games, 4), dtype=np.int32)
+        self.ghost_respawn_counter = np.zeros((n_games, 4), dtype=np.int32)
+
+        self.restart()
+
+    # Returns a boolean mask selecting every game when no mask is given.
+    def _mask(self, mask):
+        if mask is None:
+            return np.ones(self.n_games, dtype=bool)
+        return np.asarray(mask, dtype=bool)
+
+    # Sets the selected games back to their original state and starts them playing.
+    def restart(self, mask=None):
+        mask = self._mask(mask)
+        self.grid[mask] = _base_grid
+        self.pellets[mask] = np.count_nonzero(_base_grid == o)
+        self.power_pellets[mask] = np.count_nonzero(_base_grid == O)
+        self.cherry[mask] = False
+        self.prev_cherry_pellets[mask] = 0
+        self.old_state[mask] = chase
+        self.state[mask] = scatter
+        self.just_swapped_state[mask] = False
+        self.frightened_counter[mask] = 0
+        self.frightened_multiplier[mask] = 1
+        self._respawn_agents(mask)
+        self.score[mask] = 0
+        self.start_counter[mask] = 0
+        self.state_counter[mask] = 0
+        self.update_ticks[mask] = 0
+        self.lives[mask] = starting_lives
+        self._update_score(mask)
+        self.grid[mask, cherry_pos[0], cherry_pos[1]] = e
+        self.ticks_since_spawn[mask] = 0
+        self.play[mask] = True
+
+    # Moves Pacman in every game, the batched equivalent of PacBot.update().
+    def update_pacbot(self, positions):
+        positions = np.asarray(positions, dtype=np.int32)
+        delta = positions - self.pacbot_pos
+        direction = self.pacbot_direction
+        direction = np.where(delta[:, 1] < 0, down, direction)
+        direction = np.where(delta[:, 1] > 0, up, direction)
+        direction = np.where(delta[:, 0] < 0, left, direction)
+        direction = np.where(delta[:, 0] > 0, right, direction)
+        self.pacbot_direction[:] = direction
+        self.pacbot_pos[:] = positions
+
+    def _respawn_agents(self, mask):
+        self.pacbot_pos[mask] = pacbot_starting_pos
+        self.pacbot_direction[mask] = pacbot_starting_dir
+        self.ghost_pos[mask] = _init_pos
+        self.ghost_next_pos[mask] = _init_npos
+        self.ghost_direction[mask] = _init_dir
+        self.ghost_frightened_counter[mask] = 0
+        self.ghost_respawn_counter[mask] = len(respawn_path)
+
+    def _become_frightened(self, mask):
+        self.old_state[mask] = np.where(self.state[mask] != frightened,
+                                        self.state[mask], self.old_state[mask])
+        self.state[mask] = frightened
+        self.frightened_counter[mask] = frightened_length
+        self.ghost_frightened_counter[mask] = frightened_length
+        self.just_swapped_state[mask] = True
+
+    def _end_frightened(self, mask):
+        self.state[mask] = self.old_state[mask]
+        self.frightened_multiplier[mask] = 1
+
+    # Eats whatever is on Pacman's tile in the selected games.
+    def _update_score(self, mask):
+        (x, y) = (self.pacbot_pos[:, 0], self.pacbot_pos[:, 1])
+        cell = self.grid[self._all, x, y]
+
+        if not (mask & ((cell == o) | (cell == O) | (cell == c))).any():
+            return
+
+        pellet = mask & (cell == o)
+        self.grid[pellet, x[pellet], y[pellet]] = e
+        self.score[pellet] += pellet_score
+        self.pellets[pellet] -= 1
+
+        power_pellet = mask & (cell == O)
+        self.grid[power_pellet, x[power_pellet], y[power_pellet]] = e
+        self.score[power_pellet] += power_pellet_score
+        self.power_pellets[power_pellet] -= 1
+        self._become_frightened(power_pellet)
+
+        cherry = mask & (cell == c)
+        self.grid[cherry, x[cherry], y[cherry]] = e
+        self.score[cherry] += cherry_score
+        self.cherry[cherry] = False
+
+    def _die(self, mask):
+        if not mask.any():
+            return
+        self.play[mask & (self.lives <= 1)] = False
+        respawn = mask & (self.lives > 1)
+        self._respawn_agents(respawn)
+        self.start_counter[respawn] = 0
+        self.state_counter[respawn] = 0
+        self.lives[respawn] -= 1
+        self.old_state[respawn] = chase
+        self.state[respawn] = scatter
+        self.frightened_counter[respawn] = 0
+        self.frightened_multiplier[respawn] = 1
+        self._update_score(respawn)
+        self.grid[respawn, cherry_pos[0], cherry_pos[1]] = e
+
+    # Returns a mask over [game, ghost] of the ghosts standing on Pacman's tile.
+    # Positions are compared as single tile numbers, which is much cheaper than
+    # comparing coordinate pairs.
+    def _ghosts_on_pacbot(self):
+        ghosts = self.ghost_pos[:, :, 0] * _height + self.ghost_pos[:, :, 1]
+        pacbot = self.pacbot_pos[:, 0] * _height + self.pacbot_pos[:, 1]
+        return ghosts == pacbot[:, None]
+
+    # Returns a mask of the games where Pacman shares a tile with a ghost
+    # that is not frightened.
+    def _should_die(self):
+        return (self._ghosts_on_pacbot() & (self.ghost_frightened_counter == 0)).any(axis=1)
+
+    def _check_if_ghosts_eaten(self, mask):
+        # Sending a ghost home does not affect the other ghosts, so all four can be
+        # checked up front; the score still has to be added in order because the
+        # multiplier grows with every ghost eaten.
+        eaten = self._ghosts_on_pacbot() & (self.ghost_frightened_counter > 0) & mask[:, None]
+        if not eaten.any():
+            return
+        for ghost in range(4):
+            ghost_eaten = eaten[:, ghost]
+            self._send_home(ghost, ghost_eaten)
+            self.score[ghost_eaten] += ghost_score * self.frightened_multiplier[ghost_eaten]
+            self.frightened_multiplier[ghost_eaten] += 1
+
+    def _send_home(self, ghost, mask):
+        self.ghost_pos[mask, ghost] = ghost_home_pos
+        self.ghost_next_pos[mask, ghost] = (ghost_home_pos[0], ghost_home_pos[1] + 1)
+        self.ghost_direction[mask, ghost] = up
+        self.ghost_respawn_counter[mask, ghost] = 0
+        self.ghost_frightened_counter[mask, ghost] = 0
+
+    def _update_ghosts(self, mask):
+        for ghost in _update_order:
+            self._update_ghost(ghost, mask)
+
+    # The batched equivalent of GhostAgent.update().
+    def _update_ghost(self, ghost, mask):
+        frightened_counter = self.ghost_frightened_counter[:, ghost]
+        frightened_counter[mask & (frightened_counter > 0)] -= 1
+
+        respawn_counter = self.ghost_respawn_counter[:, ghost]
+        start = mask & (self.start_counter < _start_lengths[ghost])
+        respawn = mask & ~start & (respawn_counter < len(respawn_path))
+        normal = mask & ~start & ~respawn
+
+        move = self.ghost_next_pos[:, ghost].copy()
+        direction = self.ghost_direction[:, ghost].copy()
+
+        if start.any():
+            (path_pos, path_dir) = _start_paths[ghost]
+            step = self.start_counter[start]
+            move[start] = path_pos[step]
+            direction[start] = path_dir[step]
+
+        if respawn.any():
+            respawn_counter[respawn] += 1
+            step = respawn_counter[respawn] - 1
+            move[respawn] = _respawn_pos[step]
+            direction[respawn] = _respawn_dir[step]
+
+        if normal.any():
+            games = np.nonzero(normal)[0]
+            (move[games], direction[games]) = self._get_next_state_moves(ghost, games)
+
+        self.ghost_pos[mask, ghost] = self.ghost_next_pos[mask, ghost]
+        self.ghost_next_pos[mask, ghost] = move[mask]
+        self.ghost_direction[mask, ghost] = direction[mask]
+
+    # The batched equivalent of GhostAgent._get_next_state_move() for the given games.
+    def _get_next_state_moves(self, ghost, games):
+        current = self.ghost_pos[games, ghost]
+        nxt = self.ghost_next_pos[games, ghost]
+
+        reverse = self.just_swapped_state[games]
+        frightened_move = ~reverse & (self.ghost_frightened_counter[games, ghost] > 0)
+        chase_move = ~reverse & ~frightened_move & (self.state[games] == chase)
+
+        # Possible moves, with the same legality rules as GhostAgent._find_possible_moves()
+        candidates = nxt[:, None, :] + _offsets
+        legal = _open[candidates[:, :, 0] + 1, candidates[:, :, 1] + 1]
+        legal &= ((candidates[:, :, 0] != current[:, None, 0]) |
+                  (candidates[:, :, 1] != current[:, None, 1]))
+        legal[:, _UP] &= ~_no_up[nxt[:, 0], nxt[:, 1]]
+
+        targets = np.broadcast_to(_scatter_pos[ghost], current.shape).copy()
+        if chase_move.any():
+            targets[chase_move] = self._get_chase_targets(ghost, games[chase_move], current[chase_move])
+
+        # Squared distances give the same ordering as the euclidean distances GhostAgent
+        # uses, and being integers they cannot break ties differently.
+        distances = ((candidates - targets[:, None, :]) ** 2).sum(axis=2)
+        choice = np.where(legal, distances, np.iinfo(np.int32).max).argmin(axis=1)
+        if frightened_move.any():
+            choice[frightened_move] = self._pick_random_moves(legal[frightened_move])
+
+        move = candidates[np.arange(len(games)), choice]
+        # With no legal moves, or when the game just swapped state, the ghost turns around.
+        stay = reverse | ~legal.any(axis=1)
+        move[stay] = current[stay]
+
+        direction = self.ghost_direction[games, ghost].copy()
+        delta = move - nxt
+        direction = np.where(delta[:, 1] < 0, down, direction)
+        direction = np.where(delta[:, 1] > 0, up, direction)
+        direction = np.where(delta[:, 0] < 0, left, direction)
+        direction = np.where(delta[:, 0] > 0, right, direction)
+        return move, direction
+
+    # Picks one legal move uniformly at random in each row, the batched equivalent
+    # of random.choice() over the list of possible moves.
+    def _pick_random_moves(self, legal):
+        counts = np.maximum(legal.sum(axis=1), 1)
+        picks = self.rng.integers(0, counts)
+        return (legal.cumsum(axis=1) > picks[:, None]).argmax(axis=1)
+
+    # Returns the chase mode targets of the given ghost, as in GhostAgent._get_next_chase_move().
+    def _get_chase_targets(self, ghost, games, current):
+        pacbot = self.pacbot_pos[games]
+        if ghost == RED:
+            return pacbot
+        if ghost == ORANGE:
+            close = ((current - pacbot) ** 2).sum(axis=1) < 8 ** 2
+            return np.where(close[:, None], _scatter_pos[ORANGE], pacbot)
+
+        direction = self.pacbot_direction[games]
+        ahead = 4 if ghost == PINK else 2
+        offset = np.zeros_like(pacbot)
+        # Facing up replicates the original game's bug of also looking to the left.
+        offset[direction == up] = (-ahead, ahead)
+        offset[direction == down] = (0, -ahead)
+        offset[direction == left] = (-ahead, 0)
+        offset[direction == right] = (ahead, 0)
+        if ghost == PINK:
+            return pacbot + offset
+
+        pacbot_target = pacbot + offset
+        return 2 * pacbot_target - self.ghost_pos[games, RED]
+
+    # Advances every game that is still playing by one tick, the batched equivalent of
+    # GameState.next_step(). If positions are given, Pacman is first moved to them.
+    def next_step(self, positions=None):
+        if positions is not None:
+            self.update_pacbot(positions)
+        active = self.play.copy()
+
+        self.play[active & (self.pellets == 0) & (self.power_pellets == 0)] = False
+
+        die = active & self._should_die()
+        self._die(die)
+        alive = active & ~die
+
+        self._check_if_ghosts_eaten(alive)
+        update = alive & (self.update_ticks % ticks_per_update == 0)
+        if update.any():
+            self._update_ghosts(update)
+            self._check_if_ghosts_eaten(update)
+
+            frightened_update = update & (self.state == frightened)
+            end = frightened_update & (self.frightened_counter == 1)
+            self._end_frightened(end)
+            self.just_swapped_state[frightened_update & ~end &
+                                    (self.frightened_counter == frightened_length)] = False
+            self.frightened_counter[frightened_update] -= 1
+
+            normal_update = update & ~frightened_update
+            swap = normal_update & np.isin(self.state_counter, _swap_times)
+            self.state[swap] = np.where(self.state[swap] == chase, scatter, chase)
+            self.just_swapped_state[normal_update] = swap[normal_update]
+            self.state_counter[normal_update] += 1
+            self.start_counter[update] += 1
+
+        self._update_score(alive)
+
+        spawn = (alive & ((self.pellets == 170) | (self.pellets == 70)) &
+                 (self.prev_cherry_pellets != self.pellets))
+        self.prev_cherry_pellets[spawn] = self.pellets[spawn]
+        self.grid[spawn, cherry_pos[0], cherry_pos[1]] = c
+        self.cherry[spawn] = True
+
+        self.ticks_since_spawn[alive & self.cherry] += 1
+        despawn = alive & (self.ticks_since_spawn >= FREQUENCY * 10)
+        self.ticks_since_spawn[despawn] = 0
+        self.grid[despawn, cherry_pos[0], cherry_pos[1]] = e
+        self.cherry[despawn] = False
+
+        self.update_ticks[alive] += 1
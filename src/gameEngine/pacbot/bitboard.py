@@ -0,0 +1,92 @@
+from .variables import *
+from .grid import grid
+
+###
+# Bitboards: sets of tiles stored as the bits of a Python int, with tile (x, y) at
+# bit x * HEIGHT + y (column by column, like the grid). GameState keeps one per kind of
+# item on the board, so counting, comparing and sending the items left does not have
+# to scan the grid. Two boards are diffed with ^, and the tiles in a diff are listed
+# with positions().
+###
+
+WIDTH = len(grid)
+HEIGHT = len(grid[0])
+
+# Number of bytes to_bytes() produces.
+BYTES = (WIDTH * HEIGHT + 7) // 8
+
+# The single-bit board of every tile.
+_bits = {(x, y): 1 << (x * HEIGHT + y) for x in range(WIDTH) for y in range(HEIGHT)}
+
+
+# Returns the board with only the given tile set.
+def bit(pos):
+    return _bits[pos]
+
+
+# Returns the board of the tiles in a grid that hold the given value.
+def from_grid(cells, value):
+    board = 0
+    for x, col in enumerate(cells):
+        for y, cell in enumerate(col):
+            if cell == value:
+                board |= _bits[(x, y)]
+    return board
+
+
+# Returns the number of tiles on a board.
+if hasattr(int, 'bit_count'):
+    popcount = int.bit_count
+else:
+    def popcount(board):
+        return bin(board).count('1')
+
+
+# Returns true if the tile is on the board.
+def contains(board, pos):
+    return board & _bits[pos] != 0
+
+
+# Returns the tiles on a board, column by column.
+def positions(board):
+    tiles = []
+    while board:
+        low = board & -board
+        index = low.bit_length() - 1
+        tiles.append((index // HEIGHT, index % HEIGHT))
+        board ^= low
+    return tiles
+
+
+def to_bytes(board):
+    return board.to_bytes(BYTES, 'little')
+
+
+def from_bytes(data):
+    return int.from_bytes(data, 'little')
+
+
+# The items on the board at the start of a game.
+initial_pellets = from_grid(grid, o)
+initial_power_pellets = from_grid(grid, O)
+
+# The tiles of the pellet bitmap LightState.pellets: the tiles that hold an item at the
+# start of a game, column by column.
+pellet_tiles = positions(initial_pellets | initial_power_pellets)
+
+# Number of bytes to_pellet_bitmap() produces.
+PELLET_BYTES = (len(pellet_tiles) + 7) // 8
+
+# The bit of each tile in the pellet bitmap, by its bit on a board.
+_pellet_bits = {(x * HEIGHT + y): 1 << i for i, (x, y) in enumerate(pellet_tiles)}
+
+
+# Returns the pellet bitmap of the tiles on a board (tiles without an item at the start
+# of a game are left out).
+def to_pellet_bitmap(board):
+    bitmap = 0
+    while board:
+        low = board & -board
+        bitmap |= _pellet_bits.get(low.bit_length() - 1, 0)
+        board ^= low
+    return bitmap.to_bytes(PELLET_BYTES, 'little')
@@ -0,0 +1,88 @@
+from .gameState import FREQUENCY
+from .headless import HeadlessRunner, MAX_TICKS
+from .policies import load_policy
+import collections
+import concurrent.futures
+import os
+import random
+import time
+
+# Summary of one quantity over many games.
+Distribution = collections.namedtuple('Distribution', ['mean', 'std', 'min', 'p10', 'p50',
+                                                       'p90', 'max'])
+
+
+# Returns the Distribution of a list of numbers.
+def distribution(values):
+    values = sorted(values)
+    mean = sum(values) / len(values)
+    std = (sum((v - mean) ** 2 for v in values) / len(values)) ** 0.5
+    def percentile(p):
+        return values[min(len(values) - 1, int(p * len(values)))]
+    return Distribution(mean, std, values[0], percentile(0.1), percentile(0.5),
+                        percentile(0.9), values[-1])
+
+
+# Returns the Distribution of the score, game time (seconds), deaths and pellets left
+# over a list of GameResults, keyed by name.
+def summarize(results):
+    return collections.OrderedDict([
+        ('score', distribution([r.score for r in results])),
+        ('time', distribution([r.ticks / FREQUENCY for r in results])),
+        ('deaths', distribution([r.deaths for r in results])),
+        ('pellets_left', distribution([r.pellets_left for r in results]))
+    ])
+
+
+# Plays a chunk of games in a worker process. Each game builds its policy and restarts the
+# game from its own seed, so its result does not depend on which worker plays it.
+def _play_games(policy_name, max_ticks, games):
+    runner = HeadlessRunner(None, max_ticks)
+    results = []
+    for index, seed in games:
+        runner.policy = load_policy(policy_name, seed)
+        results.append((index, runner.play_game(seed)))
+    return results
+
+
+class GameFarm:
+    """
+        Plays many headless games on a pool of worker processes, one per core by default.
+
+        The policy is given by name (see pacbot.policies.load_policy) so the workers can
+        build it themselves. Every game gets its own seed from the farm's seed, so a
+        seeded farm plays the same games with any number of workers.
+    """
+    def __init__(self, policy='heuristic', workers=None, max_ticks=MAX_TICKS, seed=None,
+                 chunk_size=8):
+        self.policy = policy
+        self.workers = workers or os.cpu_count()
+        self.max_ticks = max_ticks
+        self.seed = seed
+        self.chunk_size = chunk_size
+
+    # Returns the seed of every game of a run of n_games.
+    def seeds(self, n_games):
+        rng = random.Random(self.seed)
+        return [rng.getrandbits(32) for _ in range(n_games)]
+
+    # Plays n_games games and yields (game index, GameResult) pairs as the workers
+    # finish them, in no particular order.
+    def stream(self, n_games):
+        games = list(enumerate(self.seeds(n_games)))
+        chunks = [games[i:i + self.chunk_size] for i in range(0, len(games), self.chunk_size)]
+        with concurrent.futures.ProcessPoolExecutor(self.workers) as pool:
+            futures = [pool.submit(_play_games, self.policy, self.max_ticks, chunk)
+                       for chunk in chunks]
+            for future in concurrent.futures.as_completed(futures):
+                for index, result in future.result():
+                    yield index, result
+
+    # Plays n_games games and returns their results in game order, together with the
+    # wall-clock time it took.
+    def run(self, n_games):
+        start = time.perf_counter()
+        results = [None] * n_games
+        for index, result in self.stream(n_games):
+            results[index] = result
+        return results, time.perf_counter() - start
@@ -3,15 +3,81 @@ from .ghostpaths import *
 from .ghostAgent import *
 from .pacbot import *
 from .grid import grid
-import copy
+from .adjacency import adjacency
+from . import bitboard
+from . import zobrist
+import collections
+import functools
+import itertools
+import random
+import struct
 import time
 
 
 
 FREQUENCY = game_frequency * ticks_per_update
 
+# Game seeds are reduced to 64 bits, the size of the seed in a replay log.
+SEED_MASK = (1 << 64) - 1
+
+# A compact, immutable copy of a game: the grid flattened column by column into bytes,
+# every other field of the game and its agents packed by _fields, the state of the
+# game's random number generator, the item bitboards, the Zobrist hash of the items and
+# the game's seed.
+GameSnapshot = collections.namedtuple('GameSnapshot', ['grid', 'fields', 'rng', 'boards',
+                                                       'zobrist', 'seed'])
+
+# The packed layout of a snapshot's fields: the game, Pacman, then red, pink, orange
+# and blue (current position, next position, direction, frightened and respawn counters).
+_fields = struct.Struct('<iBhh?hBB?hh?iiiddi' + 'bbB' + 'bbbbBhh' * 4)
+
+# Something that happened during a step of the game: an event enum from variables, the
+# update_ticks of the step, the tile it happened on (or None) and a value that depends on
+# the event: the ghost's color for ev_ghost_eaten, the new state for ev_mode_swap, the
+# final score for ev_game_over and the game's seed for ev_restart.
+GameEvent = collections.namedtuple('GameEvent', ['type', 'tick', 'pos', 'value'])
+
+# The bitboard GameState keeps for each kind of item, see pacbot.bitboard.
+_boards = {o: 'pellet_board', O: 'power_pellet_board', c: 'cherry_board'}
+
+_initial_pellet_count = bitboard.popcount(bitboard.initial_pellets)
+_initial_power_pellet_count = bitboard.popcount(bitboard.initial_power_pellets)
+
+# Grid versions: every change to a game's grid gives it a version no other grid in the
+# process has had, so a version identifies the contents of a grid. The initial grid is
+# always version 0.
+_grid_versions = itertools.count(1)
+
+# The grid (columns of cells) of the flattened grid of a snapshot. Restored games share
+# it until they write to it (see GameState._set_cell()), so restoring the same snapshot
+# again does not build the columns again. The grid stays a list of columns rather than
+# one flat bytearray because grid[x][y] is how the engine, its clients and the ghost
+# agents read it.
+@functools.lru_cache(maxsize=64)
+def _unflatten(data):
+    height = len(grid[0])
+    return [list(data[i:i + height]) for i in range(0, len(data), height)]
+
 class GameState:
-    def __init__(self):
+    # The compiled move tables of the (static) maze, shared by every game.
+    adjacency = adjacency
+    # Set to a pacbot.profiler.PhaseProfiler to time the phases of every step.
+    profiler = None
+
+    def __init__(self, verbose=True, seed=None, clock=time.time):
+        # When verbose is False the final score and time are not printed, which keeps
+        # headless runs that play many games in a row quiet.
+        self.verbose = verbose
+        # Every game draws its own seed from this stream when it (re)starts, and the
+        # ghosts only use the game's rng, so a seeded GameState plays the same games
+        # every time and games running side by side do not share any random state.
+        self._seeds = random.Random(seed)
+        self._rng = random.Random()
+        self._random_shared = False
+        # The clock only measures the elapsed time that is shown to players; the
+        # rules of the game never read it.
+        self.clock = clock
+        self.previous_start = 0
         self.pacbot = PacBot()
         self.red = GhostAgent(red_init_pos[0], red_init_pos[1], red_init_npos[0],
                               red_init_npos[1], red, red_init_dir, self, [], red_scatter_pos)
@@ -30,6 +96,7 @@ class GameState:
     def _become_frightened(self):
         if self.state != frightened:
             self.old_state = self.state
+            self._emit(ev_mode_swap, value=frightened)
         self.state = frightened
         self.frightened_counter = frightened_length
         self.red.become_frightened()
@@ -42,6 +109,7 @@ class GameState:
     # and resets the score multiplier to be equal to 1.
     def _end_frightened(self):
         self.state = self.old_state
+        self._emit(ev_mode_swap, value=self.state)
         self.frightened_multiplier = 1
 
     # Decreases the remaining time each ghost should be frightened for and updates each ghost's
@@ -52,6 +120,46 @@ class GameState:
         self.pink.update()
         self.blue.update()
 
+    # The random number generator of the current game. Like the grid, it is shared with
+    # forks until one of them draws from it.
+    @property
+    def rng(self):
+        if self._random_shared:
+            self._copy_random_state()
+        return self._rng
+
+    # Gives the game its own copies of the random number generators it shares with forks.
+    def _copy_random_state(self):
+        seeds, rng = random.Random(), random.Random()
+        seeds.setstate(self._seeds.getstate())
+        rng.setstate(self._rng.getstate())
+        self._seeds, self._rng = seeds, rng
+        self._random_shared = False
+
+    # Records an event of the current step; see GameEvent for the meaning of pos and value.
+    def _emit(self, event_type, pos=None, value=0):
+        self.events.append(GameEvent(event_type, self.update_ticks, pos, value))
+
+    # Writes a value into the grid and keeps the item bitboards, the Zobrist hash of the
+    # items and the grid version in sync with it. Forks and
+    # restarts share their grid with other games until the first write, which is when the
+    # shared grid gets copied (copy-on-write).
+    def _set_cell(self, pos, value):
+        old = self.grid[pos[0]][pos[1]]
+        if old == value:
+            return
+        if self._grid_shared:
+            self.grid = [col[:] for col in self.grid]
+            self._grid_shared = False
+        self.grid[pos[0]][pos[1]] = value
+        self._grid_bytes = None
+        self.grid_version = next(_grid_versions)
+        self._zobrist_board ^= zobrist.item(old, pos) ^ zobrist.item(value, pos)
+        if old in _boards:
+            setattr(self, _boards[old], getattr(self, _boards[old]) ^ bitboard.bit(pos))
+        if value in _boards:
+            setattr(self, _boards[value], getattr(self, _boards[value]) | bitboard.bit(pos))
+
     # Returns true if the position of Pacman is occupied by a pellet.
     def _is_eating_pellet(self):
         return self.grid[self.pacbot.pos[0]][self.pacbot.pos[1]] == o
@@ -62,14 +170,16 @@ class GameState:
 
     # Sets the current position of Pacman to empty and increments the score.
     def _eat_pellet(self):
-        self.grid[self.pacbot.pos[0]][self.pacbot.pos[1]] = e
+        self._set_cell(self.pacbot.pos, e)
+        self._emit(ev_pellet_eaten, self.pacbot.pos)
         self.score += pellet_score
         self.pellets -= 1
 
     # Sets the current position of Pacman to empty and increments the score.
     # Also makes all ghosts frightened.
     def _eat_power_pellet(self):
-        self.grid[self.pacbot.pos[0]][self.pacbot.pos[1]] = e
+        self._set_cell(self.pacbot.pos, e)
+        self._emit(ev_power_pellet_eaten, self.pacbot.pos)
         self.score += power_pellet_score
         self.power_pellets -= 1
         self._become_frightened()
@@ -80,7 +190,8 @@ class GameState:
 
     # Sets the current position of Pacman to empty and increments the score.
     def _eat_cherry(self):
-        self.grid[self.pacbot.pos[0]][self.pacbot.pos[1]] = e
+        self._set_cell(self.pacbot.pos, e)
+        self._emit(ev_cherry_eaten, self.pacbot.pos)
         self.score += cherry_score
         self.cherry = False
 
@@ -103,11 +214,14 @@ class GameState:
 
     # Places the cherry on the board.
     def _spawn_cherry(self):
-        self.grid[cherry_pos[0]][cherry_pos[1]] = c
+        self._set_cell(cherry_pos, c)
+        self._emit(ev_cherry_spawn, cherry_pos)
         self.cherry = True
 
     def _despawn_cherry(self):
-        self.grid[cherry_pos[0]][cherry_pos[1]] = e
+        if self.grid[cherry_pos[0]][cherry_pos[1]] == c:
+            self._emit(ev_cherry_despawn, cherry_pos)
+        self._set_cell(cherry_pos, e)
         self.cherry = False
 
 
@@ -137,15 +251,22 @@ class GameState:
         self.blue.respawn()
 
     def _end_game(self):
-        self.elapsed_time += time.time() - self.previous_start
+        self.elapsed_time += self.clock() - self.previous_start
         self.play = False
-        print("Score: " + str(self.score))
-        print("Time: " + str(self.elapsed_time))
+        self._emit(ev_game_over, value=self.score)
+        if self.verbose:
+            print("Score: " + str(self.score))
+            print("Time: " + str(self.elapsed_time))
 
     # Resets the round if Pacman dies with lives remaining
     # and ends the game if Pacman has no lives remaining.
     def _die(self):
+        self._emit(ev_death, self.pacbot.pos)
         if self.lives > 1:
+            if self.state != scatter:
+                self._emit(ev_mode_swap, value=scatter)
+            if self.grid[cherry_pos[0]][cherry_pos[1]] == c:
+                self._emit(ev_cherry_despawn, cherry_pos)
             self._respawn_agents()
             self.start_counter = 0
             self.state_counter = 0
@@ -156,7 +277,7 @@ class GameState:
             self.frightened_multiplier = 1
             self.pause()
             self._update_score()
-            self.grid[cherry_pos[0]][cherry_pos[1]] = e
+            self._set_cell(cherry_pos, e)
         else:
             self._end_game()
 
@@ -179,6 +300,7 @@ class GameState:
     # the score multiplier for Pacman in frightened mode is increased.
     def _check_if_ghost_eaten(self, ghost):
         if ghost.pos["current"] == self.pacbot.pos and ghost.frightened_counter > 0:
+            self._emit(ev_ghost_eaten, ghost.pos["current"], ghost.color)
             ghost.send_home()
             self.score += ghost_score * self.frightened_multiplier
             self.frightened_multiplier += 1
@@ -198,16 +320,17 @@ class GameState:
                 self.state = scatter
             else:
                 self.state = chase
+            self._emit(ev_mode_swap, value=self.state)
             self.just_swapped_state = True
         else:
             self.just_swapped_state = False
 
     def pause(self):
-        self.elapsed_time += time.time() - self.previous_start
+        self.elapsed_time += self.clock() - self.previous_start
         self.play = False
 
     def unpause(self):
-        self.previous_start = time.time()
+        self.previous_start = self.clock()
         self.play = True
 
     def print_ghost_pos(self):
@@ -217,15 +340,24 @@ class GameState:
             ret += str(ghost.pos["current"])+" "
         print(ret)
 
+    # Advances the game by one tick. The events of the tick are left in self.events.
     def next_step(self):
+        self.events = []
+        prof = self.profiler
+        if prof is not None:
+            step_start = start = time.perf_counter()
         if self._is_game_over():
             self._end_game()
         if self._should_die():
             self._die()
         else:
             self._check_if_ghosts_eaten()
+            if prof is not None:
+                start = prof.lap('collisions', start)
             if self.update_ticks % ticks_per_update == 0:
                 self._update_ghosts()
+                if prof is not None:
+                    start = prof.lap('ghosts', start)
                 self._check_if_ghosts_eaten()
                 if self.state == frightened:
                     if self.frightened_counter == 1:
@@ -238,7 +370,11 @@ class GameState:
                     self.state_counter += 1
                 self.start_counter += 1
                 # self.print_ghost_pos()
+                if prof is not None:
+                    start = prof.lap('ghost_collisions', start)
             self._update_score()
+            if prof is not None:
+                start = prof.lap('score', start)
             if self._should_spawn_cherry():
                 self._spawn_cherry()
             if self.cherry:
@@ -246,12 +382,107 @@ class GameState:
             if self._should_remove_cherry():
                 self._despawn_cherry()
             self.update_ticks += 1
-
-    # Sets the game back to its original state (no rounds played).
-    def restart(self):
-        self.grid = copy.deepcopy(grid)
-        self.pellets = sum([col.count(o) for col in self.grid])
-        self.power_pellets = sum([col.count(O) for col in self.grid])
+            if prof is not None:
+                prof.lap('cherry', start)
+        if prof is not None:
+            prof.lap('step', step_start)
+
+    # The ghosts in the order snapshots store them.
+    def _ghosts(self):
+        return [self.red, self.pink, self.orange, self.blue]
+
+    # Returns a GameSnapshot of the game, which restore() can later return the game to.
+    def snapshot(self):
+        if self._grid_bytes is None:
+            self._grid_bytes = bytes(cell for col in self.grid for cell in col)
+        values = [self.score, self.lives, self.pellets, self.power_pellets, self.cherry,
+                  self.prev_cherry_pellets, self.old_state, self.state, self.just_swapped_state,
+                  self.frightened_counter, self.frightened_multiplier, self.play,
+                  self.start_counter, self.state_counter, self.update_ticks,
+                  self.elapsed_time, self.previous_start, self.ticks_since_spawn,
+                  self.pacbot.pos[0], self.pacbot.pos[1], self.pacbot.direction]
+        for ghost in self._ghosts():
+            values.extend(ghost.pos['current'])
+            values.extend(ghost.pos['next'])
+            values.extend([ghost.direction, ghost.frightened_counter, ghost.respawn_counter])
+        return GameSnapshot(self._grid_bytes, _fields.pack(*values), self._rng.getstate(),
+                            (self.pellet_board, self.power_pellet_board, self.cherry_board),
+                            self._zobrist_board, self.seed)
+
+    # Returns the game to the state it was in when the snapshot was taken.
+    def restore(self, snapshot):
+        data = snapshot.grid
+        if data is not self._grid_bytes:
+            self.grid = _unflatten(data)
+            self._grid_shared = True
+            self._grid_bytes = data
+            self.grid_version = next(_grid_versions)
+        self.seed = snapshot.seed
+        (self.pellet_board, self.power_pellet_board, self.cherry_board) = snapshot.boards
+        self._zobrist_board = snapshot.zobrist
+
+        values = _fields.unpack(snapshot.fields)
+        (self.score, self.lives, self.pellets, self.power_pellets, self.cherry,
+         self.prev_cherry_pellets, self.old_state, self.state, self.just_swapped_state,
+         self.frightened_counter, self.frightened_multiplier, self.play,
+         self.start_counter, self.state_counter, self.update_ticks,
+         self.elapsed_time, self.previous_start, self.ticks_since_spawn) = values[:18]
+        self.pacbot.pos = (values[18], values[19])
+        self.pacbot.direction = values[20]
+        self.events = []
+        for i, ghost in enumerate(self._ghosts()):
+            (x, y, next_x, next_y, ghost.direction, ghost.frightened_counter,
+             ghost.respawn_counter) = values[21 + 7 * i:28 + 7 * i]
+            ghost.pos = {'current': (x, y), 'next': (next_x, next_y)}
+            ghost._update_hash()
+        if self._random_shared:
+            self._copy_random_state()
+        self._rng.setstate(snapshot.rng)
+
+    # Returns the 64-bit Zobrist hash of the game: the items on the board, Pacman and the
+    # ghosts (tiles, headings and counters), the mode and the counters that decide how the
+    # game continues. Games with the same hash play out the same way given the same moves
+    # (up to the ghosts' random moves while frightened). See pacbot.zobrist.
+    def zobrist_hash(self):
+        return (self._zobrist_board ^ zobrist.pacman(self.pacbot.pos, self.pacbot.direction) ^
+                self.red.hash ^ self.pink.hash ^ self.orange.hash ^ self.blue.hash ^
+                zobrist.counters(self))
+
+    # Returns an independent copy of the game, for example to play out a move without
+    # affecting this game. The two games share their grid and random number generators
+    # until one of them changes them.
+    def fork(self):
+        clone = GameState.__new__(GameState)
+        clone.__dict__.update(self.__dict__)
+        clone.pacbot = self.pacbot.copy()
+        clone.red = self.red.copy(clone)
+        clone.pink = self.pink.copy(clone)
+        clone.orange = self.orange.copy(clone)
+        clone.blue = self.blue.copy(clone)
+        self._grid_shared = self._random_shared = True
+        clone._grid_shared = clone._random_shared = True
+        return clone
+
+    # Sets the game back to its original state (no rounds played). The new game uses the
+    # given seed, or the next one from the game's seed stream. Seeds are kept to 64
+    # bits, which is what a replay log has room for.
+    def restart(self, seed=None):
+        if self._random_shared:
+            self._copy_random_state()
+        self.seed = self._seeds.getrandbits(32) if seed is None else seed & SEED_MASK
+        self._rng.seed(self.seed)
+        self.events = [GameEvent(ev_restart, 0, None, self.seed)]
+        # The initial grid is shared until the game writes to it, see _set_cell().
+        self.grid = grid
+        self._grid_shared = True
+        self._grid_bytes = None
+        self.grid_version = 0
+        self.pellet_board = bitboard.initial_pellets
+        self.power_pellet_board = bitboard.initial_power_pellets
+        self.cherry_board = 0
+        self._zobrist_board = zobrist.initial_board
+        self.pellets = _initial_pellet_count
+        self.power_pellets = _initial_power_pellet_count
         self.cherry = False
         self.prev_cherry_pellets = 0
         self.old_state = chase
@@ -268,5 +499,5 @@ class GameState:
         self.lives = starting_lives
         self.elapsed_time = 0
         self._update_score()
-        self.grid[cherry_pos[0]][cherry_pos[1]] = e
+        self._set_cell(cherry_pos, e)
         self.ticks_since_spawn = 0
@@ -1,7 +1,11 @@
 from .ghostpaths import *
 from .variables import *
-import random
+from . import zobrist
 import math
+import time
+
+# The profiler phase of each ghost's move decisions.
+_decide_phases = {red: 'decide_red', orange: 'decide_orange', pink: 'decide_pink', blue: 'decide_blue'}
 
 
 class GhostAgent:
@@ -16,28 +20,31 @@ class GhostAgent:
         self.start_path = start_path
         self.scatter_pos = scatter_pos
         self.frightened_counter = 0
+        self.hash = 0
+
+    # Recomputes the ghost's part of the game's Zobrist hash. Called by everything
+    # that moves the ghost or changes its counters.
+    def _update_hash(self):
+        self.hash = zobrist.ghost(self.color, self.pos['current'], self.pos['next'], self.direction,
+                                  self.frightened_counter, self.respawn_counter)
+
+    # Returns a copy of the ghost that belongs to the given game.
+    def copy(self, game_state):
+        clone = GhostAgent.__new__(GhostAgent)
+        clone.__dict__.update(self.__dict__)
+        clone.game_state = game_state
+        clone.pos = dict(self.pos)
+        return clone
 
     def _is_move_legal(self, move):
         return (move != self.pos["current"] and
-                self.game_state.grid[move[0]][move[1]] != I and
-                self.game_state.grid[move[0]][move[1]] != n)
+                move in self.game_state.adjacency.walkable)
 
-    # Returns a list of valid tiles for the ghost to move to. If no such tiles exist,
-    # return a list containing only the ghost's current position.
+    # Returns the valid tiles for the ghost to move to. If no such tiles exist,
+    # return a tuple containing only the ghost's current position.
+    # The moves come precompiled from the maze adjacency table.
     def _find_possible_moves(self):
-        (x, y) = self.pos['next']
-        possible = []
-        if self._is_move_legal((x+1, y)):
-            possible.append((x+1, y))
-        if self._is_move_legal((x, y+1)) and (x, y) not in ghost_no_up_tiles:
-            possible.append((x, y+1))
-        if self._is_move_legal((x-1, y)):
-            possible.append((x-1, y))
-        if self._is_move_legal((x, y-1)):
-            possible.append((x, y-1))
-        if possible == []:
-            possible.append(self.pos["current"])
-        return possible
+        return self.game_state.adjacency.ghost_moves(self.pos['next'], self.pos['current'])
 
     # Returns the direction of the ghost based on its previous coordinates.
     def _get_direction(self, pos_prev, pos_new):
@@ -140,7 +147,7 @@ class GhostAgent:
     # Returns a random move selected from the list of valid moves for this ghost.
     def _get_next_frightened_move(self):
         possible = self._find_possible_moves()
-        move = random.choice(possible)
+        move = self.game_state.rng.choice(possible)
         return (move, self._get_direction(self.pos["next"], move))
 
     def _reverse_direction(self):
@@ -189,10 +196,17 @@ class GhostAgent:
     def update(self):
         if self.frightened_counter > 0:
             self.frightened_counter -= 1
-        next_moves = self._decide_next_moves()
+        prof = self.game_state.profiler
+        if prof is None:
+            next_moves = self._decide_next_moves()
+        else:
+            start = time.perf_counter()
+            next_moves = self._decide_next_moves()
+            prof.lap(_decide_phases[self.color], start)
         self.pos['current'] = self.pos['next']
         self.pos['next'] = next_moves[0]
         self.direction = next_moves[1]
+        self._update_hash()
 
     # Sets the ghost's position back to the respawn zone and removes the frightened condition.
     # This function is called when the ghost gets eaten by Pacman.
@@ -203,12 +217,14 @@ class GhostAgent:
         # This will make the ghost follow its respawn path, ensuring it leaves the respawn zone.
         self.respawn_counter = 0
         self.frightened_counter = 0
+        self._update_hash()
 
     # Sets the remaining amount of frames the ghost will be frightened for to
     # the number of game updates the ghost should stay frightened for when a power pellet
     # is eaten. This makes the ghost frightened if it was not already.
     def become_frightened(self):
         self.frightened_counter = frightened_length
+        self._update_hash()
 
     # Returns true if the ghost is frightened.
     def is_frightened(self):
@@ -226,3 +242,4 @@ class GhostAgent:
         # This will prevent the ghost from following the respawn path it follows when
         # leaving the start area AFTER being eaten by Pacman during a round.
         self.respawn_counter = len(respawn_path)
+        self._update_hash()
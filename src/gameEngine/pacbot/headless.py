@@ -0,0 +1,76 @@
+from .variables import *
+from .gameState import GameState
+from .replay import ReplayWriter
+import collections
+import os
+import time
+
+# The outcome of a single headless game.
+GameResult = collections.namedtuple('GameResult', ['score', 'ticks', 'deaths', 'pellets_left'])
+
+# Hard limit on the length of a game, so a policy that never clears the board
+# (or never dies) cannot run forever. This is roughly 20 minutes of game time.
+MAX_TICKS = 30000
+
+
+class HeadlessRunner:
+    """
+        Plays complete games on a GameState as fast as the CPU allows, without the
+        robomodules event loop or the game_frequency clock.
+
+        The policy is called once per tick with the GameState and returns Pacman's new
+        position (or None to stay put). See pacbot.policies for examples.
+
+        With a seed the runner plays the same sequence of games every time (as long as
+        the policy is deterministic too). With a record_dir every game is written to a
+        replay log in that directory, see pacbot.replay.
+    """
+    def __init__(self, policy, max_ticks=MAX_TICKS, seed=None, record_dir=None):
+        self.policy = policy
+        self.max_ticks = max_ticks
+        self.record_dir = record_dir
+        self.game = GameState(verbose=False, seed=seed)
+        self.games_played = 0
+
+    # Plays a single game from the start and returns its GameResult. Without a seed
+    # the game takes the next seed of the runner's seed stream.
+    def play_game(self, seed=None):
+        game = self.game
+        game.restart(seed)
+        game.unpause()
+        recorder = None
+        if self.record_dir is not None:
+            recorder = ReplayWriter(os.path.join(self.record_dir, 'game-{}-{}.pbrl'.format(
+                self.games_played, game.seed)), game.seed)
+        self.games_played += 1
+        deaths = 0
+        lives = game.lives
+        while game.play and game.update_ticks < self.max_ticks:
+            position = self.policy(game)
+            if position is not None:
+                game.pacbot.update(position)
+                if recorder is not None:
+                    recorder.position(position)
+            game.next_step()
+            if recorder is not None:
+                recorder.step()
+            if game.lives < lives:
+                # The engine pauses after every death and waits for someone to resume;
+                # there is nobody to press p here, so resume right away.
+                deaths += 1
+                lives = game.lives
+                game.unpause()
+        if not game.play and not game._are_all_pellets_eaten():
+            # The last death ends the game without taking away a life.
+            deaths += 1
+        if recorder is not None:
+            recorder.close()
+        return GameResult(game.score, game.update_ticks, deaths,
+                          game.pellets + game.power_pellets)
+
+    # Plays n_games games back to back and returns the list of results together
+    # with the wall-clock time it took.
+    def run(self, n_games):
+        start = time.perf_counter()
+        results = [self.play_game() for _ in range(n_games)]
+        return results, time.perf_counter() - start
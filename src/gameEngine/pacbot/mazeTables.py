@@ -0,0 +1,221 @@
+from .variables import *
+from .ghostpaths import pink_start_path, orange_start_path, blue_start_path, respawn_path
+from .adjacency import MazeAdjacency, _offsets
+from .grid import grid
+import hashlib
+import json
+import os
+import numpy as np
+
+###
+# The maze compiler: everything that can be derived from the (static) maze, compiled
+# once into NumPy arrays and saved as a directory of .npy files with a manifest.json.
+# Processes load the directory with np.load(mmap_mode='r'), so loading takes no time
+# and every process on the machine shares the same pages. Run ./compileMaze.py to
+# build it; load_maze() compiles the tables in memory if it has not been built.
+#
+# Walkable tiles are numbered column by column; the tables use these tile indices,
+# with -1 for "no tile". The arrays are:
+#   grid            (W, H) uint8   the grid the tables were compiled from
+#   tile_index      (W, H) int16   index of every walkable tile, -1 elsewhere
+#   tiles           (N, 2) int16   coordinates of every walkable tile
+#   neighbors       (N, 4) int16   walkable neighbors, right/up/left/down, -1 if none
+#   degree          (N,)   uint8   number of walkable neighbors
+#   distances       (N, N) int16   shortest path lengths, -1 if unreachable
+#   junctions       (J,)   int16   tiles that do not have exactly two neighbors
+#   corridors       (C, 3) int16   corridors between junctions: first junction, last
+#                                  junction (junction indices) and length in steps
+#   tile_corridor   (N,)   int16   the corridor each tile lies on, -1 for junctions
+#   pellets         (P,)   int16   tiles that start with a pellet
+#   power_pellets   (Q,)   int16   tiles that start with a power pellet
+#   ghost_moves     (N, 4, 4) int16  moves of a ghost on a tile that came from the
+#                                  neighbor in the given direction, -1 padded
+#   start_pink, start_orange, start_blue, respawn  (L, 3) int16  ghost paths: x, y, direction
+###
+
+VERSION = 1
+MAZE_DIR = os.environ.get("MAZE_DIR", os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "maze")))
+
+
+# Returns a digest of a grid, used to tell whether compiled tables are still current.
+def grid_digest(cells):
+    return hashlib.sha1(np.array(cells, dtype=np.uint8).tobytes()).hexdigest()
+
+
+def _path_table(path):
+    return np.array([(x, y, direction) for ((x, y), direction) in path],
+                    dtype=np.int16).reshape(-1, 3)
+
+
+# Returns the length of the path from every tile to every other tile, by a BFS from each.
+def _all_pairs_distances(neighbors):
+    count = len(neighbors)
+    distances = np.full((count, count), -1, dtype=np.int16)
+    for source in range(count):
+        row = distances[source]
+        row[source] = 0
+        frontier = [source]
+        dist = 0
+        while frontier:
+            dist += 1
+            nxt = []
+            for tile in frontier:
+                for neighbor in neighbors[tile]:
+                    if neighbor >= 0 and row[neighbor] < 0:
+                        row[neighbor] = dist
+                        nxt.append(neighbor)
+            frontier = nxt
+    return distances
+
+
+# Splits the maze into junctions and the corridors of two-neighbor tiles between them.
+def _corridor_graph(neighbors, degree):
+    count = len(neighbors)
+    is_junction = degree != 2
+    tile_corridor = np.full(count, -1, dtype=np.int16)
+    corridors = []
+
+    def walk(start, first):
+        # Follows a corridor from a junction until the next junction.
+        tiles = []
+        previous, tile = start, first
+        while not is_junction[tile]:
+            tiles.append(tile)
+            (tile, previous) = ([t for t in neighbors[tile] if t >= 0 and t != previous][0], tile)
+        return tiles, tile
+
+    junction_tiles = list(np.flatnonzero(is_junction))
+    while True:
+        junction_index = {tile: i for i, tile in enumerate(junction_tiles)}
+        for start in junction_tiles:
+            for first in neighbors[start]:
+                if first < 0 or (not is_junction[first] and tile_corridor[first] >= 0):
+                    continue
+                if is_junction[first] and first < start:
+                    # Junctions next to each other: add the corridor once
+                    continue
+                tiles, end = walk(start, first)
+                tile_corridor[tiles] = len(corridors)
+                corridors.append((junction_index[start], junction_index[end], len(tiles) + 1))
+        # Loops of two-neighbor tiles have no junction; make one of their tiles one.
+        loose = np.flatnonzero(~is_junction & (tile_corridor < 0))
+        if len(loose) == 0:
+            break
+        is_junction[loose[0]] = True
+        junction_tiles.append(loose[0])
+
+    return (np.array(junction_tiles, dtype=np.int16),
+            np.array(corridors, dtype=np.int16).reshape(-1, 3), tile_corridor)
+
+
+# Compiles the tables of a grid and returns them as a dict of arrays.
+def compile_maze(cells=grid):
+    adjacency = MazeAdjacency(cells)
+    width, height = adjacency.width, adjacency.height
+    tiles = [(x, y) for x in range(width) for y in range(height) if (x, y) in adjacency.walkable]
+    tile_index = np.full((width, height), -1, dtype=np.int16)
+    for i, (x, y) in enumerate(tiles):
+        tile_index[x, y] = i
+
+    def index(pos):
+        (x, y) = pos
+        return tile_index[x, y] if 0 <= x < width and 0 <= y < height else -1
+
+    neighbors = np.full((len(tiles), 4), -1, dtype=np.int16)
+    ghost_moves = np.full((len(tiles), 4, 4), -1, dtype=np.int16)
+    for i, (x, y) in enumerate(tiles):
+        for k, (dx, dy) in enumerate(_offsets):
+            neighbors[i, k] = index((x + dx, y + dy))
+            moves = adjacency.ghost_moves((x, y), (x + dx, y + dy))
+            ghost_moves[i, k, :len(moves)] = [index(move) for move in moves]
+    degree = (neighbors >= 0).sum(axis=1).astype(np.uint8)
+    junctions, corridors, tile_corridor = _corridor_graph(neighbors, degree)
+    cells = np.array(cells, dtype=np.uint8)
+
+    return {
+        'grid': cells,
+        'tile_index': tile_index,
+        'tiles': np.array(tiles, dtype=np.int16).reshape(-1, 2),
+        'neighbors': neighbors,
+        'degree': degree,
+        'distances': _all_pairs_distances(neighbors),
+        'junctions': junctions,
+        'corridors': corridors,
+        'tile_corridor': tile_corridor,
+        'pellets': tile_index[cells == o].astype(np.int16),
+        'power_pellets': tile_index[cells == O].astype(np.int16),
+        'ghost_moves': ghost_moves,
+        'start_pink': _path_table(pink_start_path),
+        'start_orange': _path_table(orange_start_path),
+        'start_blue': _path_table(blue_start_path),
+        'respawn': _path_table(respawn_path)
+    }
+
+
+# Writes compiled tables to a directory, the manifest last so a half-written directory
+# is never mistaken for a complete one.
+def save_maze(tables, directory=MAZE_DIR):
+    os.makedirs(directory, exist_ok=True)
+    manifest = {
+        'version': VERSION,
+        'grid_sha1': grid_digest(tables['grid']),
+        'arrays': {name: {'dtype': str(array.dtype), 'shape': list(array.shape)}
+                   for name, array in tables.items()}
+    }
+    for name, array in tables.items():
+        np.save(os.path.join(directory, name + '.npy'), array)
+    with open(os.path.join(directory, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+class MazeTables:
+    """
+        The compiled tables of a maze, as attributes named like the arrays (see the top of
+        this module). compiled is False if the tables were memory-mapped from disk and
+        True if they had to be compiled in this process.
+    """
+    def __init__(self, tables, compiled):
+        self.__dict__.update(tables)
+        self.names = sorted(tables)
+        self.compiled = compiled
+
+    # Returns the index of a tile, or -1 if it is not walkable or not on the board.
+    def index(self, pos):
+        (x, y) = pos
+        (width, height) = self.tile_index.shape
+        if 0 <= x < width and 0 <= y < height:
+            return int(self.tile_index[x, y])
+        return -1
+
+    # Returns the length of the shortest path between two tiles, or -1 if there is none.
+    def distance(self, a, b):
+        i, j = self.index(a), self.index(b)
+        if i < 0 or j < 0:
+            return -1
+        return int(self.distances[i, j])
+
+
+# Returns the tables in directory memory-mapped, as long as they were compiled by this
+# version from the given grid. Otherwise the tables are compiled in memory.
+def load_maze(directory=MAZE_DIR, cells=grid):
+    try:
+        with open(os.path.join(directory, 'manifest.json')) as f:
+            manifest = json.load(f)
+        if manifest['version'] == VERSION and manifest['grid_sha1'] == grid_digest(cells):
+            # Plain ndarray views of the maps index faster than np.memmap objects
+            tables = {name: np.asarray(np.load(os.path.join(directory, name + '.npy'), mmap_mode='r'))
+                      for name in manifest['arrays']}
+            return MazeTables(tables, compiled=False)
+    except (OSError, ValueError, KeyError):
+        pass
+    return MazeTables(compile_maze(cells), compiled=True)
+
+
+_maze = None
+
+# Returns the tables of the game's maze, loaded once and shared by everything in this process.
+def maze_tables():
+    global _maze
+    if _maze is None:
+        _maze = load_maze()
+    return _maze
@@ -7,6 +7,12 @@ class PacBot:
     def __init__(self):
         self.respawn()
 
+    def copy(self):
+        clone = PacBot.__new__(PacBot)
+        clone.pos = self.pos
+        clone.direction = self.direction
+        return clone
+
     def respawn(self):
         self.pos = pacbot_starting_pos
         self.direction = pacbot_starting_dir
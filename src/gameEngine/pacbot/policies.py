@@ -0,0 +1,219 @@
+from .variables import *
+from .mazeTables import maze_tables
+import importlib
+import random
+
+# A policy is any callable that takes the GameState once per tick and returns Pacman's
+# new position, or None to leave Pacman where it is. The returned position is applied
+# exactly like a PACMAN_LOCATION update from the camera or the keyboard module.
+
+# Offsets for each direction, in the order the policies try them.
+_moves = {
+    right: (1, 0),
+    left: (-1, 0),
+    up: (0, 1),
+    down: (0, -1)
+}
+
+_opposite = {
+    right: left,
+    left: right,
+    up: down,
+    down: up
+}
+
+
+# Returns true if Pacman is allowed to stand on the given tile.
+def is_walkable(game_state, pos):
+    return pos in game_state.adjacency.walkable
+
+
+# Returns true on the ticks where Pacman is allowed to move. Pacman moves one tile per
+# game update, the same speed the keyboard module moves it at.
+def is_move_tick(game_state):
+    return game_state.update_ticks % ticks_per_update == 0
+
+
+class RandomWalkPolicy:
+    """
+        Keeps going straight until it hits a junction, then picks a random open direction
+        that does not turn Pacman around (unless it is in a dead end).
+    """
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def __call__(self, game_state):
+        if not is_move_tick(game_state):
+            return None
+        (x, y) = game_state.pacbot.pos
+        direction = game_state.pacbot.direction
+        options = []
+        for move, (dx, dy) in _moves.items():
+            if move != _opposite[direction] and is_walkable(game_state, (x + dx, y + dy)):
+                options.append(move)
+        if not options:
+            options = [_opposite[direction]]
+        move = options[0] if len(options) == 1 else self.rng.choice(options)
+        (dx, dy) = _moves[move]
+        return (x + dx, y + dy)
+
+
+class GreedyPelletPolicy:
+    """
+        Walks along the shortest path to the closest pellet (or power pellet),
+        ignoring the ghosts entirely.
+    """
+    def __init__(self, seed=None):
+        # This policy is deterministic; the seed is accepted so all policies
+        # can be built the same way.
+        pass
+
+    def __call__(self, game_state):
+        if not is_move_tick(game_state):
+            return None
+        path = self._find_path_to_pellet(game_state)
+        if path is None or len(path) < 2:
+            return None
+        return path[1]
+
+    def _find_path_to_pellet(self, game_state):
+        start = game_state.pacbot.pos
+        parents = {start: None}
+        queue = [start]
+        for loc in queue:
+            if game_state.grid[loc[0]][loc[1]] in [o, O] and loc != start:
+                path = [loc]
+                while parents[path[-1]] is not None:
+                    path.append(parents[path[-1]])
+                return path[::-1]
+            for nxt in game_state.adjacency.neighbors[loc]:
+                if nxt not in parents:
+                    parents[nxt] = loc
+                    queue.append(nxt)
+        return None
+
+
+# Weights of the heuristic policy, the same as in the decision module's
+# harvard/heuristicHighLevelModule.py.
+PELLET_WEIGHT = 0.65
+GHOST_WEIGHT = 0.35
+FRIGHTENED_GHOST_WEIGHT = .3 * GHOST_WEIGHT
+GHOST_CUTOFF = 10
+
+
+class HeuristicPolicy:
+    """
+        The target selection of HeuristicHighLevelModule._find_best_target, played
+        directly on the GameState: every move (and staying put) is scored by the distance
+        to the closest pellet and by how close the ghosts are, and ties are broken by
+        the number of turns the robot would have to make.
+    """
+    def __init__(self, seed=None):
+        # This policy is deterministic; the seed is accepted so all policies
+        # can be built the same way.
+        self.maze = maze_tables()
+
+    def __call__(self, game_state):
+        if not is_move_tick(game_state):
+            return None
+        p_loc = game_state.pacbot.pos
+        target = self._find_best_target(game_state, p_loc)
+        return None if target == p_loc else target
+
+    # Returns the distance from start to the closest tile for which is_target is true.
+    def _bfs(self, game_state, start, is_target):
+        dists = {start: 0}
+        queue = [start]
+        for loc in queue:
+            if is_target(loc):
+                return dists[loc]
+            for nxt in game_state.adjacency.neighbors[loc]:
+                if nxt not in dists:
+                    dists[nxt] = dists[loc] + 1
+                    queue.append(nxt)
+        return None
+
+    def _find_distance_of_closest_pellet(self, game_state, target_loc):
+        grid = game_state.grid
+        dist = self._bfs(game_state, target_loc, lambda loc: grid[loc[0]][loc[1]] == o)
+        # Only power pellets are left; the game is nearly over.
+        return 0 if dist is None else dist
+
+    def _get_num_turns(self, p_dir, n_dir):
+        if p_dir == n_dir:
+            return 0
+        elif n_dir is None:
+            # Stopping counts as a single turn
+            return 1
+        elif n_dir == _opposite[p_dir]:
+            return 2
+        else:
+            return 1
+
+    def _find_best_target(self, game_state, p_loc):
+        (x, y) = p_loc
+        targets = [p_loc, (x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)]
+        directions = [None, left, right, down, up]
+
+        # The ghosts' distances to the targets are looked up in the compiled maze tables
+        # instead of searched for; like the search, only ghosts within the cutoff count.
+        maze = self.maze
+        ghosts = []
+        for ghost in [game_state.red, game_state.pink, game_state.orange, game_state.blue]:
+            index = maze.index(ghost.pos['current'])
+            if index < 0:
+                continue
+            row = maze.distances[index]
+            dists = {}
+            for target_loc in targets:
+                target_index = maze.index(target_loc)
+                if target_index >= 0 and 0 <= row[target_index] <= GHOST_CUTOFF:
+                    dists[target_loc] = int(row[target_index])
+            ghosts.append((ghost.frightened_counter > 0, dists))
+
+        heuristics = []
+        for target_loc in targets:
+            if not is_walkable(game_state, target_loc):
+                heuristics.append(float('inf'))
+                continue
+            dist_to_pellet = self._find_distance_of_closest_pellet(game_state, target_loc)
+            close_ghosts = [(frightened, dists[target_loc]) for (frightened, dists) in ghosts
+                            if target_loc in dists]
+            closest_dist = min([dist for (_, dist) in close_ghosts], default=float('inf'))
+
+            # Like the module, every close ghost adds the penalty of the closest one.
+            ghost_heuristic = 0
+            for frightened, dist in close_ghosts:
+                if dist < GHOST_CUTOFF:
+                    if not frightened:
+                        ghost_heuristic += pow((GHOST_CUTOFF - closest_dist), 2) * GHOST_WEIGHT
+                    else:
+                        ghost_heuristic += pow((GHOST_CUTOFF - closest_dist), 2) * -1 * FRIGHTENED_GHOST_WEIGHT
+
+            pellet_heuristic = dist_to_pellet * PELLET_WEIGHT
+            heuristics.append(ghost_heuristic + pellet_heuristic)
+
+        min_heur = min(heuristics)
+        mins = [(directions[i], targets[i]) for i, heur in enumerate(heuristics) if heur == min_heur]
+        direction = game_state.pacbot.direction
+        return min(mins, key=lambda m: self._get_num_turns(direction, m[0]))[1]
+
+
+# Policies that can be selected by name, e.g. from the headless runner's command line.
+# Each one is built by calling it with a seed.
+policies = {
+    'random': RandomWalkPolicy,
+    'greedy': GreedyPelletPolicy,
+    'heuristic': HeuristicPolicy
+}
+
+
+# Returns the policy with the given name built with the given seed: either one of the
+# policies above, or any callable given as module:name. Classes are built with the seed
+# like the policies above; anything else is used as it is.
+def load_policy(name, seed=None):
+    if name in policies:
+        return policies[name](seed)
+    module_name, _, attr = name.partition(':')
+    policy = getattr(importlib.import_module(module_name), attr)
+    return policy(seed) if isinstance(policy, type) else policy
@@ -0,0 +1,63 @@
+import collections
+import time
+
+# Timing summary of one phase: how often it ran, the total time spent in it, and the
+# mean, percentiles and maximum of its recent timings, all in seconds.
+PhaseSummary = collections.namedtuple('PhaseSummary', ['phase', 'count', 'total', 'mean',
+                                                       'p50', 'p90', 'p99', 'max'])
+
+# Number of recent timings each phase keeps for its percentiles.
+WINDOW = 10000
+
+
+class PhaseProfiler:
+    """
+        Collects timings of the phases of a game step. A GameState only times its phases
+        while its profiler attribute is set, so profiling costs nothing when it is off.
+    """
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        self.counts = collections.OrderedDict()
+        self.totals = {}
+        self.samples = {}
+
+    def record(self, phase, elapsed):
+        if phase not in self.counts:
+            self.counts[phase] = 0
+            self.totals[phase] = 0.0
+            self.samples[phase] = collections.deque(maxlen=self.window)
+        self.counts[phase] += 1
+        self.totals[phase] += elapsed
+        self.samples[phase].append(elapsed)
+
+    # Records the time since start under phase and returns the current time, so
+    # consecutive phases can be timed with one clock read each.
+    def lap(self, phase, start):
+        now = time.perf_counter()
+        self.record(phase, now - start)
+        return now
+
+    # Returns a PhaseSummary for every phase, in the order they were first recorded.
+    def summary(self):
+        summaries = []
+        for phase, count in self.counts.items():
+            samples = sorted(self.samples[phase])
+            def percentile(p):
+                return samples[min(len(samples) - 1, int(p * len(samples)))]
+            summaries.append(PhaseSummary(phase, count, self.totals[phase],
+                                          self.totals[phase] / count, percentile(0.5),
+                                          percentile(0.9), percentile(0.99), samples[-1]))
+        return summaries
+
+    # Returns the summary as a table, with times in microseconds.
+    def report(self):
+        lines = ['{:<16} {:>8} {:>10} {:>8} {:>8} {:>8} {:>8} {:>8}'.format(
+            'phase', 'count', 'total ms', 'mean us', 'p50 us', 'p90 us', 'p99 us', 'max us')]
+        for s in self.summary():
+            lines.append('{:<16} {:>8} {:>10.1f} {:>8.1f} {:>8.1f} {:>8.1f} {:>8.1f} {:>8.1f}'.format(
+                s.phase, s.count, s.total * 1e3, s.mean * 1e6, s.p50 * 1e6, s.p90 * 1e6,
+                s.p99 * 1e6, s.max * 1e6))
+        return '\n'.join(lines)
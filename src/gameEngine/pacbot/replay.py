@@ -0,0 +1,102 @@
+from .gameState import GameState, FREQUENCY
+import struct
+
+###
+# Replay logs record everything that decides how a game plays out: the seed of the
+# game's rng and every PACMAN_LOCATION update, stamped with the step it arrived before.
+# A step is one call of GameState.next_step(), so pauses (which do not step the game)
+# are not part of the log and a replay runs as fast as the CPU allows.
+#
+# File layout, all little-endian:
+#   header:  magic b'PBRL', version (u8), seed (u64), steps (u32)
+#   records: step (u32), x (u8), y (u8), one per PACMAN_LOCATION update, in order
+# Version 1 logs stored the seed as a u32 and are still read.
+###
+
+MAGIC = b'PBRL'
+VERSION = 2
+
+_prefix = struct.Struct('<4sB')
+_header = struct.Struct('<4sBQI')
+_headers = {1: struct.Struct('<4sBII'), VERSION: _header}
+_record = struct.Struct('<IBB')
+
+
+class ReplayWriter:
+    """
+        Records one game to a replay log. Call position() for every Pacman location
+        update and step() every time the game steps, then close() once the game is over.
+    """
+    def __init__(self, path, seed):
+        self.path = path
+        self.seed = seed
+        self.steps = 0
+        self._file = open(path, 'wb')
+        self._file.write(_header.pack(MAGIC, VERSION, seed, 0))
+
+    def position(self, pos):
+        self._file.write(_record.pack(self.steps, pos[0], pos[1]))
+
+    def step(self):
+        self.steps += 1
+
+    # Fills in the number of steps and closes the file. A log that was never closed
+    # (e.g. the engine crashed) still replays up to its last update.
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._file.write(_header.pack(MAGIC, VERSION, self.seed, self.steps))
+        self._file.close()
+
+
+class ReplayLog:
+    """
+        A replay log read back into memory.
+    """
+    def __init__(self, seed, steps, records):
+        self.seed = seed
+        self.steps = steps
+        self.records = records
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version = _prefix.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError('{} is not a replay log'.format(path))
+        header = _headers.get(version)
+        if header is None:
+            raise ValueError('unsupported replay log version {}'.format(version))
+        _, _, seed, steps = header.unpack_from(data)
+        end = len(data) - (len(data) - header.size) % _record.size
+        records = list(_record.iter_unpack(data[header.size:end]))
+        if records:
+            steps = max(steps, records[-1][0])
+        return cls(seed, steps, records)
+
+    # Plays the logged game on the given GameState (or a new one) and returns it. The
+    # game is resumed after every death, like HeadlessRunner does. The game clock is
+    # replaced by one that follows the steps, so elapsed_time is game time, not the
+    # wall-clock time of the original game.
+    def replay(self, game=None):
+        step = 0
+        if game is None:
+            game = GameState(verbose=False)
+        game.clock = lambda: step / FREQUENCY
+        game.restart(self.seed)
+        game.unpause()
+        records = self.records
+        i = 0
+        for step in range(self.steps):
+            while i < len(records) and records[i][0] <= step:
+                game.pacbot.update((records[i][1], records[i][2]))
+                i += 1
+            if not game.play:
+                game.unpause()
+            game.next_step()
+        for (_, x, y) in records[i:]:
+            game.pacbot.update((x, y))
+        return game
+
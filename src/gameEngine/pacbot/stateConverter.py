@@ -1,7 +1,11 @@
 from .variables import *
+from . import bitboard
 from messages.pacmanState_pb2 import PacmanState
 from messages.lightState_pb2 import LightState
-import time
+from messages.gameEvents_pb2 import GameEvents
+from messages.engineStats_pb2 import EngineStats
+from messages.stateDelta_pb2 import StateDelta
+from messages.packedGrid import pack_grid
 
 class StateConverter:
 
@@ -11,6 +15,33 @@ class StateConverter:
     _directions[up] = PacmanState.UP
     _directions[down] = PacmanState.DOWN
 
+    _events = {}
+    _events[ev_restart] = GameEvents.RESTART
+    _events[ev_pellet_eaten] = GameEvents.PELLET_EATEN
+    _events[ev_power_pellet_eaten] = GameEvents.POWER_PELLET_EATEN
+    _events[ev_cherry_eaten] = GameEvents.CHERRY_EATEN
+    _events[ev_ghost_eaten] = GameEvents.GHOST_EATEN
+    _events[ev_death] = GameEvents.DEATH
+    _events[ev_mode_swap] = GameEvents.MODE_SWAP
+    _events[ev_cherry_spawn] = GameEvents.CHERRY_SPAWN
+    _events[ev_cherry_despawn] = GameEvents.CHERRY_DESPAWN
+    _events[ev_game_over] = GameEvents.GAME_OVER
+
+    _grid_elements = {}
+    _grid_elements[I] = PacmanState.WALL
+    _grid_elements[o] = PacmanState.PELLET
+    _grid_elements[O] = PacmanState.POWER_PELLET
+    _grid_elements[e] = PacmanState.EMPTY
+    _grid_elements[n] = PacmanState.EMPTY
+    _grid_elements[c] = PacmanState.CHERRY
+
+    # The serialized grid field of the last full state, and the grid version it was
+    # serialized from (see GameState.grid_version), for the grid and the packed grid.
+    _grid_cache = {False: (None, b''), True: (None, b'')}
+
+    # The pellet bitmap of the last light state and the grid version it was made from.
+    _pellets_cache = (None, b'')
+
     @classmethod
     def _parse_game_mode(cls, mode, play):
         if not play:
@@ -22,22 +53,12 @@ class StateConverter:
         else:
             return  PacmanState.FRIGHTENED
 
+    # Returns a PacmanState with every field but the grid.
     @classmethod
-    def _parse_grid_element(cls, el):
-        if el == I:
-            return PacmanState.WALL
-        elif el == o:
-            return PacmanState.PELLET
-        elif el == O:
-            return PacmanState.POWER_PELLET
-        elif el == c:
-            return PacmanState.CHERRY
-        else:
-            return PacmanState.EMPTY
-
-    @classmethod
-    def convert_game_state_to_full(cls, game_state):
+    def _convert_full_without_grid(cls, game_state, seq=None):
         proto = PacmanState()
+        if seq is not None:
+            proto.seq = seq
         proto.mode = StateConverter._parse_game_mode(game_state.state, game_state.play)
         proto.frightened_timer = game_state.frightened_counter
         proto.score = game_state.score
@@ -48,7 +69,7 @@ class StateConverter:
         proto.elapsed_time = game_state.elapsed_time
 
         if game_state.play:
-            proto.elapsed_time += time.time() - game_state.previous_start
+            proto.elapsed_time += game_state.clock() - game_state.previous_start
 
         proto.red_ghost.x = game_state.red.pos['current'][0]
         proto.red_ghost.y = game_state.red.pos['current'][1]
@@ -74,15 +95,55 @@ class StateConverter:
         proto.pacman.y = game_state.pacbot.pos[1]
         proto.pacman.direction = StateConverter._directions[game_state.pacbot.direction]
 
-        for col in game_state.grid:
-            for el in col:
-                proto.grid.append(StateConverter._parse_grid_element(el))
+        return proto
 
+    # Returns the GridElements of the grid, column by column.
+    @classmethod
+    def _convert_grid(cls, game_state):
+        elements = StateConverter._grid_elements
+        return [elements[el] for col in game_state.grid for el in col]
+
+    @classmethod
+    def convert_game_state_to_full(cls, game_state, seq=None):
+        proto = StateConverter._convert_full_without_grid(game_state, seq)
+        proto.grid.extend(StateConverter._convert_grid(game_state))
         return proto
 
+    # Returns the serialized grid (or packed_grid) field of a full state. The grid only
+    # changes when something is eaten, so it is serialized once per grid version.
+    @classmethod
+    def _serialize_grid(cls, game_state, packed=False):
+        (version, payload) = StateConverter._grid_cache[packed]
+        if version != game_state.grid_version:
+            proto = PacmanState()
+            if packed:
+                proto.packed_grid = pack_grid(StateConverter._convert_grid(game_state))
+            else:
+                proto.grid.extend(StateConverter._convert_grid(game_state))
+            payload = proto.SerializePartialToString()
+            StateConverter._grid_cache[packed] = (game_state.grid_version, payload)
+        return payload
+
+    # Returns convert_game_state_to_full(game_state).SerializeToString(), reserializing
+    # only the small fields when the grid has not changed. Protobuf parsers accept the
+    # fields of a message in any order, so the cached grid field is simply appended.
+    @classmethod
+    def serialize_game_state_to_full(cls, game_state, seq=None):
+        return (StateConverter._convert_full_without_grid(game_state, seq).SerializeToString() +
+                StateConverter._serialize_grid(game_state))
+
+    # Like serialize_game_state_to_full(), but with the grid in packed_grid instead of
+    # grid (see messages/packedGrid.py).
+    @classmethod
+    def serialize_game_state_to_packed(cls, game_state, seq=None):
+        return (StateConverter._convert_full_without_grid(game_state, seq).SerializeToString() +
+                StateConverter._serialize_grid(game_state, packed=True))
+
     @classmethod
-    def convert_game_state_to_light(cls, game_state):
+    def convert_game_state_to_light(cls, game_state, seq=None):
         proto = LightState()
+        if seq is not None:
+            proto.seq = seq
         proto.mode = LightState.RUNNING if game_state.play else LightState.PAUSED
         proto.score = game_state.score
         proto.lives = game_state.lives
@@ -107,5 +168,118 @@ class StateConverter:
         proto.pacman.y = game_state.pacbot.pos[1]
 
         proto.cherry = game_state.cherry
+        proto.pellets = StateConverter._pellet_bitmap(game_state)
 
         return proto
+
+    # Returns the pellet bitmap of the game (see LightState.pellets), made once per grid
+    # version.
+    @classmethod
+    def _pellet_bitmap(cls, game_state):
+        (version, bitmap) = StateConverter._pellets_cache
+        if version != game_state.grid_version:
+            bitmap = bitboard.to_pellet_bitmap(game_state.pellet_board | game_state.power_pellet_board)
+            StateConverter._pellets_cache = (game_state.grid_version, bitmap)
+        return bitmap
+
+    @classmethod
+    def convert_events(cls, events):
+        proto = GameEvents()
+        for event in events:
+            el = proto.events.add()
+            el.type = StateConverter._events[event.type]
+            el.tick = event.tick
+            if event.pos is not None:
+                el.x = event.pos[0]
+                el.y = event.pos[1]
+            if event.type == ev_mode_swap:
+                el.value = StateConverter._parse_game_mode(event.value, True)
+            else:
+                el.value = event.value
+        return proto
+
+    @classmethod
+    def convert_profiler(cls, profiler):
+        proto = EngineStats()
+        for summary in profiler.summary():
+            phase = proto.phases.add()
+            phase.name = summary.phase
+            phase.count = summary.count
+            phase.total = summary.total
+            phase.mean = summary.mean
+            phase.p50 = summary.p50
+            phase.p90 = summary.p90
+            phase.p99 = summary.p99
+            phase.max = summary.max
+        return proto
+
+
+class DeltaEncoder:
+    """
+        Turns the game into a stream of StateDelta messages: a keyframe with the whole
+        full state every keyframe_interval messages and after request_keyframe(), and in
+        between only the fields of the full state and the grid cells that changed since
+        the previous message.
+    """
+
+    _agents = ['pacman', 'red_ghost', 'pink_ghost', 'orange_ghost', 'blue_ghost']
+    _fields = ['mode', 'frightened_timer', 'score', 'lives', 'update_ticks', 'elapsed_time']
+
+    def __init__(self, keyframe_interval):
+        self.keyframe_interval = keyframe_interval
+        self.seq = -1
+        self._since_keyframe = 0
+        self._keyframe_due = True
+        # The full state (without the grid) and the grid of the previous message
+        self._state = None
+        self._grid = None
+        self._grid_version = None
+
+    # Makes the next message a keyframe, e.g. when a client has missed a message.
+    def request_keyframe(self):
+        self._keyframe_due = True
+
+    # Returns the StateDelta with the changes since the previous call.
+    def encode(self, game_state):
+        delta = StateDelta()
+        delta.seq = self.seq = self.seq + 1
+        state = StateConverter._convert_full_without_grid(game_state)
+        grid_version = game_state.grid_version
+
+        if self._keyframe_due or self._since_keyframe >= self.keyframe_interval - 1:
+            delta.keyframe = state.SerializeToString() + StateConverter._serialize_grid(game_state)
+            if grid_version != self._grid_version:
+                self._grid = StateConverter._convert_grid(game_state)
+            self._keyframe_due = False
+            self._since_keyframe = 0
+        else:
+            delta.base_seq = self.seq - 1
+            previous = self._state
+            for name in DeltaEncoder._agents:
+                agent = getattr(state, name)
+                if agent != getattr(previous, name):
+                    changed = getattr(delta, name)
+                    changed.x = agent.x
+                    changed.y = agent.y
+                    changed.direction = agent.direction
+                    # Pacman has no frightened counter
+                    if agent.HasField('frightened_counter'):
+                        changed.frightened_counter = agent.frightened_counter
+            for name in DeltaEncoder._fields:
+                value = getattr(state, name)
+                if value != getattr(previous, name):
+                    setattr(delta, name, value)
+            # The grid only changes when something is eaten
+            if grid_version != self._grid_version:
+                grid = StateConverter._convert_grid(game_state)
+                for index, (old, new) in enumerate(zip(self._grid, grid)):
+                    if old != new:
+                        cell = delta.cells.add()
+                        cell.index = index
+                        cell.value = new
+                self._grid = grid
+            self._since_keyframe += 1
+
+        self._state = state
+        self._grid_version = grid_version
+        return delta
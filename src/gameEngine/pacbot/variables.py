@@ -25,6 +25,18 @@ orange = 2
 pink = 3
 blue = 4
 
+# event enums
+ev_restart = 0
+ev_pellet_eaten = 1
+ev_power_pellet_eaten = 2
+ev_cherry_eaten = 3
+ev_ghost_eaten = 4
+ev_death = 5
+ev_mode_swap = 6
+ev_cherry_spawn = 7
+ev_cherry_despawn = 8
+ev_game_over = 9
+
 # input signal enums
 sig_normal = 0
 sig_quit = 1
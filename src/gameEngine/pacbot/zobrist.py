@@ -0,0 +1,175 @@
+from .variables import *
+from .ghostpaths import pink_start_path, orange_start_path, blue_start_path
+from .grid import grid
+import collections
+import functools
+
+###
+# Zobrist hashing: every feature of a game (a pellet on a tile, a ghost's heading, the
+# value of a counter, ...) has a fixed random 64-bit key, and a game hashes to the XOR
+# of the keys of its features. When a feature changes, its key is XORed out and the new
+# one XORed in, so the hash is kept up to date without looking at the rest of the game.
+# The keys are derived from the features themselves, so hashes are the same in every
+# process and every run.
+###
+
+MASK = (1 << 64) - 1
+SEED = 0x5ac3b07c0337a3e5
+
+# Feature kinds
+ITEM = 1
+PACMAN = 2
+PACMAN_DIRECTION = 3
+GHOST_TILE = 4
+GHOST_NEXT = 5
+GHOST_DIRECTION = 6
+GHOST_FRIGHTENED = 7
+GHOST_RESPAWN = 8
+MODE = 9
+OLD_MODE = 10
+FRIGHTENED = 11
+MULTIPLIER = 12
+STATE_COUNTER = 13
+START_COUNTER = 14
+LIVES = 15
+PHASE = 16
+SWAPPED = 17
+CHERRY_TIMER = 18
+
+# Counters stop mattering once they pass these values: the ghosts have left their start
+# paths, and the last scatter/chase swap has happened.
+START_COUNTER_LIMIT = max(len(pink_start_path), len(orange_start_path), len(blue_start_path))
+STATE_COUNTER_LIMIT = state_swap_times[-1] + 1
+
+
+# The splitmix64 finalizer, which spreads every input bit over the whole output.
+def _mix(x):
+    x = (x + 0x9e3779b97f4a7c15) & MASK
+    x = ((x ^ (x >> 30)) * 0xbf58476d1ce4e5b9) & MASK
+    x = ((x ^ (x >> 27)) * 0x94d049bb133111eb) & MASK
+    return x ^ (x >> 31)
+
+
+# Returns the key of a feature, given as a kind followed by small ints.
+@functools.lru_cache(maxsize=None)
+def key(*feature):
+    h = SEED
+    for part in feature:
+        h = _mix(h ^ (part & MASK))
+    return h
+
+
+class _Keys(dict):
+    """
+        The keys of one kind of feature, looked up by the rest of the feature (an int or
+        a tile) and filled in the first time each one is needed. Dict lookups are much
+        cheaper than calling key() on hot paths.
+    """
+    def __init__(self, *prefix):
+        self.prefix = prefix
+
+    def __missing__(self, value):
+        if isinstance(value, tuple):
+            h = key(*(self.prefix + value))
+        else:
+            h = key(*(self.prefix + (value,)))
+        self[value] = h
+        return h
+
+
+_pacman_tiles = _Keys(PACMAN)
+_pacman_directions = _Keys(PACMAN_DIRECTION)
+# Per ghost color: tile, next tile, heading, frightened counter and respawn counter keys
+_ghost_keys = {color: (_Keys(GHOST_TILE, color), _Keys(GHOST_NEXT, color),
+                       _Keys(GHOST_DIRECTION, color), _Keys(GHOST_FRIGHTENED, color),
+                       _Keys(GHOST_RESPAWN, color))
+               for color in [red, orange, pink, blue]}
+_counter_keys = [_Keys(kind) for kind in [MODE, OLD_MODE, FRIGHTENED, MULTIPLIER, STATE_COUNTER,
+                                          START_COUNTER, LIVES, PHASE, SWAPPED, CHERRY_TIMER]]
+
+
+# Returns the hash of an item (o, O or c) on a tile, or 0 for anything else.
+def item(value, pos):
+    if value == o or value == O or value == c:
+        return key(ITEM, value, pos[0], pos[1])
+    return 0
+
+
+# Returns the hash of the items on a grid.
+def board(cells):
+    h = 0
+    for x, col in enumerate(cells):
+        for y, value in enumerate(col):
+            h ^= item(value, (x, y))
+    return h
+
+
+def ghost(color, current, next_pos, direction, frightened_counter, respawn_counter):
+    (tiles, nexts, directions, frightened, respawn) = _ghost_keys[color]
+    return (tiles[current] ^ nexts[next_pos] ^ directions[direction] ^
+            frightened[frightened_counter] ^ respawn[respawn_counter])
+
+
+def pacman(pos, direction):
+    return _pacman_tiles[pos] ^ _pacman_directions[direction]
+
+
+# Returns the hash of the game's mode and counters.
+def counters(game_state):
+    (modes, old_modes, frightened, multipliers, state_counters, start_counters, lives,
+     phases, swapped, cherry_timers) = _counter_keys
+    return (modes[game_state.state] ^
+            old_modes[game_state.old_state] ^
+            frightened[game_state.frightened_counter] ^
+            multipliers[game_state.frightened_multiplier] ^
+            state_counters[min(game_state.state_counter, STATE_COUNTER_LIMIT)] ^
+            start_counters[min(game_state.start_counter, START_COUNTER_LIMIT)] ^
+            lives[game_state.lives] ^
+            phases[game_state.update_ticks % ticks_per_update] ^
+            swapped[game_state.just_swapped_state] ^
+            cherry_timers[game_state.ticks_since_spawn])
+
+
+# The hash of the items at the start of a game.
+initial_board = board(grid)
+
+
+class TranspositionTable:
+    """
+        A bounded map from game hashes to search results. When it is full, the entry
+        that was used least recently is evicted.
+    """
+    def __init__(self, capacity=1 << 16):
+        self.capacity = capacity
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, h):
+        return h in self.entries
+
+    # Returns the value stored for a hash, or default if there is none.
+    def get(self, h, default=None):
+        value = self.entries.get(h, self)
+        if value is self:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.entries.move_to_end(h)
+        return value
+
+    def put(self, h, value):
+        entries = self.entries
+        if h in entries:
+            entries.move_to_end(h)
+        elif len(entries) >= self.capacity:
+            entries.popitem(last=False)
+        entries[h] = value
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,90 @@
+import os, time, heapq, itertools
+
+class RealClock:
+    """
+    Wall-clock time. This is the default clock of every module.
+    """
+    def time(self):
+        return time.time()
+
+    # Converts a duration on this clock into real seconds
+    def to_real(self, seconds):
+        return seconds
+
+    # Calls callback(*args) once delay seconds have passed on this clock
+    def call_later(self, loop, delay, callback, *args):
+        return loop.call_later(self.to_real(delay), callback, *args)
+
+
+class ScaledClock(RealClock):
+    """
+    Runs scale times faster than real time, starting from the real time at which it
+    was created. Modules in different processes that use the same scale agree on how
+    much time has passed, so a whole stack can be sped up (or slowed down) together.
+    """
+    def __init__(self, scale):
+        self.scale = scale
+        self._start = time.time()
+        self._real_start = time.monotonic()
+
+    def time(self):
+        return self._start + (time.monotonic() - self._real_start) * self.scale
+
+    def to_real(self, seconds):
+        return seconds / self.scale
+
+
+class VirtualClock:
+    """
+    Discrete-event time for modules that share an event loop: timers run in the order
+    they are due, as fast as the loop allows, and the clock jumps to the due time of
+    each timer as it runs. Time only moves through timers (or advance()).
+    """
+    def __init__(self, start=0.0):
+        self.now = start
+        self._timers = []
+        self._order = itertools.count()
+        self._running = False
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    def call_later(self, loop, delay, callback, *args):
+        heapq.heappush(self._timers, (self.now + delay, next(self._order), callback, args))
+        if not self._running:
+            self._running = True
+            loop.call_soon(self._run_next, loop)
+
+    # Runs the next timer. Going back to the loop between timers lets the loop
+    # deliver messages in between, like it would in real time.
+    def _run_next(self, loop):
+        due, _, callback, args = heapq.heappop(self._timers)
+        self.now = max(self.now, due)
+        callback(*args)
+        if self._timers:
+            loop.call_soon(self._run_next, loop)
+        else:
+            self._running = False
+
+
+_default_clock = None
+
+def default_clock():
+    """
+    Returns the clock modules use when they are not given one, shared by every module
+    in the process. It is set by the CLOCK_SCALE environment variable: unset or 1 for
+    real time, a number for a ScaledClock, or "virtual" for a VirtualClock.
+    """
+    global _default_clock
+    if _default_clock is None:
+        scale = os.environ.get("CLOCK_SCALE", "1")
+        if scale == "virtual":
+            _default_clock = VirtualClock()
+        elif float(scale) == 1:
+            _default_clock = RealClock()
+        else:
+            _default_clock = ScaledClock(float(scale))
+    return _default_clock
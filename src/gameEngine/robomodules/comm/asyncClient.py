@@ -3,12 +3,20 @@ from enum import Enum
 from .asyncProto import AsyncProto
 from .subscribe_pb2 import Subscribe
 from .constants import _SUBSCRIBE
+from robomodules.comm import unix_path
 
 class AsyncClient(AsyncProto):
-    def __init__(self, addr, port, cb, message_buffers, MsgType, subscriptions, loop=None):
+    def __init__(self, addr, port, cb, message_buffers, MsgType, subscriptions, loop=None, max_rates=None, seen=None, announced=None):
         """
         cb must be a function that takes a single argument and processes it
 
+        seen, if given, is called with the bytes and the type of each message before it
+        is parsed, and returns whether the module already got it some other way, in
+        which case it is neither parsed nor handed to cb.
+
+        announced, if given, is called with the types and the names of the ring readers
+        of each READ_RING announcement (see announce_rings) once the server has it.
+
         Do not do long-running operations in the update function without
         using asynchronous methods. It will be called once for each received
         message, possibly multiple times a "tick".
@@ -18,12 +26,19 @@ class AsyncClient(AsyncProto):
         self.addr = addr
         self.port = port
         self.subscriptions = subscriptions
+        self.max_rates = max_rates or {}
         self.update = cb
+        self.seen = seen
+        self.announced = announced
         self.MsgType = MsgType
         self.message_buffers = message_buffers
 
     def connect(self):
-        coro = self.loop.create_connection(lambda: self, self.addr, self.port)
+        path = unix_path(self.addr)
+        if path is not None:
+            coro = self.loop.create_unix_connection(lambda: self, path)
+        else:
+            coro = self.loop.create_connection(lambda: self, self.addr, self.port)
 
         # this part is a little messy I'm not sure what's up with it
         # I can't promise it works if the loop is already running, which would
@@ -35,10 +50,16 @@ class AsyncClient(AsyncProto):
     def connection_made(self, transport):
         super().connection_made(transport)
         if len(self.subscriptions) > 0:
-            self.subscribe(self.subscriptions, Subscribe.SUBSCRIBE)
+            self.subscribe(self.subscriptions, Subscribe.SUBSCRIBE, self.max_rates)
 
     def msg_received(self, data, msg_type):
-        if msg_type != _SUBSCRIBE:
+        if msg_type == _SUBSCRIBE:
+            # The server answers READ_RING announcements with the same message
+            msg = Subscribe()
+            msg.ParseFromString(data)
+            if msg.dir == Subscribe.READ_RING and self.announced is not None:
+                self.announced([self.MsgType(value) for value in msg.msg_types], list(msg.readers))
+        elif self.seen is None or not self.seen(data, self.MsgType(msg_type)):
             msg = self.message_buffers[self.MsgType(msg_type)]()
             msg.ParseFromString(data)
             self.update(msg, self.MsgType(msg_type))
@@ -46,12 +67,29 @@ class AsyncClient(AsyncProto):
     def write(self, msg, msg_type):
         super().write(msg, msg_type)
 
-    def subscribe(self, msg_types, direction):
+    # max_rates is the most messages a second to receive of some of the types, by type
+    def subscribe(self, msg_types, direction, max_rates=None):
+        msg = Subscribe()
+        for msg_type in msg_types:
+            msg.msg_types.append(msg_type.value)
+        if max_rates:
+            msg.max_rates.extend([max_rates.get(msg_type, 0) for msg_type in msg_types])
+        msg.dir = direction
+        self.write(msg.SerializeToString(), _SUBSCRIBE)
+
+
+    # Tells the server about ring readers (see robomodules.sharedRing): with READ_RING,
+    # the reader the module reads each of msg_types with ("" for none); with
+    # RING_READERS, every reader of the ring of the one type in msg_types that the module
+    # writes. Returns whether it could be sent.
+    def announce_rings(self, msg_types, direction, readers):
         msg = Subscribe()
         for msg_type in msg_types:
             msg.msg_types.append(msg_type.value)
+        msg.readers.extend(readers)
         msg.dir = direction
         self.write(msg.SerializeToString(), _SUBSCRIBE)
+        return self.transport is not None and not self.transport.is_closing()
 
 
     # Yay also a context manager
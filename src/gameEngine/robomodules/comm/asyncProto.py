@@ -2,43 +2,76 @@ import asyncio
 from .constants import *
 from robomodules.comm import pack_msg
 
+# Number of bytes of parsed messages to keep at the start of the read buffer before
+# moving the rest of it down
+COMPACT_SIZE = 1 << 16
+
 class AsyncProto(asyncio.Protocol):
     def __init__(self):
         self.transport = None
 
     def connection_made(self, transport):
         self.transport = transport
-        self.__length = 0
-        self.__buffer = b""
-        self.__msg_type = -1
+        self.__buffer = bytearray()
+        # Offset of the first byte in the buffer that has not been parsed
+        self.__start = 0
 
     def connection_lost(self, exception):
         if exception:
             print(repr(exception))
 
+    # msg_received() gets a memoryview of each message in the data read, which is only
+    # valid until it returns: parse it or copy it there.
     def data_received(self, data):
-        self.__buffer += data
-
-        while self.__buffer:
-            if not self.__length and len(self.__buffer) > SIZE_HEADER.size:
-                magic, msg_type, self.__length = SIZE_HEADER.unpack(
-                    self.__buffer[:SIZE_HEADER.size])
-                self.__buffer = self.__buffer[SIZE_HEADER.size:]
-                self.__msg_type = msg_type
-                if magic != MAGIC_HEADER:
-                    self.transport.close()
-                    if hasattr(self, "connect"):
-                        self.loop.call_soon(self.connect)
-                    return
-            elif self.__length and len(self.__buffer) >= self.__length:
-                self.msg_received(self.__buffer[:self.__length], self.__msg_type)
-                self.__buffer = self.__buffer[self.__length:]
-                self.__length = 0
-                self.__msg_type = -1
-            else:
+        if self.__start == len(self.__buffer):
+            # Nothing is buffered, so parse the data itself and only buffer the rest
+            start = self.__parse(data, 0)
+            if start is not None and start < len(data):
+                self.__buffer = bytearray(data[start:])
+                self.__start = 0
+            return
+
+        try:
+            self.__buffer += data
+        except BufferError:
+            # Something kept a view of a message, so the buffer cannot grow; leave it
+            # to the view and carry on in a copy of the unparsed bytes
+            self.__buffer = self.__buffer[self.__start:] + data
+            self.__start = 0
+        buffer = self.__buffer
+        start = self.__parse(buffer, self.__start)
+        if start is None:
+            return
+        self.__start = start
+
+        # Drop the parsed messages once there are enough of them, or nothing else
+        if start == len(buffer) or start >= COMPACT_SIZE:
+            try:
+                del buffer[:start]
+                self.__start = 0
+            except BufferError:
+                pass
+
+    # Hands every complete message in buffer from start on to msg_received() and returns
+    # the offset of the first byte left, or None if the connection was closed.
+    def __parse(self, buffer, start):
+        end = len(buffer)
+        view = memoryview(buffer)
+        while end - start >= SIZE_HEADER.size:
+            magic, msg_type, length = SIZE_HEADER.unpack_from(buffer, start)
+            if magic != MAGIC_HEADER:
+                self.transport.close()
+                if hasattr(self, "connect"):
+                    self.loop.call_soon(self.connect)
+                return None
+            if end - start - SIZE_HEADER.size < length:
                 # Not enough data has been buffered and read to form a complete
-                # header or message
-                return
+                # message
+                break
+            start += SIZE_HEADER.size
+            self.msg_received(view[start:start + length], msg_type)
+            start += length
+        return start
 
     def write(self, msg, msg_type):
         if self.transport:
@@ -1,15 +1,53 @@
 from enum import Enum
-import struct, asyncio
+from collections import OrderedDict
+import struct, asyncio, itertools
 from .asyncProto import AsyncProto
+from .constants import _SUBSCRIBE
+from robomodules.comm import pack_msg
+from robomodules.clock import default_clock
+
+# Bytes the transport of a client may buffer before asyncio pauses writing to it, after
+# which messages wait (and are conflated) in the client's queue instead
+WRITE_BUFFER_LIMIT = 1 << 14
+# Most messages of the types that are not conflated a client's queue holds. A client that
+# falls further behind than that is disconnected rather than made to miss any of them.
+MAX_QUEUE = 256
 
 class ServerProto(AsyncProto):
-    def __init__(self, parent, loop=None):
+    def __init__(self, parent, loop=None, clock=None):
         super().__init__()
         self.loop = loop or asyncio.get_event_loop()
+        self.clock = clock or default_clock()
         self.parent = parent
+        # The frames waiting to be written, by message type for conflated messages
+        # and by a number of their own for the others
+        self._queue = OrderedDict()
+        self._keys = itertools.count()
+        # The number of queued frames that are not conflated
+        self._lossless = 0
+        self._flushing = False
+        self._paused = False
+        # For the message types the client limited the rate of: the time between two
+        # messages, when the next one may be sent, and the latest one waiting until then
+        self._intervals = {}
+        self._next_at = {}
+        self._held = {}
+        # Messages replaced by a newer one of the same type, messages dropped when the
+        # client was disconnected for a full queue, and messages skipped to keep to a
+        # rate limit
+        self.conflated = 0
+        self.dropped = 0
+        self.downsampled = 0
+        # The ring reader (see robomodules.sharedRing) the client reads each shared type
+        # with, and the readers of each ring the client writes, by type
+        self.ring_reader = {}
+        self.ring_readers = {}
+        # Whether the client was disconnected because its queue was full
+        self.overflowed = False
 
     def connection_made(self, transport):
         super().connection_made(transport)
+        transport.set_write_buffer_limits(WRITE_BUFFER_LIMIT)
         self.parent.clients.append(self)
 
     def connection_lost(self, exc):
@@ -17,3 +55,106 @@ class ServerProto(AsyncProto):
 
     def msg_received(self, data, msg_type):
         self.parent.msg_received(self, data, msg_type)
+
+    # Limits the messages of a type sent to the client to max_rate a second, 0 for all.
+    def set_max_rate(self, msg_type, max_rate):
+        if max_rate > 0:
+            self._intervals[msg_type] = 1.0 / max_rate
+        else:
+            self._intervals.pop(msg_type, None)
+            self._next_at.pop(msg_type, None)
+            self._held.pop(msg_type, None)
+
+    # Sends an already framed message (a list of buffers, shared with the other
+    # subscribers and never modified), or, if the client limited the rate of its type
+    # and it is too soon for another one, holds it until it is time, in place of any
+    # message of the type held before.
+    def write_frame(self, frame, msg_type, conflate=False):
+        if msg_type in self._intervals:
+            now = self.clock.time()
+            next_at = self._next_at.get(msg_type, now)
+            if now < next_at:
+                if msg_type in self._held:
+                    self.downsampled += 1
+                else:
+                    self.clock.call_later(self.loop, next_at - now, self._release, msg_type)
+                self._held[msg_type] = (frame, conflate)
+                return
+            # A message still held because its timer is late is older than this one
+            if self._held.pop(msg_type, None) is not None:
+                self.downsampled += 1
+            self._next_at[msg_type] = now + self._intervals[msg_type]
+        self._queue_frame(frame, msg_type, conflate)
+
+    # Sends a subscription message to the client, after every message queued before it.
+    def write_control(self, msg):
+        self._queue_frame([pack_msg(msg, _SUBSCRIBE)], _SUBSCRIBE, False)
+
+    def _release(self, msg_type):
+        held = self._held.pop(msg_type, None)
+        if held is not None:
+            self._next_at[msg_type] = self.clock.time() + self._intervals[msg_type]
+            self._queue_frame(held[0], msg_type, held[1])
+
+    # Queues a frame. Everything queued for this client during one iteration of the
+    # event loop is written together, in one system call. While the client is not
+    # keeping up, only the latest message of a conflated type is kept, and every
+    # other message is kept until MAX_QUEUE of them wait, when the client is
+    # disconnected instead.
+    def _queue_frame(self, frame, msg_type, conflate):
+        if self.overflowed:
+            self.dropped += 1
+            return
+        queue = self._queue
+        if conflate:
+            key = msg_type
+            if queue.pop(key, None) is not None:
+                self.conflated += 1
+        elif self._lossless >= MAX_QUEUE:
+            self._overflow()
+            return
+        else:
+            key = next(self._keys)
+            self._lossless += 1
+        queue[key] = frame
+        if not self._flushing and not self._paused:
+            self._flushing = True
+            self.loop.call_soon(self._flush)
+
+    def _flush(self):
+        self._flushing = False
+        if self._paused or not self._queue:
+            return
+        frames = [buf for frame in self._queue.values() for buf in frame]
+        self._queue.clear()
+        self._lossless = 0
+        if self.transport and not self.transport.is_closing():
+            self.transport.writelines(frames)
+
+    # Disconnects the client, which is too far behind to get every message, and drops
+    # what is queued for it, including the message that did not fit.
+    def _overflow(self):
+        self.overflowed = True
+        self.dropped += len(self._queue) + 1
+        self._queue.clear()
+        self._lossless = 0
+        if self.transport:
+            self.transport.abort()
+
+    # Called by asyncio when the transport has buffered more than WRITE_BUFFER_LIMIT
+    def pause_writing(self):
+        self._paused = True
+
+    def resume_writing(self):
+        self._paused = False
+        self._flush()
+
+    # The number of messages waiting to be written to the client.
+    @property
+    def depth(self):
+        return len(self._queue)
+
+    def stats(self):
+        peer = self.transport.get_extra_info('peername') if self.transport else None
+        return {'peer': peer, 'depth': self.depth, 'conflated': self.conflated, 'dropped': self.dropped,
+                'downsampled': self.downsampled}
@@ -0,0 +1,38 @@
+import os
+from robomodules.protoModule import ProtoModule
+from robomodules.frameCodec import FrameReader
+
+# Largest number of bytes taken from the link at once
+READ_SIZE = 4096
+
+class FrameBridge(ProtoModule):
+    """
+    Bridges a link that speaks a FrameCodec (e.g. a serial port to a microcontroller) to
+    the server: every message of the to_link types is written to the link as a frame, and
+    every frame of the from_link types read from the link is published to the server. The
+    link needs write() and, so the bridge can wait for it on the event loop, fileno().
+    """
+    def __init__(self, addr, port, message_buffers, MsgType, codec, link, to_link, from_link,
+                 loop=None, clock=None, shared=()):
+        super().__init__(addr, port, message_buffers, MsgType, 0, to_link, loop, clock, shared=shared)
+        self.codec = codec
+        self.link = link
+        self.from_link = set(from_link)
+        self.reader = FrameReader(codec)
+        self.loop.add_reader(link.fileno(), self._read_link)
+
+    def _read_link(self):
+        data = os.read(self.link.fileno(), READ_SIZE)
+        if not data:
+            # The other end closed the link
+            self.loop.remove_reader(self.link.fileno())
+            return
+        for (msg, msg_type) in self.reader.feed(data):
+            if msg_type in self.from_link:
+                self.write(msg.SerializeToString(), msg_type)
+
+    def msg_received(self, msg, msg_type):
+        self.link.write(self.codec.encode(msg, msg_type))
+
+    def tick(self):
+        pass
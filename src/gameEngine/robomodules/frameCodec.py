@@ -0,0 +1,94 @@
+import binascii
+import struct
+
+SYNC = b'\xa5\x5a'
+_HEADER = len(SYNC) + 2
+_CRC = struct.Struct('!H')
+
+
+def _crc(data):
+    return binascii.crc_hqx(data, 0xFFFF)
+
+
+class FrameCodec:
+    """
+    A fixed-layout binary encoding of messages, for links where protobuf is too heavy
+    (serial ports, microcontrollers). A frame is the two SYNC bytes, the codec version,
+    the message type, the message's payload (a fixed size for every type, see register())
+    and the CRC-16/CCITT (initial value 0xFFFF) of the version, type and payload. Every
+    multi-byte value is big endian.
+    """
+    def __init__(self, version):
+        self.version = version
+        self._layouts = {}
+
+    # Adds a message type. layout is the struct format of its payload, without the byte
+    # order; to_values(msg) returns the values to pack and from_values(values) the message.
+    def register(self, msg_type, layout, to_values, from_values):
+        body = struct.Struct('!BB' + layout)
+        self._layouts[msg_type.value] = (msg_type, body, to_values, from_values)
+
+    # Returns the size of a frame of the message type, in bytes.
+    def frame_size(self, msg_type):
+        return len(SYNC) + self._layouts[msg_type.value][1].size + _CRC.size
+
+    def encode(self, msg, msg_type):
+        (_, body, to_values, _) = self._layouts[msg_type.value]
+        data = body.pack(self.version, msg_type.value, *to_values(msg))
+        return SYNC + data + _CRC.pack(_crc(data))
+
+    # Returns the (values, msg_type) of the version, type and payload of a frame.
+    def decode_values(self, data):
+        (msg_type, body, _, _) = self._layouts[data[1]]
+        return (body.unpack(data)[2:], msg_type)
+
+    # Returns the (msg, msg_type) of the version, type and payload of a frame.
+    def decode(self, data):
+        (values, msg_type) = self.decode_values(data)
+        return (self._layouts[msg_type.value][3](values), msg_type)
+
+
+class FrameReader:
+    """
+    Splits the bytes read from a link into the messages of a FrameCodec. Frames that are
+    not valid (cut short, with a bad CRC, from another codec version or of an unknown
+    type) are counted in errors and skipped up to the next SYNC, like any other noise.
+    """
+    def __init__(self, codec):
+        self.codec = codec
+        self.errors = 0
+        self._buffer = bytearray()
+
+    # Takes more bytes from the link and returns the (msg, msg_type) of every frame they
+    # complete.
+    def feed(self, data):
+        buffer = self._buffer
+        buffer += data
+        codec = self.codec
+        messages = []
+        start = 0
+        while True:
+            start = buffer.find(SYNC, start)
+            if start < 0:
+                # Keep a last byte that may be the start of the next SYNC
+                start = len(buffer) - 1 if buffer.endswith(SYNC[:1]) else len(buffer)
+                break
+            if len(buffer) - start < _HEADER:
+                break
+            layout = codec._layouts.get(buffer[start + 3])
+            if buffer[start + 2] != codec.version or layout is None:
+                self.errors += 1
+                start += 1
+                continue
+            end = start + len(SYNC) + layout[1].size + _CRC.size
+            if len(buffer) < end:
+                break
+            data = bytes(buffer[start + len(SYNC):end - _CRC.size])
+            if _CRC.unpack_from(buffer, end - _CRC.size)[0] != _crc(data):
+                self.errors += 1
+                start += 1
+                continue
+            messages.append(codec.decode(data))
+            start = end
+        del buffer[:start]
+        return messages
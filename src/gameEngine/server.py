@@ -20,8 +20,43 @@ ADDRESS = os.environ.get("BIND_ADDRESS","localhost")
 ###
 PORT = os.environ.get("BIND_PORT", 11297)
 
+###
+# UNIX_ADDRESS is a second address for the server to listen on, a Unix domain socket such as
+# "unix:/tmp/pacbot.sock". Modules on the same computer (the game engine, visualizer, terminal printer)
+# can connect to it by setting BIND_ADDRESS to it, skipping the TCP/IP stack, while the robot keeps
+# connecting over TCP. Unset, the server only listens on TCP. ./benchmark.py transport compares the two.
+###
+UNIX_ADDRESS = os.environ.get("UNIX_ADDRESS")
+
+###
+# SERVER_STATS is how often, in seconds, the server prints how many messages are waiting for each
+# client and how many it has conflated because the client did not keep up, and how many clients it
+# disconnected for falling too far behind. 0 turns it off.
+###
+STATS_INTERVAL = float(os.environ.get("SERVER_STATS", 0))
+
+# The states, of which a client that falls behind only gets the latest. Deltas, events and
+# requests are all delivered.
+CONFLATED = [MsgType.LIGHT_STATE, MsgType.PACMAN_LOCATION, MsgType.FULL_STATE,
+             MsgType.FULL_STATE_PACKED, MsgType.ENGINE_STATS]
+
+# The states, of which the latest is sent to a module as soon as it subscribes, so it does
+# not wait for the next one (e.g. while the game is paused).
+LATCHED = CONFLATED
+
+def print_stats(server):
+    server.loop.call_later(STATS_INTERVAL, print_stats, server)
+    for stats in server.stats():
+        print('{peer}: {depth} queued, {conflated} conflated, {dropped} dropped, {downsampled} downsampled'.format(**stats))
+    if server.overflows:
+        print('{} clients disconnected for falling behind'.format(server.overflows))
+
 def main():
-    server = robomodules.Server(ADDRESS, PORT, MsgType)
+    server = robomodules.Server(ADDRESS, PORT, MsgType, CONFLATED, LATCHED)
+    if UNIX_ADDRESS:
+        server.listen(UNIX_ADDRESS)
+    if STATS_INTERVAL > 0:
+        server.loop.call_later(STATS_INTERVAL, print_stats, server)
     server.run()
 
 if __name__ == "__main__":
@@ -5,6 +5,8 @@ from __future__ import print_function
 import sys, os, time
 import robomodules as rm
 from messages import *
+from messages.delta import STATE_TYPE, delta_receiver
+from messages.packedGrid import unpack_state
 
 ADDRESS = os.environ.get("BIND_ADDRESS","localhost")
 PORT = os.environ.get("BIND_PORT", 11297)
@@ -13,9 +15,14 @@ FREQUENCY = 10
 
 class TerminalPrinter(rm.ProtoModule):
     def __init__(self, addr, port):
-        self.subscriptions = [MsgType.FULL_STATE]
-        super().__init__(addr, port, message_buffers, MsgType, FREQUENCY, self.subscriptions)
+        self.subscriptions = [STATE_TYPE]
+        # The printer only shows a state FREQUENCY times a second, so it has the server
+        # skip the ones in between (every delta is needed to rebuild the state, though)
+        max_rates = {} if STATE_TYPE == MsgType.STATE_DELTA else {STATE_TYPE: FREQUENCY}
+        super().__init__(addr, port, message_buffers, MsgType, FREQUENCY, self.subscriptions,
+                         max_rates=max_rates)
         self.state = None
+        self.deltas = delta_receiver(self)
 
     def _parse_game_mode(self, mode):
         if mode == PacmanState.FRIGHTENED:
@@ -71,8 +78,13 @@ class TerminalPrinter(rm.ProtoModule):
 
     def msg_received(self, msg, msg_type):
         # This gets called whenever any message is received
-        if msg_type == MsgType.FULL_STATE:
-            self.state = msg
+        if msg_type in [MsgType.FULL_STATE, MsgType.FULL_STATE_PACKED]:
+            self.state = unpack_state(msg)
+        elif msg_type == MsgType.STATE_DELTA:
+            # Keeps showing the last state while waiting for a keyframe
+            state = self.deltas.receive(msg)
+            if state is not None:
+                self.state = state
         
 
     def tick(self):